@@ -0,0 +1,89 @@
+from array import array
+from typing import Iterable, Iterator, Union
+
+# KH2 item IDs are 16-bit, but everything the randomizer places is well below this. The counter array grows on demand
+# if a larger ID ever shows up.
+_DEFAULT_CAPACITY = 1024
+
+
+class Inventory:
+    """
+    Multiset of item IDs used for logic evaluation.
+
+    Backed by a fixed-width counter array indexed by item ID, so membership and count checks are O(1) instead of the
+    linear scans a plain list of IDs needs. Supports the subset of the list API the requirement functions use
+    (in, count, append, extend, +) so callers can use either.
+    """
+
+    __slots__ = ("_counts", "_size", "_version")
+
+    def __init__(self, item_ids: Iterable[int] = ()):
+        self._counts = array("I", bytes(4 * _DEFAULT_CAPACITY))
+        self._size = 0
+        self._version = 0
+        self.extend(item_ids)
+
+    @property
+    def version(self) -> int:
+        """Increases every time the contents change. Lets callers memoize results per inventory state."""
+        return self._version
+
+    def _grow(self, item_id: int):
+        capacity = len(self._counts)
+        while capacity <= item_id:
+            capacity *= 2
+        self._counts.extend(bytes(4 * (capacity - len(self._counts))))
+
+    def __contains__(self, item_id: int) -> bool:
+        counts = self._counts
+        return 0 <= item_id < len(counts) and counts[item_id] > 0
+
+    def count(self, item_id: int) -> int:
+        """Returns how many copies of the given item ID are in the inventory."""
+        counts = self._counts
+        if 0 <= item_id < len(counts):
+            return counts[item_id]
+        return 0
+
+    def add(self, item_id: int, amount: int = 1):
+        """Adds the given number of copies of an item ID."""
+        if item_id >= len(self._counts):
+            self._grow(item_id)
+        self._counts[item_id] += amount
+        self._size += amount
+        self._version += 1
+
+    def append(self, item_id: int):
+        self.add(item_id)
+
+    def extend(self, item_ids: Iterable[int]):
+        if isinstance(item_ids, Inventory):
+            for item_id, amount in enumerate(item_ids._counts):
+                if amount > 0:
+                    self.add(item_id, amount)
+            return
+        for item_id in item_ids:
+            self.add(item_id)
+
+    def copy(self) -> "Inventory":
+        result = Inventory.__new__(Inventory)
+        result._counts = array("I", self._counts)
+        result._size = self._size
+        result._version = 0
+        return result
+
+    def __add__(self, other: Union["Inventory", Iterable[int]]) -> "Inventory":
+        result = self.copy()
+        result.extend(other)
+        return result
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[int]:
+        for item_id, amount in enumerate(self._counts):
+            for _ in range(amount):
+                yield item_id
+
+    def __repr__(self) -> str:
+        return f"Inventory({list(self)})"
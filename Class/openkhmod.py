@@ -1,19 +1,131 @@
+import hashlib
+import json
+import pickle
+import threading
 from copy import deepcopy
 from typing import Any, Optional, Iterator
 from zipfile import ZipFile
+
+from Class.exceptions import GeneratorException
+from Module import appconfig
 from Module.resources import resource_path
 
 import yaml, re
 
+try:
+    from yaml import CDumper as _CDumper
+except ImportError:
+    _CDumper = None
+
 Asset = dict[str, Any]
 
+_static_lists: dict[str, Any] = {}
+_static_lists_lock = threading.Lock()
+
+_item_table: Optional[dict[int, dict[str, Any]]] = None
+_item_table_lock = threading.Lock()
+
+
+def load_static_list(file_name: str) -> Any:
+    """
+    Returns the parsed contents of one of the YAML list files in the static folder. The result is shared for the life
+    of the process and must be treated as read-only.
+    """
+    with _static_lists_lock:
+        data = _static_lists.get(file_name)
+        if data is None:
+            data = _load_static_list_from_cache(file_name)
+            _static_lists[file_name] = data
+    return data
+
+
+def _load_static_list_from_cache(file_name: str) -> Any:
+    """
+    Parsing the larger lists with the YAML loader is slow, so the parsed data is pickled to the cache folder the first
+    time and loaded from there afterwards. The pickle is tagged with a hash of the YAML content, so a changed list file
+    is always parsed again.
+    """
+    with open(resource_path(f"static/{file_name}"), "rb") as file:
+        yaml_content = file.read()
+    content_hash = hashlib.sha256(yaml_content).hexdigest()
+
+    cache_path = appconfig.cache_folder() / f"{file_name}.pickle"
+    try:
+        with open(cache_path, "rb") as cache_file:
+            cached_hash, cached_data = pickle.load(cache_file)
+        if cached_hash == content_hash:
+            return cached_data
+    except (OSError, pickle.UnpicklingError, EOFError, TypeError, ValueError):
+        pass
+
+    data = yaml.safe_load(yaml_content)
+    try:
+        with appconfig.AtomicFile(cache_path) as cache_file:
+            pickle.dump((content_hash, data), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        # Not being able to write the cache just means parsing again next time
+        pass
+    return data
+
+
+def item_table() -> dict[int, dict[str, Any]]:
+    """
+    Returns the entries of the game's full item list (static/full_items.json) keyed by item ID. The table is loaded the
+    first time it's needed and shared for the life of the process, so the entries must be treated as read-only.
+    """
+    global _item_table
+    with _item_table_lock:
+        if _item_table is None:
+            with open(resource_path("static/full_items.json"), "r") as item_json:
+                _item_table = {item["Id"]: item for item in json.load(item_json)["Items"]}
+        return _item_table
+
+
+def _c_dumper_compatible(data) -> bool:
+    """
+    Returns True if libyaml's emitter is known to write the data exactly the same as the pure Python one. They only
+    disagree on strings that have to be written with escapes (where they wrap lines at different points), so this
+    checks that every string is printable ASCII. Anything other than plain lists, dicts and scalars, and any object
+    that shows up more than once (which would be written with an anchor), is left to the pure Python emitter.
+    """
+    seen_containers = set()
+    pending = [data]
+    while len(pending) > 0:
+        value = pending.pop()
+        value_type = type(value)
+        if value_type is str:
+            if not (value.isascii() and value.isprintable()):
+                return False
+        elif value_type is dict or value_type is list:
+            if id(value) in seen_containers:
+                return False
+            seen_containers.add(id(value))
+            if value_type is dict:
+                pending.extend(value.keys())
+                pending.extend(value.values())
+            else:
+                pending.extend(value)
+        elif value_type not in (int, float, bool, type(None)):
+            return False
+    return True
+
+
+def dump_yaml(data, sort_keys: bool) -> str:
+    """
+    Returns the data as YAML the way OpenKH expects it. The C emitter from libyaml is used when it's available and
+    gives identical output, since it's several times faster than the pure Python one on the larger lists.
+    """
+    if _CDumper is not None and _c_dumper_compatible(data):
+        return yaml.dump(data, Dumper=_CDumper, line_break="\r\n", sort_keys=sort_keys)
+    return yaml.dump(data, line_break="\r\n", sort_keys=sort_keys)
+
 
 def write_yaml_to_zip_file(zip_file: ZipFile, name: str, data, sort_keys: bool):
-    zip_file.writestr(name, yaml.dump(data, line_break="\r\n", sort_keys=sort_keys))
+    zip_file.writestr(name, dump_yaml(data, sort_keys=sort_keys))
 
 
 def write_unicode_yaml_to_zip_file(zip_file: ZipFile, name: str, data, sort_keys: bool):
-    yaml_string = yaml.dump(data, line_break="\r\n", sort_keys=sort_keys)
+    yaml_string = dump_yaml(data, sort_keys=sort_keys)
     yaml_string = re.sub(
         r"en: ([a-zA-Z0-9\\]+)", r'en: "\1"', yaml_string
     )  # surround text of the journal with double quotes to allow for automatic unicode conversion
@@ -247,6 +359,29 @@ class Items:
             }
         )
 
+    def add_item_from_table(self, item_id: int, shop_buy: Optional[int] = None):
+        """Adds an item using its entry in the full item list, optionally changing how much it costs in shops."""
+        item_json = item_table().get(item_id)
+        if item_json is None:
+            raise GeneratorException(f"Item {item_id} is not in the full item list")
+        self.add_item(
+            item_id=item_json["Id"],
+            item_type=item_json["Type"],
+            flag_0=item_json["Flag0"],
+            flag_1=item_json["Flag1"],
+            rank=item_json["Rank"],
+            stat_entry=item_json["StatEntry"],
+            name=item_json["Name"],
+            description=item_json["Description"],
+            shop_buy=item_json["ShopBuy"] if shop_buy is None else shop_buy,
+            shop_sell=item_json["ShopSell"],
+            command=item_json["Command"],
+            slot=item_json["Slot"],
+            picture=item_json["Picture"],
+            icon_1=item_json["Icon1"],
+            icon_2=item_json["Icon2"],
+        )
+
     def write_to_zip_file(self, zip_file: ZipFile):
         write_yaml_to_zip_file(zip_file, self.source_name, self.data, sort_keys=False)
 
@@ -257,9 +392,10 @@ class LevelUps:
     def __init__(self, source_name: str):
         self.data: dict[str, dict[int, dict[str, Any]]] = {"Sora": {}, "Donald": {}, "Goofy": {}, "PingMulan": {}, "Beast": {}, "Sparrow": {}, "Aladdin": {}, "Jack": {}, "Auron": {}, "Simba": {}, "Tron": {}, "Riku": {},}
         self.source_name = source_name
-        with open(resource_path("static/LvupList.yml"), "r") as file:
-            list_data = yaml.safe_load(file)
-        self.yaml_list_data = list_data
+
+    @property
+    def yaml_list_data(self) -> dict[str, Any]:
+        return load_static_list("LvupList.yml")
 
     def add_sora_level(
         self,
@@ -534,9 +670,10 @@ class AttackEntriesOrganizer:
     def __init__(self, source_name: str):
         self.data: list[dict] = []
         self.source_name = source_name
-        with open(resource_path("static/AtkpList.yml"), "r") as file:
-            list_data = yaml.safe_load(file)
-        self.yaml_list_data = list_data
+
+    @property
+    def yaml_list_data(self) -> list[dict[str, Any]]:
+        return load_static_list("AtkpList.yml")
 
     def convert_atkp_object_to_dict_and_add_to_data(self, atkp_object: ATKPObject):
         self.data.append(
@@ -1,12 +1,12 @@
-from random import random
+from random import Random
 from bisect import bisect_left
 from itertools import accumulate
 
 
-def weighted_sample_without_replacement(population, weights, k):
+def weighted_sample_without_replacement(population, weights, k, rng: Random):
     wts = list(weights)
     sampl = []
-    rnums = [random() for _ in range(k)]
+    rnums = [rng.random() for _ in range(k)]
     for r in rnums:
         acm_wts = list(accumulate(wts))
         total = acm_wts[-1]
@@ -2916,9 +2916,9 @@ _all_settings = [
         shared=False,
         default=True,
         tooltip="""
-        If enabled, previously generated textures will be kept around to speed up future recolors. This will potentially
-        use large amounts of disk space, but improves performance. Disable this option to minimize disk space usage, but
-        recoloring will take longer.
+        If enabled, previously generated textures will be kept around (up to 1 GB by default, removing the least
+        recently used ones first) to speed up future recolors. This uses more disk space, but improves performance.
+        Disable this option to minimize disk space usage, but recoloring will take longer.
         """,
     ),
     TextureRecolorsSetting(
@@ -3760,3 +3760,6 @@ class ExtraConfigurationData:
     tourney: bool
     custom_cosmetics_executables: list[str]
     disable_emu_warning: bool = True
+    # Puts the spoiler log data in its own file next to spoilerlog.html in the zip instead of inside the page
+    # (the "Separate Spoiler Log Data File" option in the generator's Config menu)
+    spoiler_data_file: bool = False
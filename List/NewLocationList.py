@@ -1,7 +1,10 @@
-from typing import Iterator, List, Optional
+import threading
+from typing import Any, Callable, Iterator, List, Optional, TypeVar
 
 from altgraph.Graph import Graph
 
+from Class.exceptions import GeneratorException
+from Class.inventory import Inventory
 from Class.newLocationClass import KH2Location
 from List.configDict import locationCategory
 from List.location import landofdragons, spaceparanoids, weaponslot, donaldbonus, goofybonus, starting, formlevel, \
@@ -12,38 +15,106 @@ from List.location.graph import LocationGraphBuilder, START_NODE, RequirementEdg
 from Module.RandomizerSettings import RandomizerSettings
 
 
-# updated function to allow for multiple incoming connections to enforce multiple constraints
-def get_all_parent_edge_requirements(
-        node_id: str,
-        graph: Graph
-) -> RequirementFunction:
-    # base_requirement = lambda inv : True
-    non_strict_requirements = []
-    strict_requirements = []
-
-    for edge in graph.inc_edges(node_id):
-        # we want to collate the parent requirements in the proper arrangement. 
-        #   If we have non-strict edges, only one of the parent edges is needed to enter this node.
-        source, _ = graph.edge_by_id(edge)
-        parent_requirements = get_all_parent_edge_requirements(source, graph)
-        # if debug_mode:
-        #     parent_requirements([])
-        data: RequirementEdge = graph.edge_data(edge)
-        # condition to get to here through this parent
-        if data.requirement is not None:
-            requirement = lambda inv, this_req=data.requirement, par_req=parent_requirements : this_req(inv) and par_req(inv)
-        else:
-            requirement = lambda inv, par_req=parent_requirements: par_req(inv)
-        if data.strict:
-            strict_requirements.append(requirement)
-        else:
-            non_strict_requirements.append(requirement)
-    if len(non_strict_requirements) > 0:
-        #convert the non-strict requirements into a strict with with an or condition
-        new_strict_func = lambda inv, non_s_req=non_strict_requirements: any([r(inv) for r in non_s_req])
-        strict_requirements.append(new_strict_func)
-    this_requirement = lambda inv, s_req=strict_requirements : all([r(inv) for r in s_req])
-    return this_requirement
+class CompiledLocationRequirements:
+    """
+    Flattened form of the edge requirements in a location graph.
+
+    Nodes are laid out in topological order with their incoming edges resolved to indices, so reachability of every
+    node is computed in a single forward pass. The result of that pass is memoized per inventory state, meaning each
+    node is evaluated once per state no matter how many locations are checked against it.
+    """
+
+    def __init__(self, graph: Graph):
+        valid, order = graph.forw_topo_sort()
+        if not valid:
+            raise GeneratorException("Location graph contains a cycle and can't be compiled")
+        self._node_index: dict[str, int] = {node_id: index for index, node_id in enumerate(order)}
+
+        # For each node, a tuple of (source node index, requirement) for strict and non-strict incoming edges.
+        #   All strict edges are needed to enter a node, but only one of the non-strict edges.
+        self._program: list[tuple[tuple[tuple[int, Optional[RequirementFunction]], ...], ...]] = []
+        for node_id in order:
+            strict_edges = []
+            non_strict_edges = []
+            for edge in graph.inc_edges(node_id):
+                source, _ = graph.edge_by_id(edge)
+                data: RequirementEdge = graph.edge_data(edge)
+                compiled_edge = (self._node_index[source], data.requirement)
+                if data.strict:
+                    strict_edges.append(compiled_edge)
+                else:
+                    non_strict_edges.append(compiled_edge)
+            self._program.append((tuple(strict_edges), tuple(non_strict_edges)))
+
+        # (inventory, version, result) of the last evaluation. Kept as one tuple so that threads sharing a cached graph
+        #   always see a consistent entry.
+        self._cached: tuple[Optional[Inventory], int, list[bool]] = (None, -1, [])
+
+    def _evaluate(self, inventory: Inventory) -> list[bool]:
+        reachable: list[bool] = []
+        for strict_edges, non_strict_edges in self._program:
+            node_reachable = True
+            for source, requirement in strict_edges:
+                if not reachable[source] or (requirement is not None and not requirement(inventory)):
+                    node_reachable = False
+                    break
+            if node_reachable and len(non_strict_edges) > 0:
+                node_reachable = any(
+                    reachable[source] and (requirement is None or requirement(inventory))
+                    for source, requirement in non_strict_edges
+                )
+            reachable.append(node_reachable)
+        return reachable
+
+    def reachable_nodes(self, inventory: Inventory) -> list[bool]:
+        """
+        Returns the reachability of every node (indexed in compiled order) for the given inventory. Results are reused
+        while the same Inventory is unchanged. Plain lists of item IDs are evaluated every time since they can't be
+        tracked for changes.
+        """
+        if not isinstance(inventory, Inventory):
+            return self._evaluate(inventory)
+        cached_inventory, cached_version, cached_result = self._cached
+        version = inventory.version
+        if inventory is not cached_inventory or version != cached_version:
+            cached_result = self._evaluate(inventory)
+            self._cached = (inventory, version, cached_result)
+        return cached_result
+
+    def is_node_reachable(self, inventory: Inventory, node_id: str) -> bool:
+        return self.reachable_nodes(inventory)[self._node_index[node_id]]
+
+    def node_requirement(self, node_id: str) -> RequirementFunction:
+        """ Returns a requirement function that checks whether the given node is reachable. """
+        index = self._node_index[node_id]
+        return lambda inv: self.reachable_nodes(inv)[index]
+
+
+def _graph_cache_key(settings: RandomizerSettings, secondary_graph: bool) -> tuple:
+    """
+    The subset of settings that a location graph is built from. Every setting read while building the graph (see the
+    make_graph functions in List/location) must be part of this key.
+    """
+    return (
+        secondary_graph,
+        settings.keyblades_unlock_chests,
+        settings.extended_placement_logic,
+        settings.disable_final_form,
+        settings.disable_antiform,
+        settings.max_level_checks,
+        settings.split_levels,
+        settings.objective_rando,
+        settings.num_objectives_needed,
+        settings.emblems,
+        settings.num_emblems_needed,
+    )
+
+
+_MAX_CACHED_GRAPHS = 16
+_cached_graphs: dict[tuple, "Locations"] = {}
+_cached_graphs_lock = threading.Lock()
+
+T = TypeVar("T")
 
 
 class Locations:
@@ -55,8 +126,43 @@ class Locations:
         self.first_boss_nodes: list[str] = []
         self.last_story_boss_nodes: list[str] = []
         self.superboss_nodes: list[str] = []
+        self._compiled_requirements: Optional[CompiledLocationRequirements] = None
+        self._derived: dict[Any, Any] = {}
         self.make_location_graph(settings)
 
+    @staticmethod
+    def cached(settings: RandomizerSettings, secondary_graph: bool = False) -> "Locations":
+        """
+        Returns a shared graph for the given settings, building it only if no graph has been built for an equivalent
+        set of settings yet. Shared graphs (and the locations in them) must be treated as read-only.
+        """
+        key = _graph_cache_key(settings, secondary_graph)
+        with _cached_graphs_lock:
+            locations = _cached_graphs.get(key)
+        if locations is None:
+            locations = Locations(settings, secondary_graph)
+            with _cached_graphs_lock:
+                if key not in _cached_graphs and len(_cached_graphs) >= _MAX_CACHED_GRAPHS:
+                    # Evict the oldest entry
+                    del _cached_graphs[next(iter(_cached_graphs))]
+                locations = _cached_graphs.setdefault(key, locations)
+        return locations
+
+    def derived(self, key: Any, factory: Callable[[], T]) -> T:
+        """
+        Returns a value computed purely from this graph (hop tables, depth classifications, etc.), computing it with
+        the factory the first time the key is requested.
+        """
+        value = self._derived.get(key)
+        if value is None:
+            value = factory()
+            self._derived[key] = value
+        return value
+
+    def hops_from_start(self) -> list[tuple[str, int]]:
+        """ Returns the (node ID, distance) pairs of a breadth-first search from the starting node. """
+        return self.derived("hops_from_start", lambda: self.location_graph.get_hops(START_NODE))
+
     def _all_locations_iter(self) -> Iterator[KH2Location]:
         graph = self.location_graph
         for node_id in graph.nodes.keys():
@@ -88,6 +194,12 @@ class Locations:
 
         return result
 
+    def compiled_requirements(self) -> CompiledLocationRequirements:
+        """ Returns the compiled requirements for this graph, compiling them the first time they're needed. """
+        if self._compiled_requirements is None:
+            self._compiled_requirements = CompiledLocationRequirements(self.location_graph)
+        return self._compiled_requirements
+
     def node_ids(self) -> list[str]:
         """ Returns a list of all the node IDs in the graph. """
         return self.location_graph.node_list()
@@ -123,6 +235,28 @@ class Locations:
         """ Returns a list of the locations for the given node ID. """
         return self.location_graph.node_data(node_id).locations
 
+    def location_groups(self) -> list[tuple[KH2Location, int, int]]:
+        """
+        Groups together locations that share their location types and category (and ID, for levels), since settings
+        enable and disable locations based on those. Returns a representative location, the number of locations, and
+        the total number of vanilla items for each group.
+        """
+        def make_groups() -> list[tuple[KH2Location, int, int]]:
+            groups: dict[tuple, list] = {}
+            for location in self._all_locations_iter():
+                category = location.LocationCategory
+                level_id = location.LocationId if category is locationCategory.LEVEL else None
+                key = (tuple(location.LocationTypes), category, level_id)
+                group = groups.get(key)
+                if group is None:
+                    groups[key] = [location, 1, len(location.VanillaItems)]
+                else:
+                    group[1] += 1
+                    group[2] += len(location.VanillaItems)
+            return [(location, count, vanilla_items) for location, count, vanilla_items in groups.values()]
+
+        return self.derived("location_groups", make_groups)
+
     def locations_for_category(self, category: locationCategory) -> list[KH2Location]:
         """ Returns all locations whose category matches the input category. """
         return [location for location in self._all_locations_iter() if category == location.LocationCategory]
@@ -41,5 +41,5 @@ hashTextEntries = [
 ]
 
 
-def generate_hash_icons() -> list[str]:
-    return random.choices(hashTextEntries, k=7)
+def generate_hash_icons(rng: random.Random) -> list[str]:
+    return rng.choices(hashTextEntries, k=7)
@@ -4,12 +4,13 @@ from typing import Optional, Union, Callable
 from altgraph.Graph import Graph
 
 from Class.exceptions import GeneratorException
+from Class.inventory import Inventory
 from Class.newLocationClass import KH2Location
 from List.configDict import locationType, itemType, locationCategory
 from List.inventory.item import InventoryItem
 from Module.RandomizerSettings import RandomizerSettings
 
-RequirementFunction = Callable[[list[int]], bool]
+RequirementFunction = Callable[[Inventory], bool]
 
 
 START_NODE = "Starting"
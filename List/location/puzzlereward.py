@@ -1,5 +1,6 @@
 from enum import Enum
 
+from Class.inventory import Inventory
 from Class.newLocationClass import KH2Location
 from List.configDict import locationType, locationCategory, itemType
 from List.location.graph import DefaultLogicGraph, RequirementEdge, LocationGraphBuilder, START_NODE
@@ -28,7 +29,7 @@ class PuzzleLogicGraph(DefaultLogicGraph):
         DefaultLogicGraph.__init__(self,NodeId)
 
         if not reverse_rando:
-            def awakening_checker(inv: list[int]) -> bool:
+            def awakening_checker(inv: Inventory) -> bool:
                 return (
                     ItemPlacementHelpers.need_growths(inv)
                     and ItemPlacementHelpers.hb1_check(inv)
@@ -37,7 +38,7 @@ class PuzzleLogicGraph(DefaultLogicGraph):
                     and ItemPlacementHelpers.lod1_check(inv)
                 )
 
-            def heart_checker(inv: list[int]) -> bool:
+            def heart_checker(inv: Inventory) -> bool:
                 return (
                     ItemPlacementHelpers.need_growths(inv)
                     and ItemPlacementHelpers.dc2_check(inv)
@@ -47,7 +48,7 @@ class PuzzleLogicGraph(DefaultLogicGraph):
                     and ItemPlacementHelpers.lod1_check(inv)
                 )
 
-            def duality_checker(inv: list[int]) -> bool:
+            def duality_checker(inv: Inventory) -> bool:
                 return (
                     ItemPlacementHelpers.need_growths(inv)
                     and ItemPlacementHelpers.ht1_check(inv)
@@ -58,7 +59,7 @@ class PuzzleLogicGraph(DefaultLogicGraph):
                     and ItemPlacementHelpers.hb1_check(inv)
                 )
 
-            def frontier_checker(inv: list[int]) -> bool:
+            def frontier_checker(inv: Inventory) -> bool:
                 return (
                     ItemPlacementHelpers.need_growths(inv)
                     and ItemPlacementHelpers.tt2_check(inv)
@@ -69,7 +70,7 @@ class PuzzleLogicGraph(DefaultLogicGraph):
                     and ItemPlacementHelpers.pr1_check(inv)
                     and ItemPlacementHelpers.lod1_check(inv)
                 )
-            def daylight_checker(inv: list[int]) -> bool:
+            def daylight_checker(inv: Inventory) -> bool:
                 return (
                     ItemPlacementHelpers.need_growths(inv)
                     and ItemPlacementHelpers.need_torn_pages(5)(inv)
@@ -86,7 +87,7 @@ class PuzzleLogicGraph(DefaultLogicGraph):
                     and ItemPlacementHelpers.twtnw_roxas_check(inv)
                 )
 
-            def sunset_checker(inv: list[int]) -> bool:
+            def sunset_checker(inv: Inventory) -> bool:
                 return (
                     ItemPlacementHelpers.need_growths(inv)
                     and ItemPlacementHelpers.hb2_check(inv)
@@ -106,28 +107,28 @@ class PuzzleLogicGraph(DefaultLogicGraph):
             self.logic[START_NODE][NodeId.DaylightPuzzle] = daylight_checker
             self.logic[START_NODE][NodeId.SunsetPuzzle] = sunset_checker
         else:
-            def awakening_checker(inv: list[int]) -> bool:
+            def awakening_checker(inv: Inventory) -> bool:
                 return (
                     ItemPlacementHelpers.need_growths(inv)
                     and ItemPlacementHelpers.bc2_check(inv)
                     and ItemPlacementHelpers.tt3_check(inv)
                 )
 
-            def heart_checker(inv: list[int]) -> bool:
+            def heart_checker(inv: Inventory) -> bool:
                 return (
                     ItemPlacementHelpers.need_growths(inv)
                     and ItemPlacementHelpers.oc2_check(inv)
                     and ItemPlacementHelpers.pr2_check(inv)
                 )
 
-            def duality_checker(inv: list[int]) -> bool:
+            def duality_checker(inv: Inventory) -> bool:
                 return (
                     ItemPlacementHelpers.need_growths(inv)
                     and ItemPlacementHelpers.pr2_check(inv)
                     and ItemPlacementHelpers.oc2_check(inv)
                 )
 
-            def frontier_checker(inv: list[int]) -> bool:
+            def frontier_checker(inv: Inventory) -> bool:
                 return (
                     ItemPlacementHelpers.need_growths(inv)
                     and ItemPlacementHelpers.pr2_check(inv)
@@ -135,7 +136,7 @@ class PuzzleLogicGraph(DefaultLogicGraph):
                     and ItemPlacementHelpers.need_fire_blizzard_thunder(inv)
                 )
 
-            def daylight_checker(inv: list[int]) -> bool:
+            def daylight_checker(inv: Inventory) -> bool:
                 return (
                     ItemPlacementHelpers.need_growths(inv)
                     and ItemPlacementHelpers.need_torn_pages(5)(inv)
@@ -145,7 +146,7 @@ class PuzzleLogicGraph(DefaultLogicGraph):
                     and ItemPlacementHelpers.hb2_check(inv)
                 )
 
-            def sunset_checker(inv: list[int]) -> bool:
+            def sunset_checker(inv: Inventory) -> bool:
                 return (
                     ItemPlacementHelpers.need_growths(inv)
                     and ItemPlacementHelpers.hb2_check(inv)
@@ -509,7 +509,7 @@ class HintUtils:
             ]
             if len(filtered_list) == 0:
                 return None, None, None
-            return random.choice(filtered_list)
+            return settings.rng.choice(filtered_list)
 
         def reduce_list(
                 input_report_num: int,
@@ -528,7 +528,7 @@ class HintUtils:
         for _ in range(50):
             data = copy.deepcopy(report_number_to_world_to_item)
             report_assignments = {}
-            random.shuffle(hintable_worlds)
+            settings.rng.shuffle(hintable_worlds)
             if len(hintable_worlds) >= 13:
                 final_hintable_worlds = hintable_worlds[0:13]
             else:
@@ -596,7 +596,7 @@ class HintUtils:
             ]
             if len(filtered_list) == 0:
                 return None, None, None
-            return random.choice(filtered_list)
+            return settings.rng.choice(filtered_list)
 
         def reduce_list(
                 input_report_num: Optional[int],
@@ -648,7 +648,7 @@ class HintUtils:
             # cull down the world list to a set of 13
             selected_worlds = copy.deepcopy(priorities)
             remaining_worlds = [world for world in hintable_worlds if world not in selected_worlds]
-            random.shuffle(remaining_worlds)
+            settings.rng.shuffle(remaining_worlds)
             selected_worlds = selected_worlds + remaining_worlds
             selected_worlds = selected_worlds[0:13]
 
@@ -657,7 +657,7 @@ class HintUtils:
                 continue
 
             report_numbers = list(range(1, 14))
-            random.shuffle(report_numbers)
+            settings.rng.shuffle(report_numbers)
             report_assignments = {}
             # try to assign the proof reports
             for index, world in enumerate(selected_worlds):
@@ -704,10 +704,11 @@ class HintUtils:
     def jsmartee_progression_hints(
         world_items: WorldItems,
         jsmartee_data: list[JsmarteeHintData],
+        rng: random.Random,
     ) -> dict[int, dict[str, Any]]:
         # output all the data as sequential reports
         report_assignments = {}
-        random.shuffle(jsmartee_data)
+        rng.shuffle(jsmartee_data)
         for chosen_report, hint_data in enumerate(jsmartee_data):
             if chosen_report < 13:
                 location = world_items.report_information[chosen_report + 1]["FoundIn"]
@@ -726,6 +727,7 @@ class HintUtils:
         path_data: list[PathHintData],
         tracker_data: CommonTrackerInfo,
         hintable_worlds: list[locationType],
+        rng: random.Random,
     ) -> dict[int, dict[str, Any]]:
         progression_hints = tracker_data.progression_settings is not None
         must_hint = list(
@@ -758,7 +760,7 @@ class HintUtils:
             report_assignments = {}
             report_numbers = list(range(1, 14))
             # shuffle first 13 reports
-            random.shuffle(report_numbers)
+            rng.shuffle(report_numbers)
             if progression_hints:
                 report_numbers = report_numbers + list(range(14, len(all_data) + 1))
                 # make sure all worlds with no items are last, and worlds that are enabled are before disabled ones
@@ -792,7 +794,7 @@ class HintUtils:
         if tracker_data.progression_settings is not None:
             # report locations don't matter, but we'll populate the report locations anyway
             data = {}
-            random.shuffle(worlds_to_hint)
+            settings.rng.shuffle(worlds_to_hint)
             for index, w in enumerate(worlds_to_hint):
                 if index < 13:
                     location = world_items.report_information[index + 1]["FoundIn"]
@@ -802,7 +804,7 @@ class HintUtils:
             return data
 
         for _ in range(50):
-            random.shuffle(worlds_to_hint)
+            settings.rng.shuffle(worlds_to_hint)
             selected_worlds = worlds_to_hint[0:13]
             data = {}
             for index, w in enumerate(selected_worlds):
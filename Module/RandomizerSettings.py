@@ -26,6 +26,7 @@ from List.inventory import report, proof, form, storyunlock, magic, misc
 from List.inventory.keyblade import get_locking_keyblade_names
 from Module.modifier import SeedModifier
 from Module.progressionPoints import ProgressionPoints
+from Module.seedshare import SharedSeed
 
 
 class RandomizerSettings:
@@ -427,8 +428,11 @@ class RandomizerSettings:
         self.spoiler_log: bool = spoiler_log
         self.ui_version: str = ui_version
         self.boss_enemy_overrides: str = boss_enemy_overrides if boss_enemy_overrides and (self.enemy_options["boss"] != "Disabled" or self.enemy_options["enemy"] != "Disabled") else ""
+        # Random stream for everything this generation does. Kept per settings object (rather than using the global
+        # random module) so that several seeds can be generated side by side without interfering with each other.
+        self.rng = random.Random()
         self.create_full_seed_string()
-        self.seedHashIcons: list[str] = generate_hash_icons()
+        self.seedHashIcons: list[str] = generate_hash_icons(self.rng)
 
         self.statSanity: bool = ui_settings.get(settingkey.STATSANITY)
         self.yeetTheBear: bool = ui_settings.get(settingkey.YEET_THE_BEAR)
@@ -728,7 +732,20 @@ class RandomizerSettings:
             + str(self.ui_settings.settings_string())
         )
         self.full_rando_seed = seed_string_from_all_inputs
-        random.seed(seed_string_from_all_inputs)
+        self.rng.seed(seed_string_from_all_inputs)
+
+    def rename_seed(self, seed_name: str):
+        """
+        Switches the settings over to a different seed name, leaving them as if they had been made with that name: the
+        random stream and hash icons start over from it, and the share string (if there is one) refers to it.
+        """
+        self.random_seed = seed_name
+        self.create_full_seed_string()
+        self.seedHashIcons = generate_hash_icons(self.rng)
+        if self.seed_string:
+            shared_seed = SharedSeed.from_share_string(self.ui_version, self.seed_string)
+            shared_seed.seed_name = seed_name
+            self.seed_string = shared_seed.to_share_string()
 
     def validateSettings(self):
         boss_depths = [
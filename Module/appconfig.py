@@ -1,10 +1,13 @@
 import json
+import os
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import IO, Optional, Union
 
 import yaml
 
 AUTOSAVE_FOLDER = "auto-save"
+CACHE_FOLDER = "cache"
 PRESET_FOLDER = "presets"
 
 
@@ -52,6 +55,65 @@ def auto_save_folder() -> Path:
     return Path(AUTOSAVE_FOLDER)
 
 
+def cache_folder() -> Path:
+    """Returns the folder for files the generator derives from its own data. Anything in it can safely be deleted."""
+    return Path(CACHE_FOLDER)
+
+
+class AtomicFile:
+    """
+    File that is written under a temporary name next to its destination and only moved into place once it has been
+    written in full, so other processes (such as other generations sharing the cache folder) never see a partially
+    written file. Used as a context manager around writing: entering opens the temporary file, and leaving moves it
+    into place, or removes it if writing failed.
+    """
+
+    def __init__(self, path: Union[str, Path], mode: str = "wb", encoding: Optional[str] = None):
+        self.path = Path(path)
+        # Keeps the extension, so libraries that go by the file name (such as for image formats) still can
+        self.temp_path = self.path.with_name(f".{os.getpid()}-{threading.get_ident()}-{self.path.name}")
+        self._mode = mode
+        self._encoding = encoding
+        self._file: Optional[IO] = None
+
+    def __enter__(self) -> IO:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.temp_path, self._mode, encoding=self._encoding)
+        return self._file
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self._file.close()
+            self._file = None
+            os.replace(self.temp_path, self.path)
+        else:
+            self.discard()
+        return False
+
+    def discard(self):
+        """Removes the temporary file, for when writing was stopped partway."""
+        try:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.temp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def texture_recolor_workers() -> int:
+    """Returns how many processes to recolor textures with. Defaults to one per CPU."""
+    randomizer_config = read_app_config()
+    workers = randomizer_config.get('texture_recolor_workers', os.cpu_count() or 1)
+    return max(1, int(workers))
+
+
+def texture_recolor_cache_size() -> int:
+    """Returns how many bytes of generated texture recolors to keep between seeds. Defaults to 1 GB."""
+    randomizer_config = read_app_config()
+    return int(randomizer_config.get('texture_recolor_cache_mb', 1024)) * 1024 * 1024
+
+
 def read_openkh_path() -> Optional[Path]:
     randomizer_config = read_app_config()
     openkh_path = Path(randomizer_config.get('openkh_folder', 'to-nowhere'))
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import NamedTuple, Optional
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP64_LIMIT
+
+from Module import appconfig
+from Module.resources import resource_path
+
+
+class DeflatedAsset(NamedTuple):
+    data: bytes
+    crc: int
+    file_size: int
+
+
+class _SourceStamp(NamedTuple):
+    mtime_ns: int
+    size: int
+    content_hash: str
+
+
+class DeflatedAssetStore:
+    """
+    Content-addressed store of compressed static files. Each file's content is deflated once, the same way ZipFile
+    would with ZIP_DEFLATED, and the compressed bytes are then reused for every zip the file goes into. Compressed
+    entries are also written to the cache folder so they survive between runs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._assets: dict[str, DeflatedAsset] = {}
+        self._stamps: dict[str, _SourceStamp] = {}
+
+    @staticmethod
+    def _cache_path(content_hash: str) -> Path:
+        return appconfig.cache_folder() / "deflated" / content_hash
+
+    def _content_hash(self, file_path: str, stat: os.stat_result) -> tuple[str, Optional[bytes]]:
+        """Returns the hash of the file's content, along with the content if it had to be read to get the hash."""
+        stamp = self._stamps.get(file_path)
+        if stamp is not None and stamp.mtime_ns == stat.st_mtime_ns and stamp.size == stat.st_size:
+            return stamp.content_hash, None
+        with open(file_path, "rb") as file:
+            content = file.read()
+        content_hash = hashlib.sha256(content).hexdigest()
+        self._stamps[file_path] = _SourceStamp(stat.st_mtime_ns, stat.st_size, content_hash)
+        return content_hash, content
+
+    def deflated(self, file_path: str, stat: os.stat_result) -> DeflatedAsset:
+        """Returns the compressed form of the given file, compressing it only if it hasn't been seen before."""
+        with self._lock:
+            content_hash, content = self._content_hash(file_path, stat)
+            asset = self._assets.get(content_hash)
+            if asset is not None:
+                return asset
+
+        if content is None:
+            with open(file_path, "rb") as file:
+                content = file.read()
+        crc = zlib.crc32(content)
+        cache_path = self._cache_path(content_hash)
+        asset = _read_cache_file(cache_path, crc, len(content))
+        if asset is None:
+            compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+            asset = DeflatedAsset(compressor.compress(content) + compressor.flush(), crc, len(content))
+            _write_cache_file(cache_path, asset.data)
+
+        with self._lock:
+            return self._assets.setdefault(content_hash, asset)
+
+
+def _read_cache_file(cache_path: Path, crc: int, file_size: int) -> Optional[DeflatedAsset]:
+    """
+    Returns the compressed entry from the cache folder, or None if there isn't one or it doesn't inflate back to
+    exactly the content it is meant to hold (a truncated or otherwise damaged file), so it gets compressed again.
+    """
+    try:
+        with open(cache_path, "rb") as cache_file:
+            data = cache_file.read()
+        decompressor = zlib.decompressobj(-15)
+        inflated = decompressor.decompress(data, file_size + 1)
+        if (
+            decompressor.eof
+            and not decompressor.unused_data
+            and len(inflated) == file_size
+            and zlib.crc32(inflated) == crc
+        ):
+            return DeflatedAsset(data, crc, file_size)
+    except (OSError, zlib.error):
+        pass
+    return None
+
+
+def _write_cache_file(cache_path: Path, data: bytes):
+    try:
+        with appconfig.AtomicFile(cache_path) as cache_file:
+            cache_file.write(data)
+    except OSError:
+        # Not being able to write the cache just means compressing again next run
+        pass
+
+
+_store = DeflatedAssetStore()
+_static_folder = os.path.join(os.path.abspath(resource_path("static")), "")
+
+
+# ZipFile internals that _write_compressed relies on
+_ZIP_FILE_INTERNALS = ["_lock", "_seekable", "start_dir", "_writecheck", "_didModify", "_writing"]
+
+
+def _can_write_compressed(zip_file: ZipFile) -> bool:
+    """Returns whether the zip file has the internals needed to write already compressed entries into it."""
+    return all(hasattr(zip_file, name) for name in _ZIP_FILE_INTERNALS) and hasattr(ZipInfo, "FileHeader")
+
+
+class AssetZipFile(ZipFile):
+    """
+    ZipFile that copies files from the static folder into the zip already compressed, using the shared asset store,
+    instead of compressing them again for every zip. All other files are written as usual.
+    """
+
+    def write(self, filename, arcname=None, compress_type=None, compresslevel=None):
+        file_path = os.path.abspath(filename)
+        stored_compression = compress_type if compress_type is not None else self.compression
+        stored_level = compresslevel if compresslevel is not None else self.compresslevel
+        if (
+            not file_path.startswith(_static_folder)
+            or stored_compression != ZIP_DEFLATED
+            or stored_level not in [None, zlib.Z_DEFAULT_COMPRESSION]
+            or not _can_write_compressed(self)
+            or not self.fp
+            or self._writing
+        ):
+            return super().write(filename, arcname, compress_type, compresslevel)
+
+        zinfo = ZipInfo.from_file(filename, arcname, strict_timestamps=getattr(self, "_strict_timestamps", True))
+        if zinfo.is_dir():
+            return super().write(filename, arcname, compress_type, compresslevel)
+
+        asset = _store.deflated(file_path, os.stat(file_path))
+        zinfo.compress_type = ZIP_DEFLATED
+        zinfo.file_size = asset.file_size
+        zinfo.compress_size = len(asset.data)
+        zinfo.CRC = asset.crc
+        zinfo.flag_bits = 0x00
+        self._write_compressed(zinfo, asset.data)
+
+    def _write_compressed(self, zinfo: ZipInfo, data: bytes):
+        """
+        Writes an entry whose data is already compressed, mirroring what ZipFile does when writing normally. ZipFile
+        has no public way to do this (opening an entry for writing always compresses what is written), so this relies
+        on its internals, and is only used when _can_write_compressed finds them all.
+        """
+        zip64 = zinfo.file_size * 1.05 > ZIP64_LIMIT
+        with self._lock:
+            if self._seekable:
+                self.fp.seek(self.start_dir)
+            zinfo.header_offset = self.fp.tell()
+            self._writecheck(zinfo)
+            self._didModify = True
+            # The sizes and CRC are already known, so the header can be written complete up front
+            self.fp.write(zinfo.FileHeader(zip64))
+            self.fp.write(data)
+            self.start_dir = self.fp.tell()
+            self.filelist.append(zinfo)
+            self.NameToInfo[zinfo.filename] = zinfo
@@ -1,8 +1,9 @@
 import random
+from typing import Optional
 
 from Class.exceptions import BackendException
 from List.configDict import locationType, BattleLevelOption
-from Module.resources import resource_path
+from Module.staticbinary import parsed_static_binary, static_binary
 
 
 def number_to_bytes(item):
@@ -15,6 +16,9 @@ def number_to_bytes(item):
 def bytes_to_number(byte0, byte1=0):
     return int(byte0)+int(byte1<<8)
 
+def _parse_vanilla_flags(btlv_binary: bytes) -> list[list[int]]:
+    return [list(btlv_binary[8 + 32 * x + 8:8 + 32 * x + 32]) for x in range(20)]
+
 class BtlvViewer():
     def __init__(self):            
         self.worlds = [None,None,locationType.TT,None,locationType.HB,locationType.BC,locationType.OC,locationType.Agrabah,
@@ -23,10 +27,10 @@ class BtlvViewer():
         self.goa_btlv = True
         self.random_option = None
         self.battle_level_range = None
-        btlv_file = "static/btlv.bin"
+        self.btlv_file = "btlv.bin"
 
         if self.goa_btlv:
-            btlv_file = "static/goa_btlv.bin"
+            self.btlv_file = "goa_btlv.bin"
             self.visit_flags = {}
             self.visit_flags[locationType.STT] = [(2,0x00010),(2,0x00020),(2,0x00040)]
             self.visit_flags[locationType.TT] = [(2,0x00100),(2,0x00200),(2,0x00800)]
@@ -56,8 +60,7 @@ class BtlvViewer():
             self.visit_flags[locationType.SP] = [(17,0x147D01),(17,0x15FD79)]
             self.visit_flags[locationType.TWTNW] = [(18,0x157D79)]
         
-        with open(resource_path(btlv_file), "rb") as btlvBar:
-            self.binaryContent = bytearray(btlvBar.read())
+        self.binaryContent = bytearray(static_binary(self.btlv_file))
         self._make_btlv_vanilla()
 
     def use_setting(
@@ -66,7 +69,9 @@ class BtlvViewer():
             battle_level_offset: int,
             battle_level_range: int,
             battle_level_random_min_max: tuple[int, int],
+            rng: Optional[random.Random] = None,
     ):
+        self.rng = rng if rng is not None else random.Random()
         self.random_option = setting_name
         self.battle_level_range = battle_level_range
         self.random_option = self.random_option.upper()
@@ -105,8 +110,7 @@ class BtlvViewer():
     def write_modifications(self) -> bytearray:
         for x in range(20):
             offset = 8 + 32 * x
-            for y in range(8, 32):
-                self.binaryContent[offset + y] = number_to_bytes(self.flags[x][y - 8])[0]
+            self.binaryContent[offset + 8:offset + 32] = bytes(number_to_bytes(flag)[0] for flag in self.flags[x])
         return self.binaryContent
 
     def _interpret_flags(self, flags_entry):
@@ -128,12 +132,8 @@ class BtlvViewer():
 
     def _make_btlv_vanilla(self):
         self.random_option = None
-        self.flags = []
-        for x in range(20):
-            offset = 8+32*x
-            self.flags.append([])
-            for y in range(8,32):
-                self.flags[-1].append(bytes_to_number(self.binaryContent[offset+y]))
+        # The vanilla levels are parsed once and shared, so each viewer gets its own copy to modify
+        self.flags = [list(row) for row in parsed_static_binary(self.btlv_file, _parse_vanilla_flags)]
     
     def _variance_btlv(self):
         level_range = self.battle_level_range
@@ -144,13 +144,13 @@ class BtlvViewer():
         for world, visit_flag_list in self.visit_flags.items():
             current_btlvs = self.get_battle_levels(world)
             for visit_number in range(len(visit_flag_list)):
-                btlv_change = random.randint(-level_range, level_range)
+                btlv_change = self.rng.randint(-level_range, level_range)
                 self._set_battle_level(world,visit_flag_list[visit_number][0],visit_number,current_btlvs[visit_number]+btlv_change)
 
     def _pure_random_btlv(self, btlv_minimum: int, btlv_maximum: int):
         for world, visit_flag_list in self.visit_flags.items():
             for visit_number in range(len(visit_flag_list)):
-                btlv_change = random.randint(btlv_minimum, btlv_maximum)
+                btlv_change = self.rng.randint(btlv_minimum, btlv_maximum)
                 self._set_battle_level(world, visit_flag_list[visit_number][0], visit_number, btlv_change)
 
     def _shuffle_btlv(self):
@@ -158,7 +158,7 @@ class BtlvViewer():
         for world, visit_flag_list in self.visit_flags.items():
             battle_level_list += self.get_battle_levels(world)
 
-        random.shuffle(battle_level_list)
+        self.rng.shuffle(battle_level_list)
 
         for world, visit_flag_list in self.visit_flags.items():
             for visit_number in range(len(visit_flag_list)):
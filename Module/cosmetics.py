@@ -79,12 +79,12 @@ class CosmeticsMod:
             (custom_music_path / folder).mkdir(exist_ok=True)
 
     @staticmethod
-    def randomize_music(ui_settings: SeedSettings) -> tuple[list[Asset], dict[str, str]]:
+    def randomize_music(ui_settings: SeedSettings, rng: random.Random) -> tuple[list[Asset], dict[str, str]]:
         """
         Randomizes music, returning a list of assets to be added to the seed mod and a dictionary of which song was
         replaced by which replacement.
         """
-        return CosmeticsMod._get_music_assets(ui_settings)
+        return CosmeticsMod._get_music_assets(ui_settings, rng)
 
     @staticmethod
     def get_keyblade_summary() -> dict[str, int]:
@@ -180,7 +180,7 @@ class CosmeticsMod:
         return result
 
     @staticmethod
-    def _get_music_assets(settings: SeedSettings) -> tuple[list[Asset], dict[str, str]]:
+    def _get_music_assets(settings: SeedSettings, rng: random.Random) -> tuple[list[Asset], dict[str, str]]:
         music_rando_enabled = settings.get(settingkey.MUSIC_RANDO_ENABLED_PC)
         if not music_rando_enabled:
             return [], {}
@@ -195,7 +195,7 @@ class CosmeticsMod:
         music_files = CosmeticsMod._collect_music_files(settings)
         for category, song_list in music_files.items():
             main_list = song_list.copy()
-            random.shuffle(main_list)
+            rng.shuffle(main_list)
             music_files_by_categories[category] = main_list
 
             backup_files_by_categories[category] = song_list
@@ -206,13 +206,13 @@ class CosmeticsMod:
         music_list_file_path = CosmeticsMod.bootstrap_music_list_file()
         with open(music_list_file_path, encoding='utf-8') as music_list_file:
             music_metadata = json.load(music_list_file)
-        random.shuffle(music_metadata)
+        rng.shuffle(music_metadata)
         for info in music_metadata:
             filename = info['filename']
             title = info['title']
             types = [song_type.lower() for song_type in info['type'] if song_type.lower() in music_files_by_categories]
             if len(types) > 0:
-                random.shuffle(types)
+                rng.shuffle(types)
 
                 for chosen_type in types:
                     songs_for_chosen_type = music_files_by_categories[chosen_type]
@@ -221,7 +221,7 @@ class CosmeticsMod:
                     # If duplicates are not allowed and we run out of replacements, more will end up un-randomized.
                     if len(songs_for_chosen_type) == 0 and allow_duplicates:
                         refill_list = backup_files_by_categories[chosen_type].copy()
-                        random.shuffle(refill_list)
+                        rng.shuffle(refill_list)
                         music_files_by_categories[chosen_type] = refill_list
                         songs_for_chosen_type = refill_list
 
@@ -262,7 +262,7 @@ class CosmeticsMod:
             (item_pictures_path / category.lower()).mkdir(exist_ok=True)
 
     @staticmethod
-    def randomize_keyblades(seed_settings: SeedSettings) -> tuple[list[Asset], dict[str, str]]:
+    def randomize_keyblades(seed_settings: SeedSettings, rng: random.Random) -> tuple[list[Asset], dict[str, str]]:
         """
         Randomizes keyblades, returning a list of assets to be added to the seed mod and a dictionary of which keyblade
         was replaced by which replacement.
@@ -270,30 +270,31 @@ class CosmeticsMod:
         return KeybladeRandomizer.randomize_keyblades(
             setting=seed_settings.get(settingkey.KEYBLADE_RANDO),
             include_effects=seed_settings.get(settingkey.KEYBLADE_RANDO_INCLUDE_EFFECTS),
-            allow_duplicate_replacement=seed_settings.get(settingkey.KEYBLADE_RANDO_ALLOW_DUPLICATES)
+            allow_duplicate_replacement=seed_settings.get(settingkey.KEYBLADE_RANDO_ALLOW_DUPLICATES),
+            rng=rng,
         )
 
     @staticmethod
-    def randomize_field2d(seed_settings: SeedSettings) -> list[Asset]:
+    def randomize_field2d(seed_settings: SeedSettings, rng: random.Random) -> list[Asset]:
         """Randomizes various field2d entries, returning a list of assets to be added to a mod."""
         assets: list[Asset] = []
 
         command_menu_choice = seed_settings.get(settingkey.COMMAND_MENU)
-        assets.extend(CommandMenuRandomizer(command_menu_choice).randomize_command_menus())
+        assets.extend(CommandMenuRandomizer(command_menu_choice, rng).randomize_command_menus())
 
         transition_choice = seed_settings.get(settingkey.ROOM_TRANSITION_IMAGES)
-        assets.extend(RoomTransitionImageRandomizer(transition_choice).randomize_room_transitions())
+        assets.extend(RoomTransitionImageRandomizer(transition_choice, rng).randomize_room_transitions())
 
         return assets
 
     @staticmethod
-    def randomize_itempics(seed_settings: SeedSettings) -> list[Asset]:
+    def randomize_itempics(seed_settings: SeedSettings, rng: random.Random) -> list[Asset]:
         """Randomizes various itempic entries, returning a list of assets to be added to a mod."""
         setting = seed_settings.get(settingkey.ITEMPIC_RANDO)
-        return ItempicRandomizer.randomize_itempics(setting)
+        return ItempicRandomizer.randomize_itempics(setting, rng)
 
     @staticmethod
-    def randomize_end_screen(seed_settings: SeedSettings) -> list[Asset]:
+    def randomize_end_screen(seed_settings: SeedSettings, rng: random.Random) -> list[Asset]:
         """Randomizes the ending screen, returning a list of assets to be added to a mod."""
         setting = seed_settings.get(settingkey.ENDPIC_RANDO)
-        return EndingPictureRandomizer.randomize_end_screen(setting)
+        return EndingPictureRandomizer.randomize_end_screen(setting, rng)
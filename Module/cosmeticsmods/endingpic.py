@@ -19,7 +19,7 @@ class EndingPictureRandomizer:
         }
 
     @staticmethod
-    def randomize_end_screen(setting: str) -> list[Asset]:
+    def randomize_end_screen(setting: str, rng: random.Random) -> list[Asset]:
         """Randomizes the ending screen, returning a list of assets to be added to a mod."""
 
         assets: list[Asset] = []
@@ -77,7 +77,7 @@ class EndingPictureRandomizer:
                 setting = configDict.RANDOMIZE_IN_GAME_ONLY
             else:
                 # We're only choosing one in the end, so flip a coin to choose between in-game one or custom
-                coinflip = random.randint(0, 1)
+                coinflip = rng.randint(0, 1)
                 if coinflip == 0:
                     setting = configDict.RANDOMIZE_IN_GAME_ONLY
                 else:
@@ -85,7 +85,7 @@ class EndingPictureRandomizer:
 
         if setting == configDict.RANDOMIZE_IN_GAME_ONLY:
             for endpic_list in vanilla_by_locale.values():
-                choice = random.choice(endpic_list)
+                choice = rng.choice(endpic_list)
                 assets.append({
                     "name": endpic_list[0],
                     "platform": "pc",
@@ -98,7 +98,7 @@ class EndingPictureRandomizer:
                 })
 
         if setting == configDict.RANDOMIZE_CUSTOM_ONLY and len(custom) > 0:
-            choice = random.choice(custom)
+            choice = rng.choice(custom)
             for endpic_list in vanilla_by_locale.values():
                 assets.append({
                     "name": endpic_list[0],
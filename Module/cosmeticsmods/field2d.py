@@ -41,9 +41,10 @@ KINGDOM_HEARTS_1 = "zz0"
 
 class CommandMenuRandomizer:
 
-    def __init__(self, command_menu_choice: str):
+    def __init__(self, command_menu_choice: str, rng: random.Random):
         super().__init__()
         self.command_menu_choice = command_menu_choice
+        self.rng = rng
 
     @staticmethod
     def command_menu_options() -> dict[str, str]:
@@ -159,11 +160,11 @@ class CommandMenuRandomizer:
         menu_replacements: dict[str, str] = {}
         if command_menu_choice == configDict.RANDOMIZE_ALL:
             shuffled_menus = supported_menus.copy()
-            random.shuffle(shuffled_menus)
+            self.rng.shuffle(shuffled_menus)
             for index, old_menu in enumerate(supported_menus):
                 menu_replacements[old_menu] = shuffled_menus[index]
         elif command_menu_choice == configDict.RANDOMIZE_ONE:
-            new_menu = random.choice(supported_menus)
+            new_menu = self.rng.choice(supported_menus)
             for old_menu in supported_menus:
                 menu_replacements[old_menu] = new_menu
         else:  # A specific command menu was chosen
@@ -174,9 +175,10 @@ class CommandMenuRandomizer:
 
 class RoomTransitionImageRandomizer:
 
-    def __init__(self, transition_choice: str):
+    def __init__(self, transition_choice: str, rng: random.Random):
         super().__init__()
         self.transition_choice = transition_choice
+        self.rng = rng
 
     @staticmethod
     def room_transition_options() -> dict[str, str]:
@@ -262,7 +264,7 @@ class RoomTransitionImageRandomizer:
         for index, old_transition in enumerate(supported_transitions):
             if len(candidates) == 0:
                 candidates = source_list.copy()
-                random.shuffle(candidates)
+                self.rng.shuffle(candidates)
             transition_replacements[old_transition] = candidates.pop()
 
         return transition_replacements
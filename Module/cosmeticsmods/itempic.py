@@ -49,7 +49,7 @@ class ItempicRandomizer:
         return itempic_list_file_path
 
     @staticmethod
-    def randomize_itempics(setting: str) -> list[Asset]:
+    def randomize_itempics(setting: str, rng: random.Random) -> list[Asset]:
         if setting == configDict.VANILLA:
             return []
 
@@ -73,21 +73,21 @@ class ItempicRandomizer:
         backup_files_by_categories: dict[str, list[tuple[bool, str]]] = {}
         for category, replacements in replacements_by_category.items():
             backup_files_by_categories[category] = replacements.copy()
-            random.shuffle(replacements)
+            rng.shuffle(replacements)
 
         assets: list[Asset] = []
 
         itempic_list_file_path = ItempicRandomizer.bootstrap_itempic_file()
         with open(itempic_list_file_path, encoding="utf-8") as itempic_list_file:
             itempic_metadata = json.load(itempic_list_file)
-        random.shuffle(itempic_metadata)
+        rng.shuffle(itempic_metadata)
         for info in itempic_metadata:
             itempic_id: str = info["id"]
             types: list[str] = [
                 item_type.lower() for item_type in info["type"] if item_type.lower() in replacements_by_category
             ]
             if len(types) > 0:
-                random.shuffle(types)
+                rng.shuffle(types)
 
                 for chosen_type in types:
                     itempics_for_chosen_type = replacements_by_category.get(chosen_type, [])
@@ -95,7 +95,7 @@ class ItempicRandomizer:
                     # Unlike the music rando we'll just always allow duplicate replacements here to simplify
                     if len(itempics_for_chosen_type) == 0:
                         refill_list = backup_files_by_categories.get(chosen_type, []).copy()
-                        random.shuffle(refill_list)
+                        rng.shuffle(refill_list)
                         replacements_by_category[chosen_type] = refill_list
                         itempics_for_chosen_type = refill_list
 
@@ -407,7 +407,8 @@ class KeybladeRandomizer:
     def randomize_keyblades(
             setting: str,
             include_effects: bool,
-            allow_duplicate_replacement: bool
+            allow_duplicate_replacement: bool,
+            rng: random.Random,
     ) -> tuple[list[Asset], dict[str, str]]:
         if setting == configDict.VANILLA:
             return [], {}
@@ -423,17 +424,17 @@ class KeybladeRandomizer:
 
         replacement_keys = replacement_keys.copy()
         backup_keys = replacement_keys.copy()
-        random.shuffle(replacement_keys)
+        rng.shuffle(replacement_keys)
 
         assets: list[Asset] = []
         replacements: dict[str, str] = {}
         vanilla_keyblades = _vanilla_keyblades()
-        random.shuffle(vanilla_keyblades)
+        rng.shuffle(vanilla_keyblades)
         for vanilla_key in vanilla_keyblades:
             if len(replacement_keys) == 0:
                 if allow_duplicate_replacement:
                     replacement_keys = backup_keys.copy()
-                    random.shuffle(replacement_keys)
+                    rng.shuffle(replacement_keys)
                 else:
                     break
 
@@ -0,0 +1,104 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+from numpy import ndarray
+
+from Module import appconfig
+
+# Number of decoded masks kept in memory. Enough for every mask of the larger models, while still letting masks that
+# haven't been used in a while go.
+MAX_CACHED_MASKS = 64
+
+_masks: OrderedDict[str, ndarray] = OrderedDict()
+_masks_lock = threading.Lock()
+
+
+def decode_mask(mask_text: bytes) -> ndarray:
+    """
+    Decodes the (uncompressed) text of a mask file into ndarray [y, x] where the value is True for any pixels that are
+    part of the mask. The first line holds the dimensions as "y,x", followed by a line per row where any character other
+    than a space marks a pixel in the mask.
+    """
+    header, _, body = mask_text.partition(b"\n")
+    y_dimension_str, x_dimension_str = header.split(b",")
+    y_dimension = int(y_dimension_str)
+    x_dimension = int(x_dimension_str)
+
+    row_length = x_dimension + 1
+    if len(body) >= y_dimension * row_length:
+        rows = np.frombuffer(body, dtype="uint8", count=y_dimension * row_length).reshape((y_dimension, row_length))
+        if np.all(rows[:, x_dimension] == ord("\n")):
+            return rows[:, :x_dimension] != ord(" ")
+
+    # Rows that aren't all the expected length (such as a file saved with Windows line endings) are lined up one by one
+    lines = body.split(b"\n")
+    if len(lines) < y_dimension or any(len(line) < x_dimension for line in lines[:y_dimension]):
+        raise ValueError(f"Mask rows don't match the mask dimensions ({y_dimension}, {x_dimension})")
+    rows = np.frombuffer(b"".join(line[:x_dimension] for line in lines[:y_dimension]), dtype="uint8")
+    return rows.reshape((y_dimension, x_dimension)) != ord(" ")
+
+
+def load_mask(mask_file_path: Path) -> ndarray:
+    """
+    Returns the decoded mask for a mask file. Masks are kept in memory (up to MAX_CACHED_MASKS of them) and shared for
+    the life of the process, so the result is read-only.
+
+    Decoding the text of a mask is slower than reading it back in packed form, so each mask is also written to the
+    cache folder as packed bits the first time it is decoded. Both caches are keyed by a hash of the mask file, so an
+    edited mask is always decoded again.
+    """
+    with open(mask_file_path, "rb") as mask_file:
+        mask_file_content = mask_file.read()
+    content_hash = hashlib.sha256(mask_file_content).hexdigest()
+
+    with _masks_lock:
+        mask = _masks.get(content_hash)
+        if mask is not None:
+            _masks.move_to_end(content_hash)
+            return mask
+
+    cache_path = appconfig.cache_folder() / "texture-masks" / f"{content_hash}.npz"
+    mask = _read_packed_mask(cache_path)
+    if mask is None:
+        mask = decode_mask(gzip.decompress(mask_file_content))
+        _write_packed_mask(cache_path, mask)
+    mask.flags.writeable = False
+
+    with _masks_lock:
+        mask = _masks.setdefault(content_hash, mask)
+        _masks.move_to_end(content_hash)
+        while len(_masks) > MAX_CACHED_MASKS:
+            _masks.popitem(last=False)
+        return mask
+
+
+def _read_packed_mask(cache_path: Path):
+    """Returns the mask from the cache folder, or None if there isn't one. A damaged file is removed."""
+    if not cache_path.is_file():
+        return None
+    try:
+        with np.load(cache_path) as packed:
+            shape = tuple(packed["shape"])
+            bits = np.unpackbits(packed["bits"], count=shape[0] * shape[1])
+        return bits.reshape(shape).astype("bool")
+    except Exception:
+        # Empty, truncated or otherwise damaged (np.load raises anything from EOFError to zipfile.BadZipFile), so it
+        # gets decoded and written again
+        try:
+            cache_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return None
+
+
+def _write_packed_mask(cache_path: Path, mask: ndarray):
+    try:
+        with appconfig.AtomicFile(cache_path) as cache_file:
+            np.savez(cache_file, shape=np.array(mask.shape), bits=np.packbits(mask))
+    except OSError:
+        # Not being able to write the cache just means decoding again next time
+        pass
@@ -0,0 +1,244 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from Module import appconfig
+
+INDEX_FILE_NAME = "index.json"
+INDEX_LOCK_FILE_NAME = "index.lock"
+LEASES_FOLDER_NAME = "leases"
+
+# Files in the cache folder that the index doesn't know about (left behind by older versions or interrupted
+# generations) are cleaned up once they are this old. Younger ones may belong to a generation that is still running.
+ORPHAN_FILE_AGE_SECONDS = 24 * 60 * 60
+
+# The index lock is only held while reading or updating the index, so one this old was left by a generation that
+# stopped partway and can be taken over
+INDEX_LOCK_STALE_SECONDS = 60
+
+
+class TextureRecolorCache:
+    """
+    Managed folder of generated texture recolors, shared between generations.
+
+    Each recolored image is stored under a name made from what it was generated from: the model, image group and hues
+    (as encoded in the recolor file names), along with a hash of the extracted game texture it was made from. Extracting
+    the game data again gives new names, so stale recolors are never reused. An index in the folder records each entry's
+    size, source hash, when it was last used and how often it was reused, along with overall hit and miss counts. When a
+    generation finishes, the least recently used entries are removed until the folder fits the size budget. Entries used
+    by the seed just generated are always kept, since its mod still refers to them.
+
+    Several generations can share the folder at once. Each one lists the entries it uses in a lease file as soon as it
+    looks them up, and entries listed in another generation's lease are never removed, even before that generation has
+    finished and recorded them in the index. The index is only read, updated and cleaned up while holding a lock file.
+    Leases left behind by a generation that never finished stop counting once they are as old as orphaned files.
+    """
+
+    def __init__(self, folder: Path):
+        super().__init__()
+        self.folder = folder
+        self.index_path = folder / INDEX_FILE_NAME
+        index = _read_index(self.index_path)
+        self._entries: dict[str, dict[str, Any]] = index["entries"]
+        self._sources: dict[str, dict[str, Any]] = index["sources"]
+        self._used: dict[str, dict[str, Any]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._lease_path = folder / LEASES_FOLDER_NAME / f"{os.getpid()}-{threading.get_ident()}-{time.time_ns()}.txt"
+
+    def source_hash(self, source_path: Path) -> str:
+        """Returns the hash of a source texture, reusing the hash in the index if the file hasn't changed since."""
+        stat = source_path.stat()
+        source_key = str(source_path.absolute())
+        stamp = self._sources.get(source_key)
+        if stamp is not None and stamp["mtime_ns"] == stat.st_mtime_ns and stamp["size"] == stat.st_size:
+            return stamp["hash"]
+        with open(source_path, "rb") as source_file:
+            content_hash = hashlib.sha256(source_file.read()).hexdigest()
+        self._sources[source_key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "hash": content_hash}
+        return content_hash
+
+    def entry_path(self, model_id: str, recolor_name: str, source_path: Path) -> tuple[Path, bool]:
+        """
+        Returns where the recolor with the given name (without extension) made from the given source texture is kept,
+        and whether it has already been generated. Either way, the entry is kept for the seed being generated.
+        """
+        source_hash = self.source_hash(source_path)
+        relative_path = f"{model_id}/{recolor_name}-{source_hash[:16]}{source_path.suffix}"
+        entry_path = self.folder / relative_path
+
+        entry = self._entries.get(relative_path)
+        with _index_lock(self.folder):
+            # Leased before checking for the file, so a generation finishing now can't remove it after the check
+            self._lease(relative_path)
+            cached = entry is not None and entry_path.is_file()
+        if cached:
+            self._hits += 1
+            entry = dict(entry)
+            entry["hits"] = entry.get("hits", 0) + 1
+        else:
+            self._misses += 1
+            entry = {"hits": 0}
+        entry["name"] = f"{model_id}/{recolor_name}"
+        entry["source_hash"] = source_hash
+        self._used[relative_path] = entry
+        return entry_path, cached
+
+    def finish(self, max_bytes: int):
+        """
+        Records the entries used by this generation in the index, then removes entries that have gone stale and the
+        least recently used entries over max_bytes. Should be called once all recolors for the seed have been written.
+        """
+        now = time.time()
+        for relative_path, entry in self._used.items():
+            entry_path = self.folder / relative_path
+            entry["size"] = entry_path.stat().st_size if entry_path.is_file() else 0
+            entry["last_used"] = now
+
+        with _index_lock(self.folder):
+            self._finish_locked(max_bytes, now)
+
+        self._used = {}
+        self._hits = 0
+        self._misses = 0
+
+    def _finish_locked(self, max_bytes: int, now: float):
+        # Another generation may have updated the index since it was read, so its entries are picked up again here
+        index = _read_index(self.index_path)
+        entries: dict[str, dict[str, Any]] = index["entries"]
+        entries.update(self._used)
+        sources = index["sources"]
+        sources.update(self._sources)
+
+        self._lease_path.unlink(missing_ok=True)
+        leased = self._leased_entries(now)
+
+        used_names = {entry["name"] for entry in self._used.values()}
+        removable = []
+        for relative_path, entry in entries.items():
+            if relative_path in self._used or relative_path in leased:
+                # In use by this generation or one still running
+                continue
+            if entry.get("name") in used_names or not (self.folder / relative_path).is_file():
+                # A recolor of an older copy of the same texture, or one that has been deleted
+                removable.append((0.0, relative_path))
+            else:
+                removable.append((entry.get("last_used", 0.0), relative_path))
+        removable.sort()
+
+        total_bytes = sum(entry.get("size", 0) for entry in entries.values())
+        for last_used, relative_path in removable:
+            if last_used > 0.0 and total_bytes <= max_bytes:
+                break
+            entry = entries.pop(relative_path)
+            total_bytes -= entry.get("size", 0)
+            (self.folder / relative_path).unlink(missing_ok=True)
+
+        self._remove_orphan_files(entries, leased, now)
+
+        index["hits"] = index.get("hits", 0) + self._hits
+        index["misses"] = index.get("misses", 0) + self._misses
+        _write_index(self.index_path, index)
+
+        self._entries = entries
+        self._sources = sources
+
+    def _lease(self, relative_path: str):
+        try:
+            self._lease_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._lease_path, "a", encoding="utf-8") as lease_file:
+                lease_file.write(f"{relative_path}\n")
+        except OSError:
+            # Without a lease, the worst case is another generation removing the entry before this one is done
+            pass
+
+    def _leased_entries(self, now: float) -> set[str]:
+        """Returns the entries leased by generations still running, removing leases left behind by ones that stopped."""
+        leased = set()
+        leases_folder = self.folder / LEASES_FOLDER_NAME
+        if not leases_folder.is_dir():
+            return leased
+        for lease_path in leases_folder.iterdir():
+            try:
+                if now - lease_path.stat().st_mtime > ORPHAN_FILE_AGE_SECONDS:
+                    lease_path.unlink()
+                    continue
+                with open(lease_path, encoding="utf-8") as lease_file:
+                    leased.update(line.strip() for line in lease_file if line.strip())
+            except OSError:
+                pass
+        return leased
+
+    def _remove_orphan_files(self, entries: dict[str, dict[str, Any]], leased: set[str], now: float):
+        if not self.folder.is_dir():
+            return
+        lock_path = self.folder / INDEX_LOCK_FILE_NAME
+        for file_path in self.folder.rglob("*"):
+            if not file_path.is_file() or file_path in [self.index_path, lock_path]:
+                continue
+            relative_path = file_path.relative_to(self.folder).as_posix()
+            if relative_path.startswith(f"{LEASES_FOLDER_NAME}/"):
+                # Leases are cleaned up separately
+                continue
+            if relative_path in entries or relative_path in leased:
+                continue
+            try:
+                if now - file_path.stat().st_mtime > ORPHAN_FILE_AGE_SECONDS:
+                    file_path.unlink()
+            except OSError:
+                pass
+
+
+@contextmanager
+def _index_lock(folder: Path):
+    """
+    Holds the lock file for the index in the given folder. If the lock can't be created at all (such as the folder not
+    being writable), carries on without it, since nothing can be written to the cache in that case anyway.
+    """
+    lock_path = folder / INDEX_LOCK_FILE_NAME
+    locked = False
+    try:
+        folder.mkdir(parents=True, exist_ok=True)
+        while not locked:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                locked = True
+            except FileExistsError:
+                try:
+                    if time.time() - lock_path.stat().st_mtime > INDEX_LOCK_STALE_SECONDS:
+                        lock_path.unlink()
+                except OSError:
+                    pass
+                time.sleep(0.01)
+    except OSError:
+        pass
+    try:
+        yield
+    finally:
+        if locked:
+            lock_path.unlink(missing_ok=True)
+
+
+def _read_index(index_path: Path) -> dict[str, Any]:
+    try:
+        with open(index_path, encoding="utf-8") as index_file:
+            index = json.load(index_file)
+        if isinstance(index.get("entries"), dict) and isinstance(index.get("sources"), dict):
+            return index
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {"entries": {}, "sources": {}, "hits": 0, "misses": 0}
+
+
+def _write_index(index_path: Path, index: dict[str, Any]):
+    try:
+        with appconfig.AtomicFile(index_path, "w", encoding="utf-8") as index_file:
+            json.dump(index, index_file, indent=1, sort_keys=True)
+    except OSError:
+        # Not being able to write the index just means the recolors are generated again next time
+        pass
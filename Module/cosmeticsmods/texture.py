@@ -1,21 +1,24 @@
 import gzip
+import json
 import os
 import random
-import shutil
 import string
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Optional, Callable
+from typing import Any, Optional, Callable, NamedTuple
 
 import numpy as np
-import yaml
 from PIL import Image
 from numpy import ndarray
 
 from Class import settingkey
-from Class.openkhmod import Asset
+from Class.openkhmod import Asset, load_static_list
 from Class.seedSettings import SeedSettings
 from Module import version, appconfig
 from Module.cosmeticsmods.image import rgb_to_hsv, hsv_to_rgb
+from Module.cosmeticsmods.mask import decode_mask, load_mask
+from Module.cosmeticsmods.recolorcache import TextureRecolorCache
 from Module.resources import resource_path
 
 VANILLA = "vanilla"
@@ -67,12 +70,22 @@ class HsvaConditions:
             and self.value_condition(value) \
             and self.alpha_condition(alpha)
 
+    def matches_all(self, hue: ndarray, saturation: ndarray, value: ndarray, alpha: ndarray) -> ndarray:
+        """Returns an array that is True for each pixel whose color components match."""
+        result = np.ones(hue.shape, dtype="bool")
+        result &= self.hue_condition(hue)
+        result &= self.saturation_condition(saturation)
+        result &= self.value_condition(value)
+        result &= self.alpha_condition(alpha)
+        return result
+
 
 class PixelMatchingConditions:
     """Conditions for matching pixels."""
 
     def __init__(self, masks: list[Optional[ndarray]], hsva_conditions: Optional[HsvaConditions]):
         super().__init__()
+        self.masks = masks
         self.mask_conditions: list[Optional[MaskCondition]] = []
         for mask in masks:
             self.mask_conditions.append(_make_mask_condition(mask))
@@ -101,6 +114,31 @@ class PixelMatchingConditions:
             else:
                 return hsva_conditions.matches(hue=hue, saturation=saturation, value=value, alpha=alpha)
 
+    def matches_all(self, group_index: int, hsv_array: ndarray) -> ndarray:
+        """
+        Returns an array [x, y] that is True for each pixel of the image represented by hsv_array that matches, the same
+        as calling matches() for every pixel.
+        """
+        x_dimension, y_dimension, _ = hsv_array.shape
+        mask: Optional[ndarray] = None
+        if group_index in range(len(self.masks)):
+            mask = self.masks[group_index]
+        if mask is not None:
+            if mask.shape[0] < x_dimension or mask.shape[1] < y_dimension:
+                raise IndexError(f"Mask of size {mask.shape} is smaller than the image ({x_dimension}, {y_dimension})")
+            return mask[:x_dimension, :y_dimension]
+        else:
+            hsva_conditions = self.hsva_conditions
+            if hsva_conditions is None:
+                return np.zeros((x_dimension, y_dimension), dtype="bool")
+            else:
+                return hsva_conditions.matches_all(
+                    hue=hsv_array[..., _HUE_INDEX],
+                    saturation=hsv_array[..., _SATURATION_INDEX],
+                    value=hsv_array[..., _VALUE_INDEX],
+                    alpha=hsv_array[..., _ALPHA_INDEX],
+                )
+
 
 class RecolorDefinition:
     """Defines how to recolor a portion of an image."""
@@ -149,6 +187,54 @@ class PendingRecolor:
         self.value_offset = value_offset
 
 
+class TextureRecolorJob:
+    """An image to recolor once all the hues for a seed have been chosen. Can be run in another process."""
+
+    def __init__(
+            self,
+            source_path: Path,
+            destination_path: Path,
+            group_index: int,
+            pending_recolors: list[PendingRecolor],
+    ):
+        super().__init__()
+        self.source_path = source_path
+        self.destination_path = destination_path
+        self.group_index = group_index
+        self.pending_recolors = pending_recolors
+
+    def run(self, conditions_loader: "TextureConditionsLoader"):
+        """Recolors the source image and saves it to the destination path."""
+        if version.debug_mode():
+            print(f"Generating texture recolor for {self.destination_path}")
+
+        self.destination_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # We deliberately delay creating the full RecolorDefinitions until we know for sure we will need
+        # them. This allows us to avoid the overhead of loading mask files as long as possible.
+        recolor_definitions: list[RecolorDefinition] = []
+        for pending_recolor in self.pending_recolors:
+            conditions = conditions_loader.conditions_from_colorable_area(
+                model_id=pending_recolor.model_id,
+                area_id=pending_recolor.area_id,
+                colorable_area=pending_recolor.colorable_area
+            )
+            recolor_definitions.append(RecolorDefinition(
+                conditions=conditions,
+                new_hue=pending_recolor.new_hue,
+                new_saturation=pending_recolor.new_saturation,
+                value_offset=pending_recolor.value_offset,
+            ))
+
+        with Image.open(self.source_path) as original_image:
+            image_array = np.array(original_image.convert("RGBA"))
+            recolored_array = recolor_image(image_array, recolor_definitions, group_index=self.group_index)
+            with Image.fromarray(recolored_array, "RGBA") as new_image, \
+                    appconfig.AtomicFile(self.destination_path) as new_image_file:
+                # The image format comes from the (temporary) file's name
+                new_image.save(new_image_file)
+
+
 def make_matching_conditions(
         masks: list[Optional[ndarray]],
         hue_range: Optional[tuple[int, int]],
@@ -162,6 +248,23 @@ def make_matching_conditions(
     saturation range [0 - 100] or None
     value range [-100 - 100] or None
     """
+    hsva_conditions = make_hsva_conditions(
+        hue_range=hue_range,
+        saturation_range=saturation_range,
+        value_range=value_range
+    )
+    return PixelMatchingConditions(masks=masks, hsva_conditions=hsva_conditions)
+
+
+def make_hsva_conditions(
+        hue_range: Optional[tuple[int, int]],
+        saturation_range: Optional[tuple[int, int]],
+        value_range: Optional[tuple[int, int]]
+) -> Optional[HsvaConditions]:
+    """
+    Creates an HsvaConditions object given hue/saturation/value ranges (see make_matching_conditions), or None if there
+    are no ranges to match on.
+    """
     descriptions: list[str] = []
 
     hue_condition: Optional[ColorCondition] = None
@@ -194,40 +297,36 @@ def make_matching_conditions(
             value_condition=value_condition,
             alpha_condition=_default_color_condition
         )
-    return PixelMatchingConditions(masks=masks, hsva_conditions=hsva_conditions)
+    return hsva_conditions
 
 
 def recolor_image(rgb_array: ndarray, recolor_definitions: list[RecolorDefinition], group_index: int) -> ndarray:
-    """Applies recoloring(s) configured in recolor_definitions to the image represented by rgb_array"""
+    """
+    Applies recoloring(s) configured in recolor_definitions to the image represented by rgb_array. Each pixel is
+    recolored by the first definition that matches it, going by the pixel's original color.
+    """
     hsv_array = rgb_to_hsv(rgb_array)
 
-    x_dimension, y_dimension, _ = hsv_array.shape
-    for x in range(x_dimension):
-        for y in range(y_dimension):
-            hue: Optional[float] = hsv_array[x, y, _HUE_INDEX]
-            saturation: Optional[float] = hsv_array[x, y, _SATURATION_INDEX]
-            value: Optional[float] = hsv_array[x, y, _VALUE_INDEX]
-            alpha: Optional[float] = hsv_array[x, y, _ALPHA_INDEX]
-            for recolor_definition in recolor_definitions:
-                matches = recolor_definition.conditions.matches(
-                    x=x,
-                    y=y,
-                    group_index=group_index,
-                    hue=hue,
-                    saturation=saturation,
-                    value=value,
-                    alpha=alpha,
-                )
-                if matches:
-                    hsv_array[x, y, _HUE_INDEX] = recolor_definition.new_hue
+    # Work out all the matches up front, since recoloring changes the colors the conditions look at
+    all_matches = [definition.conditions.matches_all(group_index, hsv_array) for definition in recolor_definitions]
 
-                    new_saturation = recolor_definition.new_saturation
-                    if new_saturation is not None:
-                        hsv_array[x, y, _SATURATION_INDEX] = new_saturation
+    unclaimed: Optional[ndarray] = None
+    for recolor_definition, matches in zip(recolor_definitions, all_matches):
+        if unclaimed is None:
+            unclaimed = ~matches
+        else:
+            matches = matches & unclaimed
+            unclaimed &= ~matches
+        if not matches.any():
+            continue
+
+        hsv_array[matches, _HUE_INDEX] = recolor_definition.new_hue
 
-                    hsv_array[x, y, _VALUE_INDEX] = hsv_array[x, y, _VALUE_INDEX] + recolor_definition.value_offset
+        new_saturation = recolor_definition.new_saturation
+        if new_saturation is not None:
+            hsv_array[matches, _SATURATION_INDEX] = new_saturation
 
-                    break
+        hsv_array[matches, _VALUE_INDEX] += recolor_definition.value_offset
 
     return hsv_to_rgb(hsv_array)
 
@@ -262,30 +361,21 @@ class TextureRecolorSettings:
 
 class TextureRecolorizer:
 
-    def __init__(self, settings: SeedSettings):
+    def __init__(self, settings: SeedSettings, rng: random.Random, max_workers: Optional[int] = None):
         super().__init__()
         self.settings = settings
+        self.rng = rng
+        # Number of processes to recolor images with (defaults to the app config, which defaults to one per CPU)
+        self.max_workers = max_workers if max_workers is not None else appconfig.texture_recolor_workers()
         self.recolor_settings = TextureRecolorSettings(settings.get(settingkey.TEXTURE_RECOLOR_SETTINGS))
 
     @staticmethod
     def load_recolorable_models() -> list[dict[str, Any]]:
-        """Returns a list of all recolorable models configured in the project."""
-        recolors_path = Path(resource_path("static/recolors"))
-        recolor_templates: list[Path] = []
-        if recolors_path.is_dir():
-            for file in os.listdir(recolors_path):
-                _, extension = os.path.splitext(file)
-                if extension == ".yml":
-                    recolor_templates.append(recolors_path / file)
-
-        result: list[dict[str, Any]] = []
-        for recolor_template_path in recolor_templates:
-            with open(recolor_template_path) as recolor_template_file:
-                models = yaml.safe_load(recolor_template_file)
-                if models is not None:
-                    result.extend(models)
-
-        return result
+        """
+        Returns a list of all recolorable models configured in the project. The models are shared for the life of the
+        process and must be treated as read-only.
+        """
+        return recolor_templates().models
 
     @staticmethod
     def mask_file_to_mask(mask_file_path: Path) -> ndarray:
@@ -293,17 +383,7 @@ class TextureRecolorizer:
         Decodes a mask file into ndarray [y, x] where the value is True for any pixels that are part of the mask.
         """
         with gzip.open(mask_file_path) as mask_file:
-            first_line = mask_file.readline().decode()
-            y_dimension_str, x_dimension_str = first_line.split(",")
-            y_dimension = int(y_dimension_str)
-            x_dimension = int(x_dimension_str)
-            mask = np.zeros((y_dimension, x_dimension), dtype="bool")
-            for y in range(y_dimension):
-                line = mask_file.readline().decode()
-                for x in range(x_dimension):
-                    if line[x] != ' ':
-                        mask[y, x] = True
-            return mask
+            return decode_mask(mask_file.read())
 
     def recolor_textures(self) -> list[Asset]:
         """Returns a list of mod assets (if any) that recolor textures based on settings."""
@@ -322,12 +402,9 @@ class TextureRecolorizer:
             print("Could not find any recolor templates - not recoloring textures")
             return assets
 
-        recolors_cache_folder = Path("cache/texture-recolors")
-        if recolors_cache_folder.is_dir():
-            if not self.settings.get(settingkey.RECOLOR_TEXTURES_KEEP_CACHE):
-                shutil.rmtree(recolors_cache_folder)
+        recolor_cache = TextureRecolorCache(appconfig.cache_folder() / "texture-recolors")
 
-        conditions_loader = TextureConditionsLoader()
+        jobs: list[TextureRecolorJob] = []
 
         for model in recolorable_models:
             model_id: str = model["id"]
@@ -338,7 +415,6 @@ class TextureRecolorizer:
                 model_version_suffix = f"-v{model_version}"
 
             available_image_group_ids: list[str] = _available_group_ids()
-            model_cache_folder = recolors_cache_folder / model_id
 
             for recolor in model["recolors"]:
                 colorable_areas: list[dict[str, Any]] = recolor["colorable_areas"]
@@ -376,10 +452,15 @@ class TextureRecolorizer:
                         # (but we still need the pop above to make sure the group IDs still line up)
                         continue
 
+                    # Just use the first one as the canonical representation
+                    source_path = Path(base_path) / group[0]
                     combined_hues = "-".join(chosen_filename_hues)
-                    _, image_ext = os.path.splitext(group[0])
-                    destination_file_name = f"{model_id}{model_version_suffix}-{group_id}-{combined_hues}{image_ext}"
-                    destination_path = model_cache_folder / destination_file_name
+                    recolor_name = f"{model_id}{model_version_suffix}-{group_id}-{combined_hues}"
+                    destination_path, already_generated = recolor_cache.entry_path(
+                        model_id=model_id,
+                        recolor_name=recolor_name,
+                        source_path=source_path
+                    )
 
                     asset: Asset = {
                         "platform": "pc",
@@ -393,38 +474,25 @@ class TextureRecolorizer:
                     ]
                     assets.append(asset)
 
-                    if destination_path.is_file():
+                    if already_generated:
                         if version.debug_mode():
                             print(f"Already generated texture recolor for {destination_path}")
                         continue
 
-                    if version.debug_mode():
-                        print(f"Generating texture recolor for {destination_path}")
-
-                    destination_path.parent.mkdir(parents=True, exist_ok=True)
-
-                    # We deliberately delay creating the full RecolorDefinitions until we know for sure we will need
-                    # them. This allows us to avoid the overhead of loading mask files as long as possible.
-                    recolor_definitions: list[RecolorDefinition] = []
-                    for pending_recolor in pending_recolors:
-                        conditions = conditions_loader.conditions_from_colorable_area(
-                            model_id=pending_recolor.model_id,
-                            area_id=pending_recolor.area_id,
-                            colorable_area=pending_recolor.colorable_area
-                        )
-                        recolor_definitions.append(RecolorDefinition(
-                            conditions=conditions,
-                            new_hue=pending_recolor.new_hue,
-                            new_saturation=pending_recolor.new_saturation,
-                            value_offset=pending_recolor.value_offset,
-                        ))
+                    jobs.append(TextureRecolorJob(
+                        source_path=source_path,
+                        destination_path=destination_path,
+                        group_index=index,
+                        pending_recolors=pending_recolors,
+                    ))
 
-                    # Just use the first one as the canonical representation
-                    with Image.open(Path(base_path) / group[0]) as original_image:
-                        image_array = np.array(original_image.convert("RGBA"))
-                        recolored_array = recolor_image(image_array, recolor_definitions, group_index=index)
-                        with Image.fromarray(recolored_array, "RGBA") as new_image:
-                            new_image.save(destination_path)
+        run_texture_recolor_jobs(jobs, self.max_workers)
+
+        # Without keeping the cache, only the recolors this seed's mod refers to are left
+        if self.settings.get(settingkey.RECOLOR_TEXTURES_KEEP_CACHE):
+            recolor_cache.finish(max_bytes=appconfig.texture_recolor_cache_size())
+        else:
+            recolor_cache.finish(max_bytes=0)
 
         return assets
 
@@ -438,9 +506,9 @@ class TextureRecolorizer:
             if "new_saturation" in colorable_area:
                 # Want to leave the opportunity there for it to "roll vanilla" which wouldn't otherwise be possible
                 # with the application of a new saturation
-                return random.choice([-1] + available_random_hues)
+                return self.rng.choice([-1] + available_random_hues)
             else:
-                return random.choice(available_random_hues)
+                return self.rng.choice(available_random_hues)
         else:
             return int(area_setting)
 
@@ -453,26 +521,28 @@ def _make_mask_condition(mask: Optional[ndarray]) -> Optional[MaskCondition]:
         return lambda coordinates: bool(mask[coordinates[0], coordinates[1]])
 
 
+# The color conditions are written with numpy functions so that they work for both a single pixel's value and an array
+# with that value for every pixel in an image
 def _hue_in_range_condition(hue_start: float, hue_end: float) -> ColorCondition:
     start_ratio = hue_start / 360.0
     end_ratio = hue_end / 360.0
     if start_ratio > end_ratio:
-        return lambda hue_value: hue_value >= start_ratio or hue_value <= end_ratio
+        return lambda hue_value: np.logical_or(hue_value >= start_ratio, hue_value <= end_ratio)
     else:
-        return lambda hue_value: start_ratio <= hue_value <= end_ratio
+        return lambda hue_value: np.logical_and(start_ratio <= hue_value, hue_value <= end_ratio)
 
 
 def _saturation_in_range_condition(saturation_start: float, saturation_end: float) -> ColorCondition:
     start_ratio = saturation_start / 100.0
     end_ratio = saturation_end / 100.0
-    return lambda saturation_value: start_ratio <= saturation_value <= end_ratio
+    return lambda saturation_value: np.logical_and(start_ratio <= saturation_value, saturation_value <= end_ratio)
 
 
 def _value_in_range_condition(value_start: float, value_end: float) -> ColorCondition:
     # Of note: looks like value isn't a 0-1 like the others, just seems to go 0-256?
     adjusted_start = value_start / 100.0 * 256.0
     adjusted_end = value_end / 100.0 * 256.0
-    return lambda value_value: adjusted_start <= value_value <= adjusted_end
+    return lambda value_value: np.logical_and(adjusted_start <= value_value, value_value <= adjusted_end)
 
 
 def _available_group_ids() -> list[str]:
@@ -499,48 +569,159 @@ class TextureConditionsLoader:
     ) -> PixelMatchingConditions:
         """Returns color conditions defined by properties of the specified colorable_area."""
 
-        cache_key = f"{model_id}-{area_id}"
+        # Keyed by what the area holds rather than its ID, which isn't guaranteed to be unique within a model
+        cache_key = colorable_area_key(colorable_area)
         cached_conditions = self.conditions.get(cache_key, None)
         if cached_conditions is not None:
             return cached_conditions
         else:
-            new_conditions = self._make_conditions(colorable_area)
+            compiled_area = recolor_templates().compiled_area(colorable_area)
+            new_conditions = self._make_conditions(compiled_area)
             self.conditions[cache_key] = new_conditions
             return new_conditions
 
     @staticmethod
-    def _make_conditions(colorable_area: dict[str, Any]) -> PixelMatchingConditions:
-        mask_files: Optional[list[str]] = colorable_area.get("mask_files")
+    def _make_conditions(compiled_area: "CompiledColorableArea") -> PixelMatchingConditions:
         masks: list[Optional[ndarray]] = []
-        if mask_files is not None:
-            for mask_file_str in mask_files:
-                mask_file_path = Path(resource_path(mask_file_str))
-                if mask_file_path.is_file():
-                    masks.append(TextureRecolorizer.mask_file_to_mask(mask_file_path))
-                else:
-                    masks.append(None)
-
-        hue_start: Optional[int] = colorable_area.get("hue_start")
-        hue_end: Optional[int] = colorable_area.get("hue_end")
-        hue_range: Optional[tuple[int, int]] = None
-        if hue_start is not None and hue_end is not None:
-            hue_range = (hue_start, hue_end)
-
-        saturation_start: Optional[int] = colorable_area.get("saturation_start")
-        saturation_end: Optional[int] = colorable_area.get("saturation_end")
-        saturation_range: Optional[tuple[int, int]] = None
-        if saturation_start is not None and saturation_end is not None:
-            saturation_range = (saturation_start, saturation_end)
-
-        value_start: Optional[int] = colorable_area.get("value_start")
-        value_end: Optional[int] = colorable_area.get("value_end")
-        value_range: Optional[tuple[int, int]] = None
-        if value_start is not None and value_end is not None:
-            value_range = (value_start, value_end)
-
-        return make_matching_conditions(
-            masks=masks,
+        for mask_file_str in compiled_area.mask_files:
+            mask_file_path = Path(resource_path(mask_file_str))
+            if mask_file_path.is_file():
+                masks.append(load_mask(mask_file_path))
+            else:
+                masks.append(None)
+
+        return PixelMatchingConditions(masks=masks, hsva_conditions=compiled_area.hsva_conditions)
+
+
+class CompiledColorableArea(NamedTuple):
+    """The matching rules of a colorable area, read out of its template once."""
+
+    mask_files: tuple[str, ...]
+    hue_range: Optional[tuple[int, int]]
+    saturation_range: Optional[tuple[int, int]]
+    value_range: Optional[tuple[int, int]]
+    hsva_conditions: Optional[HsvaConditions]
+
+
+def compile_colorable_area(colorable_area: dict[str, Any]) -> CompiledColorableArea:
+    """Reads the mask files and hue/saturation/value ranges out of a colorable area from a recolor template."""
+    mask_files: Optional[list[str]] = colorable_area.get("mask_files")
+
+    hue_start: Optional[int] = colorable_area.get("hue_start")
+    hue_end: Optional[int] = colorable_area.get("hue_end")
+    hue_range: Optional[tuple[int, int]] = None
+    if hue_start is not None and hue_end is not None:
+        hue_range = (hue_start, hue_end)
+
+    saturation_start: Optional[int] = colorable_area.get("saturation_start")
+    saturation_end: Optional[int] = colorable_area.get("saturation_end")
+    saturation_range: Optional[tuple[int, int]] = None
+    if saturation_start is not None and saturation_end is not None:
+        saturation_range = (saturation_start, saturation_end)
+
+    value_start: Optional[int] = colorable_area.get("value_start")
+    value_end: Optional[int] = colorable_area.get("value_end")
+    value_range: Optional[tuple[int, int]] = None
+    if value_start is not None and value_end is not None:
+        value_range = (value_start, value_end)
+
+    return CompiledColorableArea(
+        mask_files=tuple(mask_files) if mask_files is not None else (),
+        hue_range=hue_range,
+        saturation_range=saturation_range,
+        value_range=value_range,
+        hsva_conditions=make_hsva_conditions(
             hue_range=hue_range,
             saturation_range=saturation_range,
             value_range=value_range
-        )
+        ),
+    )
+
+
+def colorable_area_key(colorable_area: dict[str, Any]) -> str:
+    """
+    Returns a key for a colorable area made from everything in it, so that areas are told apart even when they share
+    an ID, and an area handed to a worker process still finds its compiled form.
+    """
+    return json.dumps(colorable_area, sort_keys=True)
+
+
+class RecolorTemplates:
+    """
+    The recolor templates from static/recolors, along with the compiled form of every colorable area in them. Loaded
+    once per process (see recolor_templates()) and shared by the recolor settings UI and seed generation.
+    """
+
+    def __init__(self, models: list[dict[str, Any]]):
+        super().__init__()
+        self.models = models
+        # Keyed by colorable_area_key
+        self.compiled_areas: dict[str, CompiledColorableArea] = {}
+        for model in models:
+            for recolor in model["recolors"]:
+                for colorable_area in recolor["colorable_areas"]:
+                    self.compiled_areas[colorable_area_key(colorable_area)] = compile_colorable_area(colorable_area)
+
+    def compiled_area(self, colorable_area: dict[str, Any]) -> CompiledColorableArea:
+        """
+        Returns the compiled form of a colorable area. Areas that aren't part of the templates (such as ones being
+        worked on in the developer tools) are compiled on the spot.
+        """
+        compiled_area = self.compiled_areas.get(colorable_area_key(colorable_area))
+        if compiled_area is None:
+            compiled_area = compile_colorable_area(colorable_area)
+        return compiled_area
+
+
+_recolor_templates: Optional[RecolorTemplates] = None
+_recolor_templates_lock = threading.Lock()
+
+
+def recolor_templates() -> RecolorTemplates:
+    """
+    Returns the recolor templates, loading them the first time they are needed. Each template file goes through
+    load_static_list, so its parsed form is also cached to disk between runs.
+    """
+    global _recolor_templates
+    with _recolor_templates_lock:
+        if _recolor_templates is None:
+            models: list[dict[str, Any]] = []
+            recolors_path = Path(resource_path("static/recolors"))
+            if recolors_path.is_dir():
+                for file in os.listdir(recolors_path):
+                    _, extension = os.path.splitext(file)
+                    if extension == ".yml":
+                        template_models = load_static_list(f"recolors/{file}")
+                        if template_models is not None:
+                            models.extend(template_models)
+            _recolor_templates = RecolorTemplates(models)
+        return _recolor_templates
+
+
+# Conditions loaded by a recolor worker process, kept for the life of the process so that each mask file is only
+# decoded once per worker
+_worker_conditions_loader: Optional[TextureConditionsLoader] = None
+
+
+def _run_texture_recolor_job(job: TextureRecolorJob):
+    global _worker_conditions_loader
+    if _worker_conditions_loader is None:
+        _worker_conditions_loader = TextureConditionsLoader()
+    job.run(_worker_conditions_loader)
+
+
+def run_texture_recolor_jobs(jobs: list[TextureRecolorJob], max_workers: int = 1):
+    """
+    Runs the recolor jobs, spread over up to max_workers processes. The jobs only decode, recolor and save images, so
+    the order they finish in doesn't matter. Errors from any job are raised once the jobs have finished.
+    """
+    worker_count = min(max_workers, len(jobs))
+    if worker_count <= 1:
+        conditions_loader = TextureConditionsLoader()
+        for job in jobs:
+            job.run(conditions_loader)
+        return
+
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        for _ in executor.map(_run_texture_recolor_job, jobs):
+            pass
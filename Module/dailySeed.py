@@ -125,7 +125,7 @@ def enableBossEnemy(settings: SeedSettings):
     settings.set("enemy", "One to One")
 
 
-def modifyShutOut(daily: DailyModifier):
+def modifyShutOut(daily: DailyModifier, rng: random.Random):
     X = 3
     choices = [
         locationType.Level,
@@ -145,7 +145,7 @@ def modifyShutOut(daily: DailyModifier):
         locationType.SP,
         locationType.TWTNW,
     ]
-    random.shuffle(choices)
+    rng.shuffle(choices)
     shut_out_worlds = choices[:X]
     shut_out_world_names = [l.name for l in shut_out_worlds]
     daily = daily._replace(
@@ -457,7 +457,7 @@ def allDailyModifiers():
 
 
 def getDailyModifiers(date, hard_mode=False, boss_enemy=False):
-    random.seed(date.strftime("%d_%m_%Y"))
+    rng = random.Random(date.strftime("%d_%m_%Y"))
     # Weekends have more modifiers
     numMods = 3 if date.isoweekday() < 5 else 5
     chosenMods = []
@@ -474,10 +474,10 @@ def getDailyModifiers(date, hard_mode=False, boss_enemy=False):
             if m.name in [m.name for m in chosenMods]:
                 continue
             availableMods.append(m)
-        chosen = random.choice(availableMods)
+        chosen = rng.choice(availableMods)
         if chosen.initMod:
             chosen = chosen.initMod(
-                chosen
+                chosen, rng
             )  # A little strange, but the description and modifier needs to be randomly changed
         chosenMods.append(chosen)
         for c in chosen.categories:
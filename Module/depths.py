@@ -34,6 +34,11 @@ class ItemDepths:
         else:
             raise SettingsException(f"Invalid location depth {location_depth}")
 
+    @staticmethod
+    def cached(location_depth: locationDepth, locations: Locations) -> "ItemDepths":
+        """ Returns the depth classification for the given graph, reusing it if it has been computed before. """
+        return locations.derived(("item_depths", location_depth), lambda: ItemDepths(location_depth, locations))
+
     def is_valid(self, location: KH2Location):
         return self.depth_classification[location]
 
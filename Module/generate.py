@@ -1,78 +1,262 @@
+import multiprocessing
 import random
 import string
-from typing import List
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, List, NamedTuple, Optional, Union
 
 from Class.exceptions import RandomizerExceptions
+from Class.newLocationClass import KH2Location
 from Class.seedSettings import ExtraConfigurationData
 from Module.RandomizerSettings import RandomizerSettings
-from Module.hints import Hints
+from Module.hints import Hints, HintData
 from Module.multiworld import MultiWorld, MultiWorldConfig
 from Module.newRandomize import Randomizer
 from Module.seedEvaluation import LocationInformedSeedValidator
+from Module.zipoutput import ZipOutput
 from Module.zipper import SeedZip, SeedZipResult
 
+MAX_ATTEMPTS = 50
+
+
+@dataclass(frozen=True)
+class SeedSpoiler:
+    """Result of a spoiler-only generation: everything needed to publish a seed without building its zip."""
+    seed_name: str
+    share_string: str
+    hash_icons: list[str]
+    spoiler_html: str
+
+
+class _SeedAttempt(NamedTuple):
+    """A successful generation attempt from a worker process, handed back so it doesn't need to be generated again."""
+    settings: RandomizerSettings
+    randomizer: Randomizer
+    location_spheres: list[KH2Location]
+    hints: Optional[HintData]
+
+
+def _candidate_seed_name(base_seed_name: str, attempt: int) -> str:
+    """
+    Seed name used for the given attempt when attempts run in parallel, derived only from the original seed name.
+
+    This differs from the sequential retries, which draw the next seed name from settings.rng after an attempt fails.
+    The state of settings.rng at that point depends on how far the failed attempt got, so those names can't be known
+    until the attempts before them have finished. Attempt 0 always uses the seed name as given, so sequential and
+    parallel generation only give different seeds when the first attempt fails. When a later attempt wins, the settings
+    are renamed to its seed name (see RandomizerSettings.rename_seed), so the share string and hash icons are those of
+    the winning name, and loading the share string makes the same seed whether or not attempts run in parallel.
+    """
+    if attempt == 0:
+        return base_seed_name
+    characters = string.ascii_letters + string.digits
+    attempt_random = random.Random(f"{base_seed_name}-{attempt}")
+    return "".join(attempt_random.choice(characters) for _ in range(30))
+
+
+def _try_seed_attempt(
+    settings: RandomizerSettings, attempt: int, with_hints: bool = True
+) -> Union[_SeedAttempt, Exception]:
+    """
+    Runs a single generation attempt in a worker process. Returns the attempt if it succeeded, or the error if it
+    failed. Hints can be left out for multiworld seeds, which only assign hints once the item pools are mixed.
+    """
+    if attempt > 0:
+        settings.rename_seed(_candidate_seed_name(settings.random_seed, attempt))
+    try:
+        randomizer = Randomizer(settings)
+        location_spheres = LocationInformedSeedValidator().validate_seed(settings, randomizer, False)
+        hints = Hints.generate_hints_v2(randomizer, settings) if with_hints else None
+        return _SeedAttempt(settings, randomizer, location_spheres, hints)
+    except RandomizerExceptions as e:
+        return e
+
+
+def _adopt_seed_attempt(settings: RandomizerSettings, seed_attempt: _SeedAttempt) -> Randomizer:
+    """
+    Moves a winning attempt from a worker process over to the caller's settings, leaving the settings (including
+    their random stream) in the same state as if the attempt had run here. Returns the attempt's randomizer.
+    """
+    attempt_settings = seed_attempt.settings
+    if attempt_settings.random_seed != settings.random_seed:
+        settings.rename_seed(attempt_settings.random_seed)
+    # Hint assignment adds to the tracker settings
+    settings.tracker_includes = attempt_settings.tracker_includes
+    settings.rng.setstate(attempt_settings.rng.getstate())
+
+    randomizer = seed_attempt.randomizer
+    randomizer.rng = settings.rng
+    randomizer._settings = settings
+    return randomizer
+
+
+def _try_spoiler_attempt(
+    settings: RandomizerSettings, attempt: int, extra_data: ExtraConfigurationData
+) -> Union[SeedSpoiler, Exception]:
+    """
+    Runs a single spoiler-only attempt in a worker process. Returns the spoiler if the attempt succeeded, so the
+    winning attempt doesn't have to be generated again, or the error if it failed.
+    """
+    if attempt > 0:
+        settings.rename_seed(_candidate_seed_name(settings.random_seed, attempt))
+    try:
+        return _make_seed_spoiler(settings, extra_data, LocationInformedSeedValidator())
+    except RandomizerExceptions as e:
+        return e
+
+
+def _select_seed_attempt_in_parallel(
+    settings: RandomizerSettings,
+    parallel_attempts: int,
+    try_attempt: Callable[[RandomizerSettings, int], Any] = _try_seed_attempt,
+) -> Any:
+    """
+    Tries up to MAX_ATTEMPTS candidate seed names (see _candidate_seed_name) across a pool of worker processes, with at
+    most parallel_attempts of them submitted at a time. The lowest attempt index that produces a valid seed wins
+    regardless of which worker finishes first, so the result is deterministic. Once the winner is known, the pool is
+    stopped, including any later attempts still running. Renames the settings to the winning seed name and returns
+    whatever the winning attempt returned, or raises the last error if every attempt failed.
+    """
+    base_seed_name = settings.random_seed
+    last_error = None
+    # Leaving the pool terminates its workers, so nothing keeps running once this returns
+    with multiprocessing.Pool(processes=parallel_attempts) as pool:
+        pending = deque()
+        next_attempt = 0
+        while next_attempt < MAX_ATTEMPTS or len(pending) > 0:
+            while next_attempt < MAX_ATTEMPTS and len(pending) < parallel_attempts:
+                pending.append((next_attempt, pool.apply_async(try_attempt, (settings, next_attempt))))
+                next_attempt += 1
+            attempt, async_result = pending.popleft()
+            result = async_result.get()
+            if not isinstance(result, Exception):
+                if attempt > 0:
+                    settings.rename_seed(_candidate_seed_name(base_seed_name, attempt))
+                return result
+            last_error = result
+    raise last_error
+
 
 def generateSeed(
-    settings: RandomizerSettings, extra_data: ExtraConfigurationData
+    settings: RandomizerSettings,
+    extra_data: ExtraConfigurationData,
+    parallel_attempts: int = 1,
+    output: Optional[ZipOutput] = None,
 ) -> SeedZipResult:
+    seed_attempt: Optional[_SeedAttempt] = None
+    if parallel_attempts > 1:
+        seed_attempt = _select_seed_attempt_in_parallel(settings, parallel_attempts)
     newSeedValidation = LocationInformedSeedValidator()
     last_error = None
-    for attempt in range(50):
+    for attempt in range(MAX_ATTEMPTS):
         try:
-            randomizer = Randomizer(settings)
-            location_spheres = newSeedValidation.validate_seed(
-                settings, randomizer
-            )
-            # hints = Hints.generate_hints(randomizer, settings)
-            hints = Hints.generate_hints_v2(randomizer, settings)
+            if seed_attempt is not None:
+                # The winning worker has already randomized the seed, so only the zip is left to build
+                randomizer = _adopt_seed_attempt(settings, seed_attempt)
+                location_spheres = seed_attempt.location_spheres
+                hints = seed_attempt.hints
+                seed_attempt = None
+            else:
+                randomizer = Randomizer(settings)
+                location_spheres = newSeedValidation.validate_seed(
+                    settings, randomizer
+                )
+                # hints = Hints.generate_hints(randomizer, settings)
+                hints = Hints.generate_hints_v2(randomizer, settings)
             zipper = SeedZip(
                 settings, randomizer, hints, extra_data, location_spheres
             )
-            return zipper.create_zip()
+            return zipper.create_zip(output)
         except RandomizerExceptions as e:
             characters = string.ascii_letters + string.digits
-            settings.random_seed = "".join(random.choice(characters) for i in range(30))
+            settings.random_seed = "".join(settings.rng.choice(characters) for i in range(30))
             settings.create_full_seed_string()
             last_error = e
             continue
     raise last_error
 
-def generateSeedCLI(
-    settings: RandomizerSettings, extra_data: ExtraConfigurationData
-) -> str:
+def _make_seed_spoiler(
+    settings: RandomizerSettings,
+    extra_data: ExtraConfigurationData,
+    seed_validation: LocationInformedSeedValidator,
+) -> SeedSpoiler:
+    """
+    Runs only the stages a spoiler-only seed needs:
+    - randomization and validation, which place the items and work out the spheres shown in the spoiler
+    - hint assignment, which can reject a seed and draws from the seed's random numbers, so it has to run for the
+      spoiler to match the seed a player makes from the share string (the hint text itself is never built)
+    - the spoiler log itself, including battle levels
+    Building the mod, boss/enemy rando, hint text and cosmetics are all skipped.
+    """
+    randomizer = Randomizer(settings)
+    location_spheres = seed_validation.validate_seed(settings, randomizer, False)
+    hints = Hints.generate_hints_v2(randomizer, settings)
+    zipper = SeedZip(settings, randomizer, hints, extra_data, location_spheres)
+    return SeedSpoiler(
+        seed_name=settings.random_seed,
+        share_string=settings.seed_string,
+        hash_icons=list(settings.seedHashIcons),
+        spoiler_html=zipper.make_spoiler_without_zip(),
+    )
+
+
+def generateSeedSpoiler(
+    settings: RandomizerSettings, extra_data: ExtraConfigurationData, parallel_attempts: int = 1
+) -> SeedSpoiler:
+    """Generates a seed for its spoiler, hash icons and share string only, without building the seed zip."""
+    if parallel_attempts > 1:
+        # The winning worker has already made the spoiler, so there's nothing left to generate here
+        return _select_seed_attempt_in_parallel(
+            settings, parallel_attempts, partial(_try_spoiler_attempt, extra_data=extra_data)
+        )
     newSeedValidation = LocationInformedSeedValidator()
     last_error = None
-    for attempt in range(50):
+    for attempt in range(MAX_ATTEMPTS):
         try:
-            randomizer = Randomizer(settings)
-            location_spheres = newSeedValidation.validate_seed(
-                settings, randomizer, False
-            )
-            # hints = Hints.generate_hints(randomizer, settings)
-            hints = Hints.generate_hints_v2(randomizer, settings)
-            zipper = SeedZip(
-                settings, randomizer, hints, extra_data, location_spheres
-            )
-            return zipper.make_spoiler_without_zip()
+            return _make_seed_spoiler(settings, extra_data, newSeedValidation)
         except RandomizerExceptions as e:
             characters = string.ascii_letters + string.digits
-            settings.random_seed = "".join(random.choice(characters) for i in range(30))
+            settings.random_seed = "".join(settings.rng.choice(characters) for i in range(30))
             settings.create_full_seed_string()
             last_error = e
             continue
     raise last_error
 
 
+def generateSeedCLI(
+    settings: RandomizerSettings, extra_data: ExtraConfigurationData, parallel_attempts: int = 1
+) -> str:
+    return generateSeedSpoiler(settings, extra_data, parallel_attempts).spoiler_html
+
+
 def generateMultiWorldSeed(
-    settingsSet: List[RandomizerSettings], extra_data: ExtraConfigurationData
+    settingsSet: List[RandomizerSettings],
+    extra_data: ExtraConfigurationData,
+    parallel_attempts: int = 1,
+    make_output: Optional[Callable[[], ZipOutput]] = None,
 ) -> list[SeedZipResult]:
     newSeedValidation = LocationInformedSeedValidator()
     randomizers = []
     unreachables = []
     last_error = None
 
+    # All players draw from a single random stream, so the item mix and each player's hints depend on every seed
+    shared_rng = random.Random()
     for player_settings in settingsSet:
-        for attempt in range(50):
+        player_settings.rng = shared_rng
+
+    for player_settings in settingsSet:
+        if parallel_attempts > 1:
+            seed_attempt = _select_seed_attempt_in_parallel(
+                player_settings, parallel_attempts, partial(_try_seed_attempt, with_hints=False)
+            )
+            randomizers.append(_adopt_seed_attempt(player_settings, seed_attempt))
+            # Players validated here share the validator's spheres, so the winning attempt's spheres go into it too
+            newSeedValidation.location_spheres.update(seed_attempt.location_spheres)
+            unreachables.append(newSeedValidation.location_spheres)
+            continue
+        for attempt in range(MAX_ATTEMPTS):
             try:
                 last_error = None
                 randomizer = Randomizer(player_settings)
@@ -86,7 +270,7 @@ def generateMultiWorldSeed(
             except RandomizerExceptions as e:
                 characters = string.ascii_letters + string.digits
                 player_settings.random_seed = "".join(
-                    random.choice(characters) for i in range(30)
+                    player_settings.rng.choice(characters) for i in range(30)
                 )
                 player_settings.create_full_seed_string()
                 last_error = e
@@ -95,7 +279,7 @@ def generateMultiWorldSeed(
             raise last_error
 
     # each individual randomization is done and valid, now we can mix the item pools
-    m = MultiWorld(randomizers, MultiWorldConfig(settingsSet[0]))
+    m = MultiWorld(randomizers, MultiWorldConfig(settingsSet[0]), shared_rng)
 
     seed_outputs: list[SeedZipResult] = []
     for settings, randomizer, unreachable in zip(
@@ -105,6 +289,6 @@ def generateMultiWorldSeed(
         zipper = SeedZip(
             settings, randomizer, hints, extra_data, unreachable, m.multi_output
         )
-        seed_outputs.append(zipper.create_zip())
+        seed_outputs.append(zipper.create_zip(make_output() if make_output is not None else None))
 
     return seed_outputs
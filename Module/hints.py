@@ -1,7 +1,6 @@
 import base64
 import copy
 import json
-import random
 import textwrap
 from itertools import permutations, chain
 from typing import Optional, Any
@@ -222,7 +221,7 @@ class Hints:
             hint_data["Reports"] = copy.deepcopy(world_items.report_information)
             if common_tracker_data.progression_settings is not None:
                 world_list = list(hint_data["world"].keys())
-                random.shuffle(world_list)
+                settings.rng.shuffle(world_list)
                 hint_data["world_order"] = world_list
         elif settings.hintsType == HintType.JSMARTEE:
             jsmartee_data = []
@@ -230,7 +229,7 @@ class Hints:
                 jsmartee_data.append(JsmarteeHintData(world_items, world))
             if common_tracker_data.progression_settings is not None:
                 hint_data["Reports"] = HintUtils.jsmartee_progression_hints(
-                    world_items, jsmartee_data
+                    world_items, jsmartee_data, settings.rng
                 )
             else:
                 hint_data["Reports"] = HintUtils.jsmartee_hint_report_assignment(
@@ -240,7 +239,7 @@ class Hints:
             hint_data["world"] = world_items.world_to_item_ids()
             if common_tracker_data.progression_settings is not None:
                 world_list = list(hint_data["world"].keys())
-                random.shuffle(world_list)
+                settings.rng.shuffle(world_list)
                 hint_data["world_order"] = world_list
             point_data = []
             for world in hintable_worlds:
@@ -266,6 +265,7 @@ class Hints:
                 path_data,
                 common_tracker_data,
                 hintable_worlds,
+                settings.rng,
             )
         elif settings.hintsType == HintType.DISABLED:
             # don't need to do anything extra
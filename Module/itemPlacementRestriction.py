@@ -1,3 +1,4 @@
+from Class.inventory import Inventory
 from Class.itemClass import KH2Item
 from List.inventory import ability, form, growth, magic, misc, proof, storyunlock, summon, synth, keyblade
 from List.inventory.form import DriveForm
@@ -5,84 +6,85 @@ from List.inventory.growth import GrowthType
 from List.inventory.item import InventoryItem
 from List.location.graph import RequirementFunction
 
+_GROWTH_IDS_BY_TYPE: dict[GrowthType, tuple[int, ...]] = {
+    growth_type: tuple(item.id for item in growth.all_growth() if item.growth_type == growth_type)
+    for growth_type in GrowthType
+}
+_VISIT_UNLOCK_IDS: tuple[int, ...] = tuple(unlock.id for unlock in storyunlock.all_story_unlocks())
+
 
 class ItemPlacementHelpers:
 
     @staticmethod
-    def need_fire_blizzard_thunder(inventory: list[int]) -> bool:
+    def need_fire_blizzard_thunder(inventory: Inventory) -> bool:
         return magic.Fire.id in inventory and magic.Blizzard.id in inventory and magic.Thunder.id in inventory
 
     @staticmethod
-    def need_1_magnet(inventory: list[int]) -> bool:
+    def need_1_magnet(inventory: Inventory) -> bool:
         return inventory.count(magic.Magnet.id) >= 1
 
     @staticmethod
-    def need_2_magnet(inventory: list[int]) -> bool:
+    def need_2_magnet(inventory: Inventory) -> bool:
         return inventory.count(magic.Magnet.id) >= 2
 
     @staticmethod
-    def need_3_thunders(inventory: list[int]) -> bool:
+    def need_3_thunders(inventory: Inventory) -> bool:
         return inventory.count(magic.Thunder.id) == 3
 
     @staticmethod
-    def count_growth(inventory: list[int], growth_type: GrowthType) -> int:
-        ids = [item.id for item in growth.all_growth() if item.growth_type == growth_type]
-        count = 0
-        for item in inventory:
-            if item in ids:
-                count += 1
-        return count
+    def count_growth(inventory: Inventory, growth_type: GrowthType) -> int:
+        return sum(inventory.count(item_id) for item_id in _GROWTH_IDS_BY_TYPE[growth_type])
 
     @staticmethod
-    def need_growths(inventory: list[int]) -> bool:
+    def need_growths(inventory: Inventory) -> bool:
         return ItemPlacementHelpers.count_growth(inventory, GrowthType.HIGH_JUMP) >= 3 \
             and ItemPlacementHelpers.count_growth(inventory, GrowthType.QUICK_RUN) >= 3 \
             and ItemPlacementHelpers.count_growth(inventory, GrowthType.AERIAL_DODGE) >= 3 \
             and ItemPlacementHelpers.count_growth(inventory, GrowthType.GLIDE) >= 3
 
     @staticmethod
-    def need_proof_connection(inventory: list[int]) -> bool:
+    def need_proof_connection(inventory: Inventory) -> bool:
         return proof.ProofOfConnection.id in inventory
 
     @staticmethod
-    def need_proof_peace(inventory: list[int]) -> bool:
+    def need_proof_peace(inventory: Inventory) -> bool:
         return proof.ProofOfPeace.id in inventory
 
     @staticmethod
-    def has_valor_form(inventory: list[int]) -> bool:
+    def has_valor_form(inventory: Inventory) -> bool:
         return form.ValorForm.id in inventory
 
     @staticmethod
-    def has_wisdom_form(inventory: list[int]) -> bool:
+    def has_wisdom_form(inventory: Inventory) -> bool:
         return form.WisdomForm.id in inventory
 
     @staticmethod
-    def has_limit_form(inventory: list[int]) -> bool:
+    def has_limit_form(inventory: Inventory) -> bool:
         return form.LimitForm.id in inventory
 
     @staticmethod
-    def has_master_form(inventory: list[int]) -> bool:
+    def has_master_form(inventory: Inventory) -> bool:
         return form.MasterForm.id in inventory
 
     @staticmethod
-    def has_final_form(inventory: list[int]) -> bool:
+    def has_final_form(inventory: Inventory) -> bool:
         return form.FinalForm.id in inventory
     
     @staticmethod
-    def can_level_valor(inventory: list[int]) -> bool:
+    def can_level_valor(inventory: Inventory) -> bool:
         return True
     @staticmethod
-    def can_level_wisdom(inventory: list[int]) -> bool:
+    def can_level_wisdom(inventory: Inventory) -> bool:
         return True
     @staticmethod
-    def can_level_limit(inventory: list[int]) -> bool:
+    def can_level_limit(inventory: Inventory) -> bool:
         return True
     @staticmethod
-    def can_level_master(inventory: list[int]) -> bool:
+    def can_level_master(inventory: Inventory) -> bool:
         return ItemPlacementHelpers.ht1_check(inventory) \
               or ItemPlacementHelpers.hb2_check(inventory)
     @staticmethod
-    def can_level_final(inventory: list[int]) -> bool:
+    def can_level_final(inventory: Inventory) -> bool:
         return ItemPlacementHelpers.twtnw_roxas_check(inventory) \
               or ItemPlacementHelpers.pr2_check(inventory) \
               or ItemPlacementHelpers.bc2_check(inventory) \
@@ -90,27 +92,27 @@ class ItemPlacementHelpers:
               or ItemPlacementHelpers.tt3_check(inventory)
 
     @staticmethod
-    def has_auto_valor(inventory: list[int]) -> bool:
+    def has_auto_valor(inventory: Inventory) -> bool:
         return ability.AutoValor.id in inventory
 
     @staticmethod
-    def has_auto_wisdom(inventory: list[int]) -> bool:
+    def has_auto_wisdom(inventory: Inventory) -> bool:
         return ability.AutoWisdom.id in inventory
 
     @staticmethod
-    def has_auto_limit(inventory: list[int]) -> bool:
+    def has_auto_limit(inventory: Inventory) -> bool:
         return ability.AutoLimitForm.id in inventory
 
     @staticmethod
-    def has_auto_master(inventory: list[int]) -> bool:
+    def has_auto_master(inventory: Inventory) -> bool:
         return ability.AutoMaster.id in inventory
 
     @staticmethod
-    def has_auto_final(inventory: list[int]) -> bool:
+    def has_auto_final(inventory: Inventory) -> bool:
         return ability.AutoFinal.id in inventory
 
     @staticmethod
-    def count_forms(inventory: list[int]) -> int:
+    def count_forms(inventory: Inventory) -> int:
         count = 0
         if ItemPlacementHelpers.has_valor_form(inventory):
             count += 1
@@ -125,18 +127,18 @@ class ItemPlacementHelpers:
         return count
 
     @staticmethod
-    def need_forms(inventory: list[int]) -> bool:
+    def need_forms(inventory: Inventory) -> bool:
         return ItemPlacementHelpers.count_forms(inventory) == 5
 
     @staticmethod
-    def need_summons(inventory: list[int]) -> bool:
+    def need_summons(inventory: Inventory) -> bool:
         return summon.LampCharm.id in inventory \
             and summon.FeatherCharm.id in inventory \
             and summon.UkuleleCharm.id in inventory \
             and summon.BaseballCharm.id in inventory
 
     @staticmethod
-    def count_pages(inventory: list[int]) -> int:
+    def count_pages(inventory: Inventory) -> int:
         return inventory.count(misc.TornPages.id)
 
     @staticmethod
@@ -144,13 +146,13 @@ class ItemPlacementHelpers:
         return lambda inventory: ItemPlacementHelpers.count_pages(inventory) >= count
 
     @staticmethod
-    def need_proofs(inventory: list[int]) -> bool:
+    def need_proofs(inventory: Inventory) -> bool:
         return proof.ProofOfConnection.id in inventory \
             and proof.ProofOfNonexistence.id in inventory \
             and proof.ProofOfPeace.id in inventory
     
     @staticmethod
-    def need_promise_charm(inventory: list[int]) -> bool:
+    def need_promise_charm(inventory: Inventory) -> bool:
         return misc.PromiseCharm.id in inventory
     
     @staticmethod
@@ -183,7 +185,7 @@ class ItemPlacementHelpers:
 
     @staticmethod
     def make_form_lambda_nightmare(drive_form: DriveForm, form_level: int) -> RequirementFunction:
-        def count_auto_forms(inventory: list[int]) -> int:
+        def count_auto_forms(inventory: Inventory) -> int:
             count = 0
             if ItemPlacementHelpers.has_auto_valor(inventory):
                 count += 1
@@ -195,7 +197,7 @@ class ItemPlacementHelpers:
                 count += 1
             return count
 
-        def final_possible_but_not_obtained(inventory: list[int]) -> bool:
+        def final_possible_but_not_obtained(inventory: Inventory) -> bool:
             return (ItemPlacementHelpers.has_valor_form(inventory)
                     or ItemPlacementHelpers.has_wisdom_form(inventory)
                     or ItemPlacementHelpers.has_limit_form(inventory)
@@ -203,7 +205,7 @@ class ItemPlacementHelpers:
                     or count_auto_forms(inventory) >= 1) \
                 and not ItemPlacementHelpers.has_final_form(inventory)
 
-        def max_form_level(inventory: list[int]) -> int:
+        def max_form_level(inventory: Inventory) -> int:
             base_count = ItemPlacementHelpers.count_forms(inventory) + 2
             if final_possible_but_not_obtained(inventory):
                 return base_count + 1
@@ -231,7 +233,7 @@ class ItemPlacementHelpers:
                                      and ItemPlacementHelpers.can_level_master(inventory) \
                                      and max_form_level(inventory) >= form_level
         if drive_form == form.FinalForm:
-            def have_final_form(inventory: list[int]) -> bool:
+            def have_final_form(inventory: Inventory) -> bool:
                 return ItemPlacementHelpers.has_final_form(inventory) or final_possible_but_not_obtained(inventory)
 
             if form_level == 2:
@@ -247,7 +249,7 @@ class ItemPlacementHelpers:
 
     @staticmethod
     def make_form_lambda_nightmare_no_anti(drive_form: DriveForm, form_level: int) -> RequirementFunction:
-        def max_form_level(inventory: list[int]) -> int:
+        def max_form_level(inventory: Inventory) -> int:
             base_count = ItemPlacementHelpers.count_forms(inventory) + 2
             return base_count
 
@@ -281,10 +283,10 @@ class ItemPlacementHelpers:
 
     @staticmethod
     def make_form_lambda_nightmare_no_final(drive_form: DriveForm, form_level: int) -> RequirementFunction:
-        def final_possible_but_not_obtained(_: list[int]) -> bool:
+        def final_possible_but_not_obtained(_: Inventory) -> bool:
             return False
 
-        def max_form_level(inventory: list[int]) -> int:
+        def max_form_level(inventory: Inventory) -> int:
             base_count = ItemPlacementHelpers.count_forms(inventory) + 2
             if final_possible_but_not_obtained(inventory):
                 return base_count + 1
@@ -312,7 +314,7 @@ class ItemPlacementHelpers:
                                      and ItemPlacementHelpers.can_level_master(inventory) \
                                      and max_form_level(inventory) >= form_level
         if drive_form == form.FinalForm:
-            def have_final_form(inventory: list[int]) -> bool:
+            def have_final_form(inventory: Inventory) -> bool:
                 return final_possible_but_not_obtained(inventory) or ItemPlacementHelpers.has_final_form(inventory)
 
             if form_level == 2:
@@ -325,12 +327,8 @@ class ItemPlacementHelpers:
         return lambda inventory: False
 
     @staticmethod
-    def get_number_visit_unlocks(inventory: list[int]) -> int:
-        visit_unlock_ids = [u.id for u in storyunlock.all_story_unlocks()]
-        running_total = 0
-        for id in visit_unlock_ids:
-            running_total+=inventory.count(id)
-        return running_total
+    def get_number_visit_unlocks(inventory: Inventory) -> int:
+        return sum(inventory.count(unlock_id) for unlock_id in _VISIT_UNLOCK_IDS)
 
     @staticmethod
     def make_level_group_check(group_index) -> RequirementFunction:
@@ -342,107 +340,107 @@ class ItemPlacementHelpers:
 
 
     @staticmethod
-    def stt_check(inventory: list[int]) -> bool:
+    def stt_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.NaminesSketches.id)==1
     
     @staticmethod
-    def dc1_check(inventory: list[int]) -> bool:
+    def dc1_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.RoyalSummons.id)>=1
 
     @staticmethod
-    def dc2_check(inventory: list[int]) -> bool:
+    def dc2_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.RoyalSummons.id)==2
 
     @staticmethod
-    def oc1_check(inventory: list[int]) -> bool:
+    def oc1_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.BattlefieldsOfWar.id)>=1
 
     @staticmethod
-    def oc2_check(inventory: list[int]) -> bool:
+    def oc2_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.BattlefieldsOfWar.id)==2
 
     @staticmethod
-    def lod1_check(inventory: list[int]) -> bool:
+    def lod1_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.SwordOfTheAncestor.id)>=1
     
     @staticmethod
-    def lod2_check(inventory: list[int]) -> bool:
+    def lod2_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.SwordOfTheAncestor.id)==2
 
     @staticmethod
-    def bc1_check(inventory: list[int]) -> bool:
+    def bc1_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.BeastsClaw.id)>=1
     
     @staticmethod
-    def bc2_check(inventory: list[int]) -> bool:
+    def bc2_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.BeastsClaw.id)==2
 
     @staticmethod
-    def ht1_check(inventory: list[int]) -> bool:
+    def ht1_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.BoneFist.id)>=1
     
     @staticmethod
-    def ht2_check(inventory: list[int]) -> bool:
+    def ht2_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.BoneFist.id)==2
 
     @staticmethod
-    def pl1_check(inventory: list[int]) -> bool:
+    def pl1_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.ProudFang.id)>=1
     
     @staticmethod
-    def pl2_check(inventory: list[int]) -> bool:
+    def pl2_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.ProudFang.id)==2
     
     @staticmethod
-    def pr1_check(inventory: list[int]) -> bool:
+    def pr1_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.SkillAndCrossbones.id)>=1
 
     @staticmethod
-    def pr2_check(inventory: list[int]) -> bool:
+    def pr2_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.SkillAndCrossbones.id)==2
 
     @staticmethod
-    def ag1_check(inventory: list[int]) -> bool:
+    def ag1_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.Scimitar.id)>=1
 
     @staticmethod
-    def ag2_check(inventory: list[int]) -> bool:
+    def ag2_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.Scimitar.id)==2
 
     @staticmethod
-    def twtnw_roxas_check(inventory: list[int]) -> bool:
+    def twtnw_roxas_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.WayToTheDawn.id) >= 1
     
     @staticmethod
-    def twtnw_post_saix_check(inventory: list[int]) -> bool:
+    def twtnw_post_saix_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.WayToTheDawn.id) == 2
 
     @staticmethod
-    def sp1_check(inventory: list[int]) -> bool:
+    def sp1_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.IdentityDisk.id)>=1
     
     @staticmethod
-    def sp2_check(inventory: list[int]) -> bool:
+    def sp2_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.IdentityDisk.id) == 2
 
     @staticmethod
-    def tt1_check(inventory: list[int]) -> bool:
+    def tt1_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.IceCream.id) >= 1
 
     @staticmethod
-    def tt2_check(inventory: list[int]) -> bool:
+    def tt2_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.IceCream.id) >= 2
 
     @staticmethod
-    def tt3_check(inventory: list[int]) -> bool:
+    def tt3_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.IceCream.id) == 3
 
     @staticmethod
-    def hb1_check(inventory: list[int]) -> bool:
+    def hb1_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.MembershipCard.id) >= 1
 
     @staticmethod
-    def hb2_check(inventory: list[int]) -> bool:
+    def hb2_check(inventory: Inventory) -> bool:
         return inventory.count(storyunlock.MembershipCard.id) == 2
 
     @staticmethod
@@ -595,47 +593,47 @@ class ItemPlacementHelpers:
         return lambda inventory: False
 
     @staticmethod
-    def need_stt_keyblade(inventory: list[int]) -> bool:
+    def need_stt_keyblade(inventory: Inventory) -> bool:
         return keyblade.BondOfFlame.id in inventory
     @staticmethod
-    def need_tt_keyblade(inventory: list[int]) -> bool:
+    def need_tt_keyblade(inventory: Inventory) -> bool:
         return keyblade.Oathkeeper.id in inventory
     @staticmethod
-    def need_hb_keyblade(inventory: list[int]) -> bool:
+    def need_hb_keyblade(inventory: Inventory) -> bool:
         return keyblade.SleepingLion.id in inventory
     @staticmethod
-    def need_cor_keyblade(inventory: list[int]) -> bool:
+    def need_cor_keyblade(inventory: Inventory) -> bool:
         return keyblade.WinnersProof.id in inventory
     @staticmethod
-    def need_lod_keyblade(inventory: list[int]) -> bool:
+    def need_lod_keyblade(inventory: Inventory) -> bool:
         return keyblade.HiddenDragon.id in inventory
     @staticmethod
-    def need_bc_keyblade(inventory: list[int]) -> bool:
+    def need_bc_keyblade(inventory: Inventory) -> bool:
         return keyblade.RumblingRose.id in inventory
     @staticmethod
-    def need_oc_keyblade(inventory: list[int]) -> bool:
+    def need_oc_keyblade(inventory: Inventory) -> bool:
         return keyblade.HerosCrest.id in inventory
     @staticmethod
-    def need_dc_keyblade(inventory: list[int]) -> bool:
+    def need_dc_keyblade(inventory: Inventory) -> bool:
         return keyblade.Monochrome.id in inventory
     @staticmethod
-    def need_pr_keyblade(inventory: list[int]) -> bool:
+    def need_pr_keyblade(inventory: Inventory) -> bool:
         return keyblade.FollowTheWind.id in inventory
     @staticmethod
-    def need_ag_keyblade(inventory: list[int]) -> bool:
+    def need_ag_keyblade(inventory: Inventory) -> bool:
         return keyblade.WishingLamp.id in inventory
     @staticmethod
-    def need_ht_keyblade(inventory: list[int]) -> bool:
+    def need_ht_keyblade(inventory: Inventory) -> bool:
         return keyblade.DecisivePumpkin.id in inventory
     @staticmethod
-    def need_pl_keyblade(inventory: list[int]) -> bool:
+    def need_pl_keyblade(inventory: Inventory) -> bool:
         return keyblade.CircleOfLife.id in inventory
     @staticmethod
-    def need_sp_keyblade(inventory: list[int]) -> bool:
+    def need_sp_keyblade(inventory: Inventory) -> bool:
         return keyblade.PhotonDebugger.id in inventory
     @staticmethod
-    def need_twtnw_keyblade(inventory: list[int]) -> bool:
+    def need_twtnw_keyblade(inventory: Inventory) -> bool:
         return keyblade.TwoBecomeOne.id in inventory
     @staticmethod
-    def need_haw_keyblade(inventory: list[int]) -> bool:
+    def need_haw_keyblade(inventory: Inventory) -> bool:
         return keyblade.SweetMemories.id in inventory
@@ -13,7 +13,7 @@ class SeedModifier:
     @staticmethod
     def ability_list_modifier(
         option: AbilityPoolOption,
-    ) -> Callable[[list[KH2Item], list[KH2Item]], list[KH2Item]]:
+    ) -> Callable[[list[KH2Item], list[KH2Item], random.Random], list[KH2Item]]:
         if option == AbilityPoolOption.DEFAULT:
             return SeedModifier.default_ability_pool
         elif option == AbilityPoolOption.RANDOMIZE:
@@ -27,13 +27,13 @@ class SeedModifier:
 
     @staticmethod
     def default_ability_pool(
-        action: list[KH2Item], support: list[KH2Item]
+        action: list[KH2Item], support: list[KH2Item], rng: random.Random
     ) -> list[KH2Item]:
         return action + support
 
     @staticmethod
     def random_ability_pool(
-        action: list[KH2Item], support: list[KH2Item]
+        action: list[KH2Item], support: list[KH2Item], rng: random.Random
     ) -> list[KH2Item]:
         randomizable_list = action + support
         randomizable_dict: dict[str, KH2Item] = {i.Name: i for i in randomizable_list}
@@ -47,7 +47,7 @@ class SeedModifier:
         possible_abilities.sort()
         random_ability_pool = []
         for _ in range(len(randomizable_list) - 2):
-            choice: str = random.choice(possible_abilities)
+            choice: str = rng.choice(possible_abilities)
             random_ability_pool.append(randomizable_dict[choice])
             # Limit only 1 of each action ability in the pool, to make it more interesting
             if choice in [i.Name for i in action]:
@@ -60,7 +60,7 @@ class SeedModifier:
 
     @staticmethod
     def random_support_ability_pool(
-        action: list[KH2Item], support: list[KH2Item]
+        action: list[KH2Item], support: list[KH2Item], rng: random.Random
     ) -> list[KH2Item]:
         randomizable_list = support
         randomizable_dict: dict[str, KH2Item] = {i.Name: i for i in randomizable_list}
@@ -74,7 +74,7 @@ class SeedModifier:
         possible_abilities.sort()
         random_ability_pool = []
         for _ in range(len(randomizable_list) - 2):
-            choice: str = random.choice(possible_abilities)
+            choice: str = rng.choice(possible_abilities)
             random_ability_pool.append(randomizable_dict[choice])
 
         # Make sure there is one OM and one SC so the tracker behaves
@@ -84,7 +84,7 @@ class SeedModifier:
 
     @staticmethod
     def random_stackable_ability_pool(
-        action: list[KH2Item], support: list[KH2Item]
+        action: list[KH2Item], support: list[KH2Item], rng: random.Random
     ) -> list[KH2Item]:
         stackable_abilities = [
             ability.ComboPlus.name,
@@ -124,7 +124,7 @@ class SeedModifier:
         for unique_ability in unique_abilities:
             random_ability_pool.append(ability_dict[unique_ability])
         for _ in range(len(ability_list) - len(unique_abilities)):
-            choice = random.choice(stackable_abilities)
+            choice = rng.choice(stackable_abilities)
             random_ability_pool.append(ability_dict[choice])
 
         return random_ability_pool
@@ -173,7 +173,7 @@ class SeedModifier:
         return valid_stat_list
 
     @staticmethod
-    def starting_growth(option: StartingMovementOption) -> list[GrowthAbility]:
+    def starting_growth(option: StartingMovementOption, rng: random.Random) -> list[GrowthAbility]:
         if option == StartingMovementOption.DISABLED:
             return []
         elif option == StartingMovementOption.LEVEL_1:
@@ -185,17 +185,17 @@ class SeedModifier:
         elif option == StartingMovementOption.LEVEL_4:
             return growth.all_growth_to_level(4)
         elif option == StartingMovementOption.RANDOM_3:
-            return SeedModifier._random_growth(3)
+            return SeedModifier._random_growth(3, rng)
         elif option == StartingMovementOption.RANDOM_5:
-            return SeedModifier._random_growth(5)
+            return SeedModifier._random_growth(5, rng)
         else:
             raise GeneratorException(f"Unknown option {option}")
 
     @staticmethod
-    def _random_growth(num_growth_abilities: int) -> list[GrowthAbility]:
+    def _random_growth(num_growth_abilities: int, rng: random.Random) -> list[GrowthAbility]:
         options = [growth_ability.growth_type for growth_ability in growth.all_growth()]
         levels_by_growth_type: dict[GrowthType, int] = {}
-        for chosen_growth_type in random.sample(options, k=num_growth_abilities):
+        for chosen_growth_type in rng.sample(options, k=num_growth_abilities):
             if chosen_growth_type in levels_by_growth_type:
                 levels_by_growth_type[chosen_growth_type] = (
                     levels_by_growth_type[chosen_growth_type] + 1
@@ -213,6 +213,7 @@ class SeedModifier:
             mode: StartingVisitMode,
             random_range: tuple[int, int],
             specific_unlocks: dict[locationType, int],
+            rng: random.Random,
     ) -> list[StoryUnlock]:
         if mode is StartingVisitMode.ALL:
             return storyunlock.all_individual_story_unlocks()
@@ -222,8 +223,8 @@ class SeedModifier:
             return []
         elif mode is StartingVisitMode.RANDOM:
             random_min, random_max = random_range
-            random_count = random.randint(random_min, random_max)
-            return random.sample(storyunlock.all_individual_story_unlocks(), k=random_count)
+            random_count = rng.randint(random_min, random_max)
+            return rng.sample(storyunlock.all_individual_story_unlocks(), k=random_count)
         elif mode is StartingVisitMode.SPECIFIC:
             result: list[StoryUnlock] = []
             for location, count in specific_unlocks.items():
@@ -237,8 +238,8 @@ class SeedModifier:
                 result.extend([unlock] * specific_count)
                 random_pool.extend([unlock] * (unlock.visit_count - specific_count))
             random_min, random_max = random_range
-            random_count = random.randint(random_min, random_max)
-            result.extend(random.sample(random_pool, k=random_count))
+            random_count = rng.randint(random_min, random_max)
+            result.extend(rng.sample(random_pool, k=random_count))
             return result
         else:
             raise GeneratorException(f"Unknown mode {mode}")
@@ -47,7 +47,8 @@ class MultiWorldOutput():
         return output
 
 class MultiWorld():
-    def __init__(self, seeds: List[Randomizer], config: MultiWorldConfig):
+    def __init__(self, seeds: List[Randomizer], config: MultiWorldConfig, rng: random.Random):
+        self.rng = rng
         self.all_candidate_swaps: List[List[ItemAssignment]] = []
 
         for seed in seeds:
@@ -89,12 +90,12 @@ class MultiWorld():
         
 
         swap_chain = []
-        swap_chain.append(random.choice(full_swaps))
+        swap_chain.append(self.rng.choice(full_swaps))
         full_swaps.remove(swap_chain[-1])
 
         for _ in range(max_item_swap-1):
             filtered_list = [it for it in full_swaps if it[0]!=swap_chain[-1][0]]
-            swap_chain.append(random.choice(filtered_list))
+            swap_chain.append(self.rng.choice(filtered_list))
             full_swaps.remove(swap_chain[-1])
 
         self.multi_output = MultiWorldOutput()
@@ -1,16 +1,17 @@
 from collections import Counter
+from collections.abc import MutableSequence
 import copy
 import itertools
-import random
 from dataclasses import dataclass
 from dataclasses import field
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional
 
 from Class.exceptions import (
     GeneratorException,
     CantAssignItemException,
     SettingsException,
 )
+from Class.inventory import Inventory
 from Class.itemClass import KH2Item
 from Class.newLocationClass import KH2Location
 from Class.randomUtils import weighted_sample_without_replacement
@@ -49,7 +50,7 @@ from List.location import (
 from Module.RandomizerSettings import RandomizerSettings
 from Module.depths import ItemDepths
 from Module.modifier import SeedModifier
-from Module.weighting import LocationWeights
+from Module.weighting import LocationSampler, LocationWeights
 
 
 @dataclass
@@ -76,6 +77,114 @@ class ItemAssignment:
             return NotImplemented
 
 
+class ItemAssignments(MutableSequence[ItemAssignment]):
+    """
+    List of item assignments that is also indexed by location, location name, and item ID, so looking up an assignment
+    doesn't need to scan the whole list. Every change made through this class keeps the indexes up to date (appending
+    updates them directly, anything else rebuilds them). Changing the primary item of an assignment that's already in
+    the list needs to go through set_item.
+    """
+
+    def __init__(self, assignments: Iterable[ItemAssignment] = ()):
+        self._assignments: list[ItemAssignment] = list(assignments)
+        self._reindex()
+
+    def _reindex(self):
+        self._by_location: dict[KH2Location, ItemAssignment] = {}
+        self._by_location_name: dict[str, ItemAssignment] = {}
+        self._by_item_id: dict[int, list[ItemAssignment]] = {}
+        for assignment in self._assignments:
+            self._index(assignment)
+
+    def _index(self, assignment: ItemAssignment):
+        # The first assignment wins for each key, matching what a scan of the list would find
+        self._by_location.setdefault(assignment.location, assignment)
+        self._by_location_name.setdefault(assignment.location.name(), assignment)
+        if assignment.item is not None:
+            self._by_item_id.setdefault(assignment.item.Id, []).append(assignment)
+
+    def __len__(self) -> int:
+        return len(self._assignments)
+
+    def __iter__(self) -> Iterator[ItemAssignment]:
+        return iter(self._assignments)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ItemAssignments(self._assignments[index])
+        return self._assignments[index]
+
+    def __setitem__(self, index, value):
+        self._assignments[index] = value
+        self._reindex()
+
+    def __delitem__(self, index):
+        del self._assignments[index]
+        self._reindex()
+
+    def insert(self, index: int, assignment: ItemAssignment):
+        self._assignments.insert(index, assignment)
+        self._reindex()
+
+    def append(self, assignment: ItemAssignment):
+        self._assignments.append(assignment)
+        self._index(assignment)
+
+    def extend(self, assignments: Iterable[ItemAssignment]):
+        for assignment in assignments:
+            self.append(assignment)
+
+    def clear(self):
+        self._assignments.clear()
+        self._reindex()
+
+    def sort(self, *, key=None, reverse: bool = False):
+        self._assignments.sort(key=key, reverse=reverse)
+        self._reindex()
+
+    def reverse(self):
+        self._assignments.reverse()
+        self._reindex()
+
+    def copy(self) -> "ItemAssignments":
+        return ItemAssignments(self._assignments)
+
+    def __copy__(self) -> "ItemAssignments":
+        return self.copy()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ItemAssignments):
+            return self._assignments == other._assignments
+        elif isinstance(other, list):
+            return self._assignments == other
+        else:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ItemAssignments({self._assignments!r})"
+
+    def for_location(self, location: KH2Location) -> Optional[ItemAssignment]:
+        return self._by_location.get(location)
+
+    def for_location_name(self, location_name: str) -> Optional[ItemAssignment]:
+        return self._by_location_name.get(location_name)
+
+    def for_item_id(self, item_id: int) -> Optional[ItemAssignment]:
+        matching = self._by_item_id.get(item_id)
+        return matching[0] if matching else None
+
+    def for_item(self, item: InventoryItem) -> Optional[ItemAssignment]:
+        return next((a for a in self._by_item_id.get(item.id, []) if a.item.item == item), None)
+
+    def set_item(self, assignment: ItemAssignment, item: KH2Item):
+        """Replaces the primary item of an assignment in this list."""
+        old_item = assignment.item
+        assignment.item = item
+        for item_id in {old_item.Id if old_item is not None else None, item.Id}:
+            if item_id is not None:
+                self._by_item_id[item_id] = [a for a in self._assignments if a.item is not None and a.item.Id == item_id]
+
+
 @dataclass
 class WeaponStats:
     location: KH2Location
@@ -156,47 +265,94 @@ def _find_locations(
     return [loc for loc in locations if loc.name() in location_names]
 
 
+@dataclass(frozen=True)
+class PlacementCounts:
+    num_available_items: int
+    num_valid_locations: int
+
+
 class Randomizer:
     def __init__(self, settings: RandomizerSettings, progress_bar_vis: bool = False):
         if settings is None:
             raise SettingsException(
                 "Invalid settings passed to randomize. Change settings and try again"
             )
-        random.seed(settings.full_rando_seed)
+        self.rng = settings.rng
+        self.rng.seed(settings.full_rando_seed)
         self.progress_bar_vis = progress_bar_vis
-        self.regular_locations = Locations(settings, secondary_graph=False)
-        self.reverse_locations = Locations(settings, secondary_graph=True)
+        self._settings = settings
+        self._reverse_locations: Optional[Locations] = None
+        self.regular_locations = Locations.cached(settings, secondary_graph=False)
         self.master_locations = (
             self.regular_locations if settings.regular_rando else self.reverse_locations
         )
-        self.location_weights = LocationWeights(
-            settings, self.regular_locations, self.reverse_locations
-        )
-        self.report_depths = ItemDepths(settings.reportDepth, self.master_locations)
-        self.proof_depths = ItemDepths(settings.proofDepth, self.master_locations)
-        self.story_depths = ItemDepths(settings.storyDepth, self.master_locations)
-        self.promise_charm_depths = ItemDepths(settings.promiseCharmDepth, self.master_locations)
         self.yeet_the_bear = settings.yeetTheBear
         self.num_valid_locations = None
         self.num_available_items = None
         self.starting_item_ids: list[int] = []
-        self.assignments: list[ItemAssignment] = []
-        self.donald_assignments: list[ItemAssignment] = []
-        self.goofy_assignments: list[ItemAssignment] = []
+        self.assignments = ItemAssignments()
+        self.donald_assignments = ItemAssignments()
+        self.goofy_assignments = ItemAssignments()
         self.weapon_stats: list[WeaponStats] = []
         self.level_stats: list[LevelStats] = []
         self.form_level_exp: list[FormExp] = []
         self.synthesis_recipes: list[SynthesisRecipe] = []
         self.shop_items: list[KH2Item] = []
         self.objectives: list[KH2Objective] = []
-        self.assign_sora_items(settings)
         if progress_bar_vis:
+            # Only the item and location counts are wanted, which don't need weights, depths, or any placement
+            self.count_placements(settings)
             return
+        self.location_weights = LocationWeights(
+            settings,
+            self.regular_locations,
+            self.reverse_locations if settings.reverse_rando else None
+        )
+        self.report_depths = ItemDepths.cached(settings.reportDepth, self.master_locations)
+        self.proof_depths = ItemDepths.cached(settings.proofDepth, self.master_locations)
+        self.story_depths = ItemDepths.cached(settings.storyDepth, self.master_locations)
+        self.promise_charm_depths = ItemDepths.cached(settings.promiseCharmDepth, self.master_locations)
+        self.assign_sora_items(settings)
         self.assign_party_items()
         self.assign_weapon_stats(settings)
         self.assign_level_stats(settings)
         self.assign_form_level_exp(settings)
 
+    @staticmethod
+    def placement_counts(settings: RandomizerSettings) -> PlacementCounts:
+        """
+        Returns how many items need placing and how many locations are available to hold them, without randomizing
+        anything. Meant for showing the counts as settings are changed.
+        """
+        randomizer = Randomizer(settings, progress_bar_vis=True)
+        return PlacementCounts(
+            num_available_items=randomizer.num_available_items,
+            num_valid_locations=randomizer.num_valid_locations,
+        )
+
+    @property
+    def reverse_locations(self) -> Locations:
+        """The reverse rando location graph, only built the first time it's needed."""
+        if self._reverse_locations is None:
+            self._reverse_locations = Locations.cached(self._settings, secondary_graph=True)
+        return self._reverse_locations
+
+    def __getstate__(self):
+        # The location graphs hold lambdas that can't be pickled (for handing a randomizer back from a worker process),
+        # so they're left out and looked up again from the shared graph cache when unpickling
+        state = dict(self.__dict__)
+        for name in ["_reverse_locations", "regular_locations", "master_locations"]:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reverse_locations = None
+        self.regular_locations = Locations.cached(self._settings, secondary_graph=False)
+        self.master_locations = (
+            self.regular_locations if self._settings.regular_rando else self.reverse_locations
+        )
+
     def assign_form_level_exp(self, settings: RandomizerSettings):
         """Assigns experience values to each form level."""
         experience_values = {
@@ -254,7 +410,7 @@ class Randomizer:
         for index, location in enumerate(locations):
             if index != 0:
                 stat_choices = weighted_sample_without_replacement(
-                    population=level_stat_pool, weights=stat_weights, k=2
+                    population=level_stat_pool, weights=stat_weights, k=2, rng=self.rng
                 )
                 adder_function(stat_choices[0])
                 if location.LocationId in excluded_levels:
@@ -281,8 +437,8 @@ class Randomizer:
             self.weapon_stats.append(
                 WeaponStats(
                     key,
-                    strength=random.randint(key_min, key_max),
-                    magic=random.randint(key_min, key_max),
+                    strength=self.rng.randint(key_min, key_max),
+                    magic=self.rng.randint(key_min, key_max),
                 )
             )
         for struggle_weapon in weaponslot.struggle_weapon_slots():
@@ -292,19 +448,19 @@ class Randomizer:
         for staff in weaponslot.donald_staff_slots():
             self.weapon_stats.append(
                 WeaponStats(
-                    staff, strength=random.randint(1, 13), magic=random.randint(1, 13)
+                    staff, strength=self.rng.randint(1, 13), magic=self.rng.randint(1, 13)
                 )
             )
         for shield in weaponslot.goofy_shield_slots():
             self.weapon_stats.append(
-                WeaponStats(shield, strength=random.randint(1, 13), magic=0)
+                WeaponStats(shield, strength=self.rng.randint(1, 13), magic=0)
             )
 
     def assign_party_items(self):
         """Assigns items to locations for party members."""
         donald_locations = Locations.all_donald_locations()
         for donald_ability in Items.donald_ability_list():
-            random_location = random.choice(donald_locations)
+            random_location = self.rng.choice(donald_locations)
             if self.assign_item(
                 random_location, donald_ability, self.donald_assignments
             ):
@@ -312,7 +468,7 @@ class Randomizer:
 
         goofy_locations = Locations.all_goofy_locations()
         for goofy_ability in Items.goofy_ability_list():
-            random_location = random.choice(goofy_locations)
+            random_location = self.rng.choice(goofy_locations)
             if self.assign_item(random_location, goofy_ability, self.goofy_assignments):
                 goofy_locations.remove(random_location)
 
@@ -321,13 +477,13 @@ class Randomizer:
         self.starting_item_ids.extend(settings.starting_inventory_ids)
 
         starting_growth_abilities = SeedModifier.starting_growth(
-            settings.starting_growth_option
+            settings.starting_growth_option, self.rng
         )
         self.starting_item_ids.extend(
             growth_ability.id for growth_ability in starting_growth_abilities
         )
 
-        starting_reports = random.sample(
+        starting_reports = self.rng.sample(
             report.all_reports(), k=settings.starting_report_count
         )
         self.starting_item_ids.extend(rpt.id for rpt in starting_reports)
@@ -335,7 +491,8 @@ class Randomizer:
         starting_unlocks = SeedModifier.starting_unlocks(
             mode=settings.starting_visit_mode,
             random_range=settings.starting_visit_random_range,
-            specific_unlocks=settings.starting_unlocks_per_world
+            specific_unlocks=settings.starting_unlocks_per_world,
+            rng=self.rng,
         )
         self.starting_item_ids.extend(unlock.id for unlock in starting_unlocks)
 
@@ -397,7 +554,7 @@ class Randomizer:
         if settings.shop_reports > 0:
             report_pool = [i for i in item_pool if i.ItemType == itemType.REPORT]
             num_reports_in_shop = min(settings.shop_reports, len(report_pool))
-            chosen_reports: list[KH2Item] = random.sample(
+            chosen_reports: list[KH2Item] = self.rng.sample(
                 report_pool, k=num_reports_in_shop
             )
             self.shop_items.extend(chosen_reports)
@@ -410,7 +567,7 @@ class Randomizer:
             num_visit_unlocks_in_shop = min(
                 settings.shop_unlocks, len(visit_unlock_pool)
             )
-            chosen_unlocks: list[KH2Item] = random.sample(
+            chosen_unlocks: list[KH2Item] = self.rng.sample(
                 visit_unlock_pool, k=num_visit_unlocks_in_shop
             )
             self.shop_items.extend(chosen_unlocks)
@@ -432,6 +589,7 @@ class Randomizer:
         ability_pool: list[KH2Item] = modifier(
             Items.getActionAbilityList(),
             Items.getSupportAbilityList() + Items.getKeybladeAbilityList() + Items.getLevelAbilityList(),
+            self.rng,
         )
 
         # Remove any starting abilities from the pool
@@ -447,16 +605,9 @@ class Randomizer:
 
         return ability_pool
 
-    def partition_locations(
-        self, settings: RandomizerSettings
-    ) -> tuple[list[KH2Location], list[KH2Location]]:
-        """Splits all locations into lists of valid and invalid locations, based on settings."""
-        all_locations = self.master_locations.all_locations()
-        self.augment_invalid_checks(all_locations, settings)
-
-        # If not "statsanity", even disabled locations should get stat bonuses
-        if not settings.statSanity:
-            self.assign_stat_bonuses(all_locations)
+    @staticmethod
+    def excluded_location_checker(settings: RandomizerSettings) -> Callable[[KH2Location], bool]:
+        """Returns a function that tells whether a location is excluded from randomization by the settings."""
 
         def invalid_checker(location: KH2Location) -> bool:
             types = location.LocationTypes
@@ -505,11 +656,10 @@ class Randomizer:
                 return False
             return location.LocationCategory is locationCategory.FINALLEVEL
 
-        valid_locations: list[KH2Location] = []
-        invalid_locations: list[KH2Location] = []
         excluded_levels = settings.excluded_levels()
-        for loc in all_locations:
-            if (
+
+        def is_excluded(loc: KH2Location) -> bool:
+            return (
                 no_final_form(loc)
                 or invalid_checker(loc)
                 or remove_popupchecker(loc)
@@ -517,7 +667,31 @@ class Randomizer:
                     loc.LocationCategory is locationCategory.LEVEL
                     and loc.LocationId in excluded_levels
                 )
-            ):
+            )
+
+        return is_excluded
+
+    def partition_locations(
+        self, settings: RandomizerSettings
+    ) -> tuple[list[KH2Location], list[KH2Location]]:
+        """Splits all locations into lists of valid and invalid locations, based on settings."""
+        # The location graph may be shared with other randomizers, so the restrictions added below go on copies
+        all_locations = []
+        for location in self.master_locations.all_locations():
+            location_copy = copy.copy(location)
+            location_copy.InvalidChecks = list(location.InvalidChecks)
+            all_locations.append(location_copy)
+        self.augment_invalid_checks(all_locations, settings)
+
+        # If not "statsanity", even disabled locations should get stat bonuses
+        if not settings.statSanity:
+            self.assign_stat_bonuses(all_locations)
+
+        is_excluded = self.excluded_location_checker(settings)
+        valid_locations: list[KH2Location] = []
+        invalid_locations: list[KH2Location] = []
+        for loc in all_locations:
+            if is_excluded(loc):
                 invalid_locations.append(loc)
             else:
                 valid_locations.append(loc)
@@ -545,6 +719,66 @@ class Randomizer:
                 randomizable_abilities.append(item)
         return vanilla_abilities, randomizable_abilities
 
+    @staticmethod
+    def _num_valid_locations(
+        settings: RandomizerSettings, valid_category_counts: Counter[locationCategory]
+    ) -> int:
+        """Returns the number of item slots given the number of valid locations of each category."""
+        num_locations = sum(valid_category_counts.values())
+        if settings.statSanity:
+            # Double and hybrid bonuses hold two items, and double bonuses give two stats on top of that
+            num_locations += (
+                valid_category_counts[locationCategory.DOUBLEBONUS]
+                + valid_category_counts[locationCategory.HYBRIDBONUS]
+            )
+            num_locations += valid_category_counts[locationCategory.DOUBLEBONUS]
+        return num_locations
+
+    @staticmethod
+    def _num_available_items(
+        settings: RandomizerSettings,
+        item_pool: list[KH2Item],
+        ability_pool: list[KH2Item],
+        num_vanilla_items: int,
+    ) -> int:
+        """Returns the number of items that need to be randomized into valid locations."""
+        return (
+            len(ability_pool)
+            + len(item_pool)
+            + (settings.max_objectives_available if settings.objective_rando else 0)
+            + (settings.max_emblems_available if settings.emblems else 0)
+            - num_vanilla_items
+        )
+
+    def count_placements(self, settings: RandomizerSettings):
+        """
+        Fills in the number of valid locations and available items the same way assign_sora_items does, without
+        partitioning (or copying) every location. Locations are counted a whole group at a time instead.
+        """
+        self.apply_starting_items(settings)
+        item_pool = self.initial_item_pool(settings)
+        ability_pool = self.initial_ability_pool(settings)
+
+        is_excluded = self.excluded_location_checker(settings)
+        valid_category_counts: Counter[locationCategory] = Counter()
+        num_vanilla_items = 0
+        for location, count, group_vanilla_items in self.master_locations.location_groups():
+            category = location.LocationCategory
+            if not settings.statSanity and category in [locationCategory.DOUBLEBONUS, locationCategory.STATBONUS]:
+                # These are filled by assign_stat_bonuses before the locations are partitioned
+                continue
+            if not is_excluded(location):
+                valid_category_counts[category] += count
+            elif group_vanilla_items > 0 and any(
+                item in location.LocationTypes for item in settings.vanillaLocations
+            ):
+                num_vanilla_items += group_vanilla_items
+
+        self.num_valid_locations = self._num_valid_locations(settings, valid_category_counts)
+        self.num_available_items = self._num_available_items(
+            settings, item_pool, ability_pool, num_vanilla_items
+        )
+
     def assign_sora_items(self, settings: RandomizerSettings):
         """Assigns items to locations for Sora."""
         self.apply_starting_items(settings)
@@ -582,54 +816,27 @@ class Randomizer:
                 "Can't use vanilla worlds with chain logic for now. Sorry"
             )
 
-        self.num_valid_locations = (
-            len(valid_locations)
-            + (
-                len(
-                    [
-                        loc
-                        for loc in valid_locations
-                        if loc.LocationCategory
-                        in [locationCategory.DOUBLEBONUS, locationCategory.HYBRIDBONUS]
-                    ]
-                )
-                if settings.statSanity
-                else 0
-            )
-            + (
-                len(
-                    [
-                        loc
-                        for loc in valid_locations
-                        if loc.LocationCategory in [locationCategory.DOUBLEBONUS]
-                    ]
-                )
-                if settings.statSanity
-                else 0
-            )
+        self.num_valid_locations = self._num_valid_locations(
+            settings, Counter(loc.LocationCategory for loc in valid_locations)
         )
-        self.num_available_items = (
-            len(ability_pool)
-            + len(item_pool) 
-            + (settings.max_objectives_available if settings.objective_rando else 0) 
-            + (settings.max_emblems_available if settings.emblems else 0)
-            - (sum([len(l.VanillaItems) for l in locations_with_vanilla_items]))
+        self.num_available_items = self._num_available_items(
+            settings,
+            item_pool,
+            ability_pool,
+            num_vanilla_items=sum([len(l.VanillaItems) for l in locations_with_vanilla_items]),
         )
 
-        if self.progress_bar_vis:
-            return
-
         # actual item assignment code starts here
         
         # give synth recipes their ingredients (if they are in valid locations)
         for location in valid_locations:
             if locationType.SYNTH in location.LocationTypes:
                 # assign a recipe to this item
-                items: list[KH2Item] = random.sample(
-                    Items.getSynthRequirementsList(), k=random.randint(1, 3)
+                items: list[KH2Item] = self.rng.sample(
+                    Items.getSynthRequirementsList(), k=self.rng.randint(1, 3)
                 )
                 requirements = [
-                    SynthRequirement(synth_item=item, amount=random.randint(1, 3))
+                    SynthRequirement(synth_item=item, amount=self.rng.randint(1, 3))
                     for item in items
                 ]
                 recipe = SynthesisRecipe(
@@ -653,7 +860,7 @@ class Randomizer:
         item_pool.extend(valid_junk)
         if settings.emblems:
             item_pool.extend([Items.emblemItem() for _ in range(settings.max_emblems_available)])
-        random.shuffle(item_pool)
+        self.rng.shuffle(item_pool)
 
         # vanilla location item assignment
         for loc_with_vanilla in locations_with_vanilla_items:
@@ -691,7 +898,7 @@ class Randomizer:
             if settings.objective_pool_type==ObjectivePoolOption.HITLIST.name:
                 # remove all but one of the form objectives
                 form_objectives = [o for o in objective_pool if "Level 7" in o.Name]
-                objective_pool = [o for o in objective_pool if "Level 7" not in o.Name] + [random.choice(form_objectives)]
+                objective_pool = [o for o in objective_pool if "Level 7" not in o.Name] + [self.rng.choice(form_objectives)]
 
             if len(objective_pool) < settings.max_objectives_available:
                 raise SettingsException(f"Not enough objective locations ({len(objective_pool)}) available to allow the max number of objectives ({settings.max_objectives_available}) to be placed.")
@@ -701,9 +908,9 @@ class Randomizer:
             form_3_objectives = [o for o in objective_pool if "Level 3" in o.Name]
             form_5_objectives = [o for o in objective_pool if "Level 5" in o.Name]
             form_7_objectives = [o for o in objective_pool if "Level 7" in o.Name]
-            random.shuffle(form_3_objectives)
-            random.shuffle(form_5_objectives)
-            random.shuffle(form_7_objectives)
+            self.rng.shuffle(form_3_objectives)
+            self.rng.shuffle(form_5_objectives)
+            self.rng.shuffle(form_7_objectives)
             all_form_objectives = form_3_objectives + form_5_objectives + form_7_objectives
             if len(all_form_objectives) > 3:
                 all_form_objectives[::3] = form_3_objectives
@@ -719,7 +926,7 @@ class Randomizer:
                 
 
             # pick a number of objectives
-            self.objectives = random.sample(objective_pool,k=settings.max_objectives_available)
+            self.objectives = self.rng.sample(objective_pool,k=settings.max_objectives_available)
             picked_objectives_location_names = [o.Location for o in self.objectives]
             # plando completion marks onto the selected objectives
             objective_locations = [v for v in valid_locations if v.Description in picked_objectives_location_names]
@@ -755,7 +962,7 @@ class Randomizer:
         from Module.seedEvaluation import LocationInformedSeedValidator
         validator = LocationInformedSeedValidator()
         validator.prep_requirements_list(settings, self)
-        item_locking_ids_per_world = validator.generate_locking_item_ids()
+        item_locking_ids_per_world = validator.generate_locking_item_ids(self.rng)
 
         item_depth = 0
         min_item_depth = settings.chainLogicMinLength
@@ -765,7 +972,7 @@ class Randomizer:
         last_unlocked_sphere = accessible_locations
 
         world_names_to_unlock = [w for w in item_locking_ids_per_world.keys() for _ in item_locking_ids_per_world[w]]
-        random.shuffle(world_names_to_unlock)
+        self.rng.shuffle(world_names_to_unlock)
         world_names_to_unlock = [w for w in world_names_to_unlock if w in settings.enabledLocations]
 
         proof_nonexistence_assignment = self.assignment_for_item_id(proof.ProofOfNonexistence.id)
@@ -780,7 +987,7 @@ class Randomizer:
             world_progression = item_locking_ids_per_world[proof_world]
             items_needed = []
             for w in world_progression:
-                if validator.is_location_available(self.starting_item_ids + items_needed, proof_nonexistence_assignment.location):
+                if validator.is_location_available(Inventory(self.starting_item_ids + items_needed), proof_nonexistence_assignment.location):
                     # uh, bad chain
                     raise GeneratorException("Chain logic couldn't make a seed that ended on proof of nonexistence. Try changing proof depths.")
                 proof_of_nonexistence_last_unlock = missing_items(items_needed,w)
@@ -799,7 +1006,7 @@ class Randomizer:
                                                  ]
         history_of_items = []
         # print("Starting chain....")
-        while (item_depth < min_item_depth or (item_depth < max_item_depth and random.random() < 0.75)): # 25% chance of breaking early
+        while (item_depth < min_item_depth or (item_depth < max_item_depth and self.rng.random() < 0.75)): # 25% chance of breaking early
             # print("--iter")
             # pick a world to unlock checks from
             if world_names_to_unlock is None:
@@ -822,7 +1029,8 @@ class Randomizer:
                 pop_world_from_list()
                 continue
             chosen_checks = missing_items(acquired_items,chosen_checks)
-            sphere_1 = [loc for loc in valid_locations if locationType.Level not in loc.LocationTypes and validator.is_location_available(self.starting_item_ids + acquired_items + chosen_checks + simulated_growth,loc) and loc not in accessible_locations]
+            inventory = Inventory(self.starting_item_ids + acquired_items + chosen_checks + simulated_growth)
+            sphere_1 = [loc for loc in valid_locations if locationType.Level not in loc.LocationTypes and validator.is_location_available(inventory,loc) and loc not in accessible_locations]
             # print("*******************")
             # print(acquired_items)
             # print(chosen_checks)
@@ -894,11 +1102,12 @@ class Randomizer:
             if len(sphere_0) < num_available_locations_needed_to_allow_random_assignment:
                 # pick a locking item we don't have, assign it somewhere valid, repeat
                 unlocks = [] + [s.id for s in storyunlock.all_story_unlocks()] + [k.id for k in keyblade.get_locking_keyblades()]
-                random.shuffle(unlocks)
+                self.rng.shuffle(unlocks)
                 for u in unlocks:
                     i_data = next((it for it in item_pool if it.Id == u), None)
                     if i_data is not None:
-                        sphere_1 = [loc for loc in valid_locations if validator.is_location_available(self.starting_item_ids + acquired_items + [i_data.Id],loc)]
+                        inventory = Inventory(self.starting_item_ids + acquired_items + [i_data.Id])
+                        sphere_1 = [loc for loc in valid_locations if validator.is_location_available(inventory,loc)]
                         if len(sphere_1) > len(sphere_0):
                             # assign this item somewhere
                             locations_to_remove = self.randomly_assign_single_item(i_data,sphere_0)
@@ -912,22 +1121,26 @@ class Randomizer:
     def get_accessible_locations(self, valid_locations, validator, aux_items = None):
         if aux_items is None:
             aux_items = []
-        acquired_item_locations = []
+        acquired_item_locations = set()
         acquired_items = []
         sphere_0 = []
         found_new_item = True
         # check if any of the already assigned locations are valid right now, and if so, add their item to current inventory
+        inventory = Inventory(self.starting_item_ids + aux_items)
         while found_new_item:
             found_new_item = False
             # get unassigned locations that are available
-            sphere_0 = [loc for loc in valid_locations if validator.is_location_available(self.starting_item_ids + acquired_items + aux_items,loc)]
+            sphere_0 = [loc for loc in valid_locations if validator.is_location_available(inventory,loc)]
             # get already assigned items from available locations
+            new_item_ids = []
             for assignment in self.assignments:
-                if assignment.location.LocationCategory is not locationCategory.WEAPONSLOT and assignment.location not in acquired_item_locations and validator.is_location_available(self.starting_item_ids + acquired_items + aux_items, assignment.location):
+                if assignment.location.LocationCategory is not locationCategory.WEAPONSLOT and assignment.location not in acquired_item_locations and validator.is_location_available(inventory, assignment.location):
                     if assignment.location.Description != stt.CheckLocation.StruggleWinnerChampionBelt:
-                        acquired_item_locations.append(assignment.location)
-                        acquired_items.extend([i.Id for i in assignment.items()])
+                        acquired_item_locations.add(assignment.location)
+                        new_item_ids.extend([i.Id for i in assignment.items()])
                         found_new_item = True
+            acquired_items.extend(new_item_ids)
+            inventory.extend(new_item_ids)
         return acquired_items,sphere_0
 
     def assign_plando_like_items(self, settings, item_pool, valid_locations):
@@ -942,7 +1155,7 @@ class Randomizer:
                 haw.yeet_the_bear_location_names(), valid_locations
             )
             if len(yeet_locations) > 0:
-                yeet_location = random.choice(yeet_locations)
+                yeet_location = self.rng.choice(yeet_locations)
                 proof_item = next(
                         key for key in item_pool if key.Id == proof.ProofOfNonexistence.id
                     )
@@ -970,7 +1183,7 @@ class Randomizer:
             good_choices = False
             while not good_choices:
                 good_choices = True
-                chosen_locations = random.sample(valid_for_proofs,k=len(remaining_proofs))
+                chosen_locations = self.rng.sample(valid_for_proofs,k=len(remaining_proofs))
                 for index,c in enumerate(chosen_locations):
                     # check that each proof is valid for the location (i.e. no connection on Terra)
                     if remaining_proofs[index].ItemType in c.InvalidChecks:
@@ -984,7 +1197,7 @@ class Randomizer:
             promise_charm_item_list = [i for i in item_pool if i.ItemType is misc.PromiseCharm.type]
             # pick N valid locations for these items
             valid_for_promise_charm = [loc for loc in valid_locations if self.promise_charm_depths.is_valid(loc)]
-            chosen_locations = random.sample(valid_for_promise_charm,k=len(promise_charm_item_list))
+            chosen_locations = self.rng.sample(valid_for_promise_charm,k=len(promise_charm_item_list))
             for index,c in enumerate(chosen_locations):
                 item_pool.remove(promise_charm_item_list[index])
                 if self.assign_item(c, promise_charm_item_list[index]):
@@ -994,7 +1207,7 @@ class Randomizer:
             # pick N valid locations for these items
             valid_for_unlocks = [loc for loc in valid_locations if self.story_depths.is_valid(loc)]
             number_of_choices = min(len(remaining_unlocks),len(valid_for_unlocks))
-            chosen_locations = random.sample(valid_for_unlocks,k=number_of_choices)
+            chosen_locations = self.rng.sample(valid_for_unlocks,k=number_of_choices)
             for index,c in enumerate(chosen_locations):
                 item_pool.remove(remaining_unlocks[index])
                 if self.assign_item(c, remaining_unlocks[index]):
@@ -1004,7 +1217,7 @@ class Randomizer:
             # pick N valid locations for these items
             valid_for_reports = [loc for loc in valid_locations if self.story_depths.is_valid(loc)]
             number_of_choices = min(len(remaining_reports),len(valid_for_reports))
-            chosen_locations = random.sample(valid_for_reports,k=number_of_choices)
+            chosen_locations = self.rng.sample(valid_for_reports,k=number_of_choices)
             for index,c in enumerate(chosen_locations):
                 item_pool.remove(remaining_reports[index])
                 if self.assign_item(c, remaining_reports[index]):
@@ -1029,7 +1242,7 @@ class Randomizer:
                     f"Somehow, can't assign an item because there are no valid locations for {item.Name}."
                 )
 
-            random_location: KH2Location = random.choices(location_pool, weights)[
+            random_location: KH2Location = self.rng.choices(location_pool, weights)[
                 0
             ]
             if item.ItemType not in random_location.InvalidChecks:
@@ -1052,42 +1265,40 @@ class Randomizer:
 
 
     def randomly_assign_items(self, item_pool, valid_locations):
+        sampler = LocationSampler(self.location_weights, valid_locations)
+        struggle_locations = [stt.CheckLocation.StruggleWinnerChampionBelt, stt.CheckLocation.StruggleLoserMedal]
         for item in item_pool:
-            if len(valid_locations) == 0:
+            if len(sampler) == 0:
                 raise CantAssignItemException(f"Ran out of locations to assign items")
 
-            weights = self.compute_location_weights(item, valid_locations)
+            weights = sampler.cumulative_weights(item.ItemType)
 
             count = 0
             while True:
                 count += 1
-                if len(weights) == 0:
-                    raise CantAssignItemException(
-                        f"Ran out of locations to assign items to."
-                    )
-                if sum(weights) == 0:
+                if weights[-1] == 0:
                     raise CantAssignItemException(
                         f"Somehow, can't assign an item because there are no valid locations for {item.Name}."
                     )
 
-                random_location: KH2Location = random.choices(valid_locations, weights)[
-                    0
-                ]
+                random_location: KH2Location = sampler.pick(weights, self.rng)
                 if item.ItemType not in random_location.InvalidChecks:
                     if self.assign_item(random_location, item):
-                        valid_locations.remove(random_location)
+                        sampler.remove(random_location)
 
-                        struggle_pair = self._maybe_assign_struggle_pair(
-                            random_location, item, valid_locations
-                        )
-                        if struggle_pair is not None:
-                            valid_locations.remove(struggle_pair)
+                        if random_location.name() in struggle_locations:
+                            struggle_pair = self._maybe_assign_struggle_pair(
+                                random_location, item, sampler.remaining_locations()
+                            )
+                            sampler.remove(struggle_pair)
                     break
                 if count == 100:
+                    remaining_locations = sampler.remaining_locations()
                     raise CantAssignItemException(
-                        f"Trying to assign {item} and failed 100 times in {len([i for i in valid_locations if i.LocationCategory==locationCategory.POPUP])} popups left out of {len(valid_locations)}"
+                        f"Trying to assign {item} and failed 100 times in {len([i for i in remaining_locations if i.LocationCategory==locationCategory.POPUP])} popups left out of {len(remaining_locations)}"
                     )
 
+        valid_locations[:] = sampler.remaining_locations()
 
     def compute_location_weights(
         self, item: KH2Item, location_pool: list[KH2Location]
@@ -1114,7 +1325,7 @@ class Randomizer:
         )
         struggle_loser = _find_location(stt.CheckLocation.StruggleLoserMedal, locations)
         if struggle_winner is not None and struggle_loser is not None:
-            junk_item = random.choice(junk_items)
+            junk_item = self.rng.choice(junk_items)
             self.assign_item(struggle_winner, junk_item)
             self.assign_item(struggle_loser, junk_item)
             locations.remove(struggle_winner)
@@ -1134,10 +1345,10 @@ class Randomizer:
                 loc.LocationCategory is locationCategory.LEVEL
                 and loc.LocationId not in excluded_levels
             ):
-                junk_item = random.choice(junk_items)
+                junk_item = self.rng.choice(junk_items)
                 # assign another junk item if that location needs another item
                 if not self.assign_item(loc, junk_item):
-                    junk_item = random.choice(junk_items)
+                    junk_item = self.rng.choice(junk_items)
                     self.assign_item(loc, junk_item)
             else:
                 self.assign_item(loc, Items.getNullItem())
@@ -1150,7 +1361,7 @@ class Randomizer:
             for item in Items.getJunkList(betterJunk=False)
             if item.Id in settings.junk_pool
         ]
-        return random.choices(all_junk_items, k=num_junk_items)
+        return settings.rng.choices(all_junk_items, k=num_junk_items)
 
     def augment_invalid_checks(
         self, locations: list[KH2Location], settings: RandomizerSettings
@@ -1280,7 +1491,7 @@ class Randomizer:
             else:
                 ability_weights = [1 for _ in eligible_abilities]
 
-            random_ability = random.choices(eligible_abilities, ability_weights)[0]
+            random_ability = self.rng.choices(eligible_abilities, ability_weights)[0]
             self.assign_item(key, random_ability)
             ability_pool.remove(random_ability)
             eligible_abilities.remove(random_ability)
@@ -1310,11 +1521,11 @@ class Randomizer:
             )
 
         # Select two different stats to put on Xemnas 1
-        stat1 = random.choice(stat_items)
+        stat1 = self.rng.choice(stat_items)
         stat_items.remove(stat1)
         stat2 = stat1
         while stat1 == stat2:
-            stat2 = random.choice(stat_items)
+            stat2 = self.rng.choice(stat_items)
         stat_items.remove(stat2)
         self.assign_item(double_stat[0], stat1)
         self.assign_item(double_stat[0], stat2)
@@ -1327,7 +1538,7 @@ class Randomizer:
 
         # Assign the rest
         for item in stat_items:
-            loc = random.choice(single_stat)
+            loc = self.rng.choice(single_stat)
             single_stat.remove(loc)
             if self.assign_item(loc, item):
                 avail_locations.remove(loc)
@@ -1341,7 +1552,7 @@ class Randomizer:
         self,
         location: KH2Location,
         item: KH2Item,
-        party_member_assigned_items: Optional[list[ItemAssignment]] = None,
+        party_member_assigned_items: Optional[ItemAssignments] = None,
         override_invalid = False,
     ) -> bool:
         """
@@ -1362,9 +1573,7 @@ class Randomizer:
                 f"Trying to assign {item} to {location} even though it's invalid."
             )
 
-        assignment = next(
-            filter(lambda a: a.location == location, assigned_items), None
-        )
+        assignment = assigned_items.for_location(location)
         if assignment is None:
             assigned_items.append(ItemAssignment(location, item))
             all_slots_filled = not double_item
@@ -1411,12 +1620,10 @@ class Randomizer:
         return opposite
 
     def assignment_for_location(self, location_name: str) -> Optional[ItemAssignment]:
-        return next(
-            (a for a in self.assignments if a.location.name() == location_name), None
-        )
+        return self.assignments.for_location_name(location_name)
 
     def assignment_for_item(self, item: InventoryItem) -> Optional[ItemAssignment]:
-        return next((a for a in self.assignments if a.item.item == item), None)
+        return self.assignments.for_item(item)
     
     def assignment_for_item_id(self, item_id: int) -> Optional[ItemAssignment]:
-        return next((a for a in self.assignments if a.item.item.id == item_id), None)
+        return self.assignments.for_item_id(item_id)
@@ -1,14 +1,15 @@
 
 
 import random
+import time
 from altgraph.Graph import Graph
-import copy
 import itertools
 
 from Class.exceptions import ValidationException
+from Class.inventory import Inventory
 from Class.itemClass import KH2Item
 from Class.newLocationClass import KH2Location
-from List.NewLocationList import get_all_parent_edge_requirements, Locations
+from List.NewLocationList import Locations
 from List.configDict import ItemAccessibilityOption, locationType
 from List.inventory import storyunlock, keyblade, proof, form, magic, misc
 from List.location import simulatedtwilighttown as stt
@@ -16,7 +17,7 @@ from List.location import worldthatneverwas as twtnw
 from List.location.graph import RequirementFunction
 from Module.RandomizerSettings import RandomizerSettings
 from Module.itemPlacementRestriction import ItemPlacementHelpers
-from Module.newRandomize import Randomizer, SynthesisRecipe
+from Module.newRandomize import Randomizer, SynthesisRecipe, ItemAssignment
 
 
 class ValidationResult:
@@ -26,12 +27,23 @@ class ValidationResult:
         self.full_clear = False
 
 
+class SphereStats:
+
+    def __init__(self, sphere: int, requirement_lists_checked: int, locations_collected: int, seconds: float):
+        self.sphere = sphere
+        # number of distinct requirement lists evaluated during this sphere
+        self.requirement_lists_checked = requirement_lists_checked
+        self.locations_collected = locations_collected
+        self.seconds = seconds
+
+
 class LocationInformedSeedValidator:
 
     def __init__(self):
         self.location_requirements: dict[KH2Location, list[RequirementFunction]] = {}
         self.human_readable_lock_list: dict[locationType,Graph] = {}
         self.location_spheres: dict[KH2Location, int] = {}
+        self.sphere_stats: list[SphereStats] = []
 
     def populate_possible_locking_item_list(self, regular_rando: bool):
         # STT
@@ -228,14 +240,14 @@ class LocationInformedSeedValidator:
             ag_graph.add_edge("AGChests","AG2")
             self.human_readable_lock_list[locationType.Agrabah] = ag_graph
 
-    def generate_locking_item_ids(self):
+    def generate_locking_item_ids(self, rng: random.Random):
         def random_walk(graph: Graph):
             current_node_list = []
             current_item_data = []
             current_node = next((n for n in graph.node_list() if graph.inc_degree(n)==0),None)
             if current_node is None:
                 # if there is no obvious start node, pick one at random
-                current_node = random.choice(graph.node_list())
+                current_node = rng.choice(graph.node_list())
 
             while True:
                 # populate the data for the current node
@@ -245,7 +257,7 @@ class LocationInformedSeedValidator:
                 candidate_nodes = [n for n in graph.out_nbrs(current_node) if n not in current_node_list]
                 if len(candidate_nodes)==0:
                     break
-                current_node = random.choice(candidate_nodes)
+                current_node = rng.choice(candidate_nodes)
                 # repeat
             if len(graph.node_list()) != len(current_item_data):
                 return None
@@ -268,26 +280,30 @@ class LocationInformedSeedValidator:
         return item_id_lock_list
 
     @staticmethod
-    def evaluate(inventory: list[int], reqs_list: list[RequirementFunction]) -> bool:
-        return all([r(inventory) for r in reqs_list])
+    def evaluate(inventory: Inventory, reqs_list: list[RequirementFunction]) -> bool:
+        return all(r(inventory) for r in reqs_list)
 
-    def is_location_available(self, inventory: list[int], location: KH2Location) -> bool:
+    def is_location_available(self, inventory: Inventory, location: KH2Location) -> bool:
         return self.evaluate(inventory, self.location_requirements[location])
 
     def prepare_requirements_list(self, location_lists: list[Locations], synthesis_recipes: list[SynthesisRecipe]):
         self.location_requirements.clear()
         for locations in location_lists:
+            compiled_requirements = locations.compiled_requirements()
             for node_id in locations.node_ids():
-                parent_requirement_function = get_all_parent_edge_requirements(node_id, locations.location_graph)
+                parent_requirement_function = compiled_requirements.node_requirement(node_id)
                 for location in locations.locations_for_node(node_id):
                     if location not in self.location_requirements:
                         self.location_requirements[location] = []
                     self.location_requirements[location].append(parent_requirement_function)
 
+        recipes_by_location = {}
+        for recipe in synthesis_recipes:
+            recipes_by_location.setdefault(recipe.location, recipe)
         for loc, requirements in self.location_requirements.items():
             if locationType.SYNTH in loc.LocationTypes:
                 # this is a synth location, we need to get its recipe to know what locks it logically
-                recipe = next((r for r in synthesis_recipes if r.location == loc), None)
+                recipe = recipes_by_location.get(loc)
                 # if we don't have recipes yet, we can't validate that yet
                 if recipe:
                     for recipe_requirement in recipe.requirements:
@@ -312,25 +328,36 @@ class LocationInformedSeedValidator:
     ) -> list[KH2Location]:
         self.prep_requirements_list(settings, randomizer)
 
-        location_requirements = copy.deepcopy(self.location_requirements)
+        location_requirements = dict(self.location_requirements)
 
         results = ValidationResult()
-        inventory = [item_id for item_id in randomizer.starting_item_ids]
-        if len(randomizer.shop_items) > 0:
-            for shop_item in randomizer.shop_items:
-                inventory.append(shop_item.Id)
+        inventory = Inventory(randomizer.starting_item_ids)
+        for shop_item in randomizer.shop_items:
+            inventory.append(shop_item.Id)
+
+        # index the assigned items by location so each newly reachable location finds its items in one lookup
+        assignments_by_location: dict[KH2Location, ItemAssignment] = {}
+        for assignment in randomizer.assignments:
+            # if assignment is one of the struggle win/lose items, only count one, and not count the second.
+            if assignment.location.name() == stt.CheckLocation.StruggleWinnerChampionBelt:
+                continue
+            assignments_by_location.setdefault(assignment.location, assignment)
+
+        # locations in the same graph node share the same requirement functions, so they only need evaluating once
+        #   per sphere
+        requirement_keys = {location: tuple(requirements) for location, requirements in location_requirements.items()}
+        final_xemnas_locations = [
+            location for location in location_requirements if location.name() == twtnw.CheckLocation.FinalXemnas
+        ]
+        self.sphere_stats = []
 
         changed = True
         depth = 0
         while changed:
             depth += 1
-            final_xem_in_list = False
+            sphere_start = time.perf_counter()
             if not results.any_percent:
-                for location, requirements in location_requirements.items():
-                    if location.name() == twtnw.CheckLocation.FinalXemnas:
-                        final_xem_in_list = True
-                        break
-                if not final_xem_in_list:
+                if not any(location in location_requirements for location in final_xemnas_locations):
                     results.any_percent = True
 
             if len(location_requirements) == 0:
@@ -342,24 +369,31 @@ class LocationInformedSeedValidator:
             changed = False
             locations_to_remove = []
             items_to_add_to_inventory = []
+            requirement_results: dict[tuple[RequirementFunction, ...], bool] = {}
             for location, requirements in location_requirements.items():
-                if self.evaluate(inventory, requirements):
-                    # find assigned item to location
-                    for assignment in randomizer.assignments:
-                        # if assignment is one of the struggle win/lose items, only count one, and not count the second.
-                        if assignment.location.name() == stt.CheckLocation.StruggleWinnerChampionBelt:
-                            continue
-                        if location == assignment.location:
-                            items_to_add_to_inventory.append(assignment.item.Id)
-                            if assignment.item2 is not None:
-                                items_to_add_to_inventory.append(assignment.item2.Id)
-                            break
+                key = requirement_keys[location]
+                available = requirement_results.get(key)
+                if available is None:
+                    available = self.evaluate(inventory, requirements)
+                    requirement_results[key] = available
+                if available:
+                    assignment = assignments_by_location.get(location)
+                    if assignment is not None:
+                        items_to_add_to_inventory.append(assignment.item.Id)
+                        if assignment.item2 is not None:
+                            items_to_add_to_inventory.append(assignment.item2.Id)
                     locations_to_remove.append(location)
                     self.location_spheres[location] = depth-1
                     changed = True
-            for shop_item in locations_to_remove:
-                location_requirements.pop(shop_item)
+            for location in locations_to_remove:
+                location_requirements.pop(location)
             inventory.extend(items_to_add_to_inventory)
+            self.sphere_stats.append(SphereStats(
+                sphere=depth - 1,
+                requirement_lists_checked=len(requirement_results),
+                locations_collected=len(locations_to_remove),
+                seconds=time.perf_counter() - sphere_start,
+            ))
 
         if (settings.item_accessibility == ItemAccessibilityOption.ALL and results.full_clear) \
                 or (settings.item_accessibility == ItemAccessibilityOption.BEATABLE and results.any_percent):
@@ -1,12 +1,13 @@
-import io
 import textwrap
-import zipfile
+import threading
+from copy import deepcopy
 from dataclasses import dataclass
 from typing import Optional, Any
-from zipfile import ZipFile, ZIP_DEFLATED
+from zipfile import ZipFile
 
 import yaml
 
+from Class.exceptions import GeneratorException
 from Class.openkhmod import (
     AttackEntriesOrganizer,
     ModYml,
@@ -20,8 +21,9 @@ from Class.openkhmod import (
     Treasures,
     write_yaml_to_zip_file,
     Asset,
+    load_static_list,
+    dump_yaml,
 )
-from Module.RandomizerSettings import RandomizerSettings
 from Module.resources import resource_path
 
 
@@ -37,6 +39,54 @@ class ChestVisualAssignment:
     chest_visual_id: int
 
 
+class _SpawnTemplate:
+    """
+    A chest spawn file dumped to YAML once, split around the ObjectId value of each entity in its first spawn group so
+    that a seed's chest visuals can be filled in without parsing and dumping the file again.
+    """
+
+    # Large enough that it can't appear anywhere else in a spawn file
+    _MARKER_BASE = 7_000_000_000
+
+    def __init__(self, spawn_data: list[dict[str, Any]]):
+        entities = spawn_data[0]["Entities"]
+        self.object_ids: list[int] = [entity["ObjectId"] for entity in entities]
+
+        marked_spawn_data = deepcopy(spawn_data)
+        for index, entity in enumerate(marked_spawn_data[0]["Entities"]):
+            entity["ObjectId"] = self._MARKER_BASE + index
+        remaining = dump_yaml(marked_spawn_data, sort_keys=False)
+
+        self.segments: list[str] = []
+        for index in range(len(entities)):
+            segment, remaining = remaining.split(str(self._MARKER_BASE + index), 1)
+            self.segments.append(segment)
+        self.segments.append(remaining)
+
+    def render(self, object_ids: dict[int, int]) -> str:
+        """Returns the spawn file YAML with the given ObjectIds (keyed by entity index) in place of the vanilla ones."""
+        parts = []
+        for index, vanilla_object_id in enumerate(self.object_ids):
+            parts.append(self.segments[index])
+            parts.append(str(object_ids.get(index, vanilla_object_id)))
+        parts.append(self.segments[-1])
+        return "".join(parts)
+
+
+_spawn_templates: dict[str, _SpawnTemplate] = {}
+_spawn_templates_lock = threading.Lock()
+
+
+def _spawn_template(spawn_file_path: str) -> _SpawnTemplate:
+    """Returns the template for a chest spawn file, building it the first time the file is needed."""
+    with _spawn_templates_lock:
+        template = _spawn_templates.get(spawn_file_path)
+        if template is None:
+            template = _SpawnTemplate(load_static_list(f"chests/ard/{spawn_file_path}.spawn"))
+            _spawn_templates[spawn_file_path] = template
+    return template
+
+
 class SeedModBuilder:
     def __init__(self, title: str, out_zip: ZipFile):
         self.out_zip = out_zip
@@ -53,6 +103,9 @@ class SeedModBuilder:
         self.prize_table = PrizeTable(_relative_mod_file("przt.yml"))
         self.treasures = Treasures(_relative_mod_file("TrsrList.yml"))
         self.atkp_organizer = AttackEntriesOrganizer(_relative_mod_file("AtkpList.yml"))
+        # Contents of the command list patches in the mod (parsed, or as YAML text) keyed by source name, kept so they
+        # can be merged without reading them back out of the zip
+        self.cmd_listpatches: dict[str, Any] = {}
 
     def add_base_assets(self):
         """Adds asset entries to the mod for files that get included with every seed."""
@@ -514,7 +567,7 @@ class SeedModBuilder:
     def write_synth_assets(
         self,
         modified_recipes_binary: bytearray,
-        modified_requirements_binary: bytearray,
+        modified_requirements_binary: bytes,
     ):
         """Adds assets and files to the mod for modified synthesis recipes and requirements."""
         recipes_source_name = _relative_mod_file("modified_synth.bin")
@@ -684,6 +737,32 @@ class SeedModBuilder:
         self.out_zip.write(
             resource_path(f"static/{modified_cmd_list_yml}"), source_name
         )
+        self.cmd_listpatches[source_name] = load_static_list(modified_cmd_list_yml)
+
+    def add_written_files(self, written_files: dict[str, str]):
+        """
+        Takes note of text files that were written into the zip outside the builder, keeping any that are command list
+        patches used by the mod.
+        """
+        for source_name in self._cmd_listpatch_source_names():
+            if source_name in written_files:
+                self.cmd_listpatches[source_name] = written_files[source_name]
+
+    def _cmd_listpatch_source_names(self) -> list[str]:
+        source_names: list[str] = []
+        for modded_file in self.mod_yml.find_assets("03system.bin"):
+            for source in modded_file["source"]:
+                if source["name"] == "cmd":
+                    source_names.append(source["source"][0]["name"])
+        return source_names
+
+    def _cmd_listpatch_contents(self, source_name: str) -> list[dict[str, Any]]:
+        contents = self.cmd_listpatches.get(source_name)
+        if contents is None:
+            raise GeneratorException(f"Contents of command list patch {source_name} are unknown")
+        if isinstance(contents, str):
+            return yaml.safe_load(contents)
+        return contents
 
     def write_battle_level_assets(self, modified_battle_level_binary: bytearray):
         """Adds assets and files to the mod for modified battle levels."""
@@ -834,22 +913,13 @@ class SeedModBuilder:
 
         # Ards
         for spawn_file_path, visual_assignments in chest_assignments_by_file.items():
-            with open(
-                resource_path(f"static/chests/ard/{spawn_file_path}.spawn")
-            ) as spawn_file:
-                spawn_data = yaml.safe_load(spawn_file)
-
-            for visual_assignment in visual_assignments:
-                chest_index = visual_assignment.chest_index
-                spawn_data[0]["Entities"][chest_index][
-                    "ObjectId"
-                ] = visual_assignment.chest_visual_id
-
-            write_yaml_to_zip_file(
-                self.out_zip,
+            object_ids = {
+                visual_assignment.chest_index: visual_assignment.chest_visual_id
+                for visual_assignment in visual_assignments
+            }
+            self.out_zip.writestr(
                 _relative_mod_file(f"chest/ard/{spawn_file_path}.yml"),
-                spawn_data,
-                sort_keys=False,
+                _spawn_template(spawn_file_path).render(object_ids),
             )
 
         self.mod_yml.add_assets(self._get_chest_visual_assets())
@@ -981,36 +1051,25 @@ class SeedModBuilder:
             resource_path("static/chests/obj/F_EX040_PRF.mdlx"), prf_source_name
         )
 
-    def validate_and_write_mod_yml(
-        self, zip_data: io.BytesIO, settings: RandomizerSettings
-    ) -> io.BytesIO:
-        """Performs some validation and deduplication of assets in the mod, and writes the mod.yml to the zip file."""
+    def validate_and_write_mod_yml(self):
+        """
+        Performs some validation and deduplication of assets in the mod, and writes the mod.yml (along with any merged
+        files) to the zip file. Should be called once everything else has been added, before the zip is closed.
+        """
 
         mod_data = self.mod_yml.data
 
         # merge cmd mods if there are two
         #  first, find all the list patches we are assigning
-        listpatch_file_paths: list[str] = []
+        listpatch_source_names = self._cmd_listpatch_source_names()
         listpatch_contents: list[dict[str, Any]] = []
 
-        for modded_file in self.mod_yml.find_assets("03system.bin"):
-            for source_index, source in enumerate(modded_file["source"]):
-                if source["name"] == "cmd":
-                    listpatch_file_paths.append(
-                        source["source"][0]["name"].replace("\\", "/")
-                    )
-
         merged_command_list_source = _relative_mod_file("cmd_list_merged.yml")
 
-        # if there are multiple cmd listpatches, we have to read all the contents to create new file
-        if len(listpatch_file_paths) > 1:
-            with ZipFile(zip_data, "r") as current_zip:
-                for listpatch_file_path in listpatch_file_paths:
-                    path = zipfile.Path(current_zip, at=listpatch_file_path)
-                    with path.open(encoding="UTF-8") as current_listpatch_file:
-                        listpatch_contents.extend(
-                            yaml.safe_load(current_listpatch_file)
-                        )
+        # if there are multiple cmd listpatches, we have to combine all the contents to create new file
+        if len(listpatch_source_names) > 1:
+            for source_name in listpatch_source_names:
+                listpatch_contents.extend(self._cmd_listpatch_contents(source_name))
 
             # remove all instances of 03_system cmd listpatches (we'll add another afterward)
             num_03system_entries = 0
@@ -1055,7 +1114,7 @@ class SeedModBuilder:
             delete_asset_indices: list[int] = []
             for asset_index, asset in enumerate(mod_data["assets"]):
                 if asset["name"] == modded_file:
-                    if first_asset_index:
+                    if first_asset_index is not None:
                         delete_asset_indices.append(asset_index)
                         # add these sources into this group
                         mod_data["assets"][first_asset_index]["source"] += asset[
@@ -1079,18 +1138,14 @@ class SeedModBuilder:
                 asset["multi"].append({"name": "msg/sp/eh.bar"})
 
         # now that the mod yml is proper, we want to add any merged files into the zip, along with the mod.yml
-        with ZipFile(zip_data, "a", ZIP_DEFLATED) as current_zip:
-            self.mod_yml.write_to_zip_file(current_zip)
-            if len(listpatch_contents) > 0:
-                write_yaml_to_zip_file(
-                    current_zip,
-                    merged_command_list_source,
-                    listpatch_contents,
-                    sort_keys=False,
-                )
-
-        zip_data.seek(0)
-        return zip_data
+        self.mod_yml.write_to_zip_file(self.out_zip)
+        if len(listpatch_contents) > 0:
+            write_yaml_to_zip_file(
+                self.out_zip,
+                merged_command_list_source,
+                listpatch_contents,
+                sort_keys=False,
+            )
 
     def write_mod_ymls(self, include_main_mod_yml: bool):
         """Writes the output for the various mod YAML files."""
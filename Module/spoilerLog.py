@@ -1,3 +1,5 @@
+import re
+import threading
 from typing import Optional
 
 from Class.itemClass import KH2Item
@@ -6,8 +8,96 @@ from List.ObjectiveList import KH2Objective
 from List.configDict import locationType
 from List.inventory import misc
 from Module.newRandomize import ItemAssignment, SynthesisRecipe, WeaponStats
+from Module.resources import resource_path
 from Module.weighting import LocationWeights
 
+# Name of the script file the spoiler data goes into when it's kept out of the spoiler log HTML
+SPOILER_LOG_DATA_FILE = "spoilerlog-data.js"
+
+# Placeholders in spoilerlog.html that are filled in with plain text
+SPOILER_LOG_TEXT_FIELDS = ["SEED_NAME_STRING", "SEED_STRING", "PLATFORM_GENERATED"]
+
+# Placeholders in spoilerlog.html that are filled in with JSON for the page's scripts
+SPOILER_LOG_DATA_FIELDS = [
+    "SORA_ITEM_JSON",
+    "DONALD_ITEM_JSON",
+    "GOOFY_ITEM_JSON",
+    "LEVEL_STATS_JSON",
+    "FORM_EXP_JSON",
+    "DEPTH_VALUES_JSON",
+    "BOSS_ENEMY_JSON",
+    "BATTLE_LEVEL_JSON",
+    "SYNTHESIS_RECIPE_JSON",
+    "WEAPON_STATS_JSON",
+    "JOURNAL_HINTS_JSON",
+    "OBJECTIVES_JSON",
+    "SETTINGS_JSON",
+]
+
+_DATA_SCRIPT_FIELD = "SPOILER_DATA_SCRIPT"
+
+_spoiler_log_template: Optional["SpoilerLogTemplate"] = None
+_spoiler_log_template_lock = threading.Lock()
+
+
+def _spoiler_log_text(text: str) -> str:
+    # The item is named PromiseCharm in the item lists
+    return text.replace("PromiseCharm", "Promise Charm")
+
+
+class SpoilerLogTemplate:
+    """
+    The spoiler log page, split into its fixed text and placeholders once so that each seed's log is put together in
+    a single pass instead of copying the whole page for every placeholder.
+    """
+
+    def __init__(self, template_text: str):
+        field_names = SPOILER_LOG_TEXT_FIELDS + SPOILER_LOG_DATA_FIELDS + [_DATA_SCRIPT_FIELD]
+        placeholder_pattern = "|".join(re.escape(f"{{{name}}}") for name in field_names)
+        parts = re.split(f"({placeholder_pattern})", template_text)
+        self.fixed_texts: list[str] = [_spoiler_log_text(text) for text in parts[0::2]]
+        self.fields: list[str] = [placeholder[1:-1] for placeholder in parts[1::2]]
+
+    def render(self, text_values: dict[str, str], data_values: dict[str, str]) -> str:
+        """Returns the spoiler log HTML with all of the spoiler data included in the page."""
+        values = {name: _spoiler_log_text(value) for name, value in text_values.items()}
+        for name, value in data_values.items():
+            values[name] = _spoiler_log_text(value)
+        values[_DATA_SCRIPT_FIELD] = ""
+        return self._fill(values)
+
+    def render_with_data_file(self, text_values: dict[str, str], data_values: dict[str, str]) -> tuple[str, str]:
+        """
+        Returns the spoiler log HTML along with the contents of a separate script file holding the spoiler data, to be
+        saved next to it as SPOILER_LOG_DATA_FILE. A script is used rather than a plain JSON file because browsers
+        don't allow pages opened from disk to load JSON files.
+        """
+        values = {name: _spoiler_log_text(value) for name, value in text_values.items()}
+        data_entries = []
+        for name, value in data_values.items():
+            values[name] = f"spoiler_data.{name}"
+            data_entries.append(f'"{name}":{_spoiler_log_text(value)}')
+        values[_DATA_SCRIPT_FIELD] = f'<script src="{SPOILER_LOG_DATA_FILE}"></script>\n    '
+        data_script = "spoiler_data = {" + ",".join(data_entries) + "}\n"
+        return self._fill(values), data_script
+
+    def _fill(self, values: dict[str, str]) -> str:
+        pieces = [self.fixed_texts[0]]
+        for field, fixed_text in zip(self.fields, self.fixed_texts[1:]):
+            pieces.append(values[field])
+            pieces.append(fixed_text)
+        return "".join(pieces)
+
+
+def spoiler_log_template() -> SpoilerLogTemplate:
+    """Returns the spoiler log template, reading it the first time it's needed."""
+    global _spoiler_log_template
+    with _spoiler_log_template_lock:
+        if _spoiler_log_template is None:
+            with open(resource_path("static/spoilerlog.html")) as spoiler_site:
+                _spoiler_log_template = SpoilerLogTemplate(spoiler_site.read())
+        return _spoiler_log_template
+
 
 def item_spoiler_dictionary(
         item_assignments: list[ItemAssignment],
@@ -122,7 +212,7 @@ def weapon_stats_dictionary(
         goofy_assignments: list[ItemAssignment],
         weapons: list[WeaponStats]
 ) -> list[dict[str, str]]:
-    all_assignments = sora_assignments + donald_assignments + goofy_assignments
+    all_assignments = [*sora_assignments, *donald_assignments, *goofy_assignments]
 
     result: list[dict[str, str]] = []
     for weapon in weapons:
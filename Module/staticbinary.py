@@ -0,0 +1,38 @@
+import threading
+from typing import Any, Callable, TypeVar
+
+from Module.resources import resource_path
+
+T = TypeVar("T")
+
+_binaries: dict[str, bytes] = {}
+_parsed: dict[tuple[str, Callable], Any] = {}
+_lock = threading.Lock()
+
+
+def static_binary(file_name: str) -> bytes:
+    """
+    Returns the contents of a binary file in the static folder. Each file is read once and shared for the life of the
+    process, so the result is immutable; use bytearray(...) on it to get a copy to modify for a seed.
+    """
+    with _lock:
+        data = _binaries.get(file_name)
+        if data is None:
+            with open(resource_path(f"static/{file_name}"), "rb") as binary_file:
+                data = binary_file.read()
+            _binaries[file_name] = data
+        return data
+
+
+def parsed_static_binary(file_name: str, parse: Callable[[bytes], T]) -> T:
+    """
+    Returns the result of parsing a binary file in the static folder with the given function. The parse runs once per
+    process for each file and function, and the result is shared, so it must be treated as read-only.
+    """
+    key = (file_name, parse)
+    with _lock:
+        if key in _parsed:
+            return _parsed[key]
+    result = parse(static_binary(file_name))
+    with _lock:
+        return _parsed.setdefault(key, result)
@@ -1,11 +1,13 @@
+import random
 from math import ceil, floor
-from typing import Union
+from typing import Optional, Union
+
+import numpy as np
 
 from Class.newLocationClass import KH2Location
 from List.LvupStats import DreamWeaponOffsets
 from List.NewLocationList import Locations
 from List.configDict import itemType, locationCategory, itemRarity, locationDepth, locationType, itemBias, itemDifficulty
-from List.location.graph import START_NODE
 from Module.RandomizerSettings import RandomizerSettings
 
 
@@ -119,67 +121,66 @@ class WeightDistributions:
         return self.weighting_function[difficulty]
 
 
+def _scaled_location_depths(locations: Locations, max_hops: int) -> dict[KH2Location, int]:
+    """
+    Returns the depth of each location in the graph, as its distance from the start scaled against the farthest
+    location with the same primary location type.
+    """
+    hops = locations.hops_from_start()
+    location_type_maxes: dict[locationType, int] = {}
+    for node, distance in hops:
+        for loc in locations.locations_for_node(node):
+            primary_type = loc.LocationTypes[0]
+            if primary_type not in location_type_maxes:
+                location_type_maxes[primary_type] = distance
+            else:
+                location_type_maxes[primary_type] = max(distance, location_type_maxes[primary_type])
+
+    location_depths: dict[KH2Location, int] = {}
+    for node, distance in hops:
+        for loc in locations.locations_for_node(node):
+            primary_type = loc.LocationTypes[0]
+            if location_type_maxes[primary_type] != 0:
+                scaled_depth = floor((distance * 1.0 / location_type_maxes[primary_type]) * max_hops)
+            else:
+                scaled_depth = distance
+            location_depths[loc] = scaled_depth
+    return location_depths
+
+
 class LocationWeights:
 
-    def __init__(self, settings: RandomizerSettings, locations: Locations, reverse_locations: Locations):
+    def __init__(
+            self,
+            settings: RandomizerSettings,
+            locations: Locations,
+            reverse_locations: Optional[Locations] = None
+    ):
         self.regular_rando = settings.regular_rando
         self.reverse_rando = settings.reverse_rando
         self.split_levels = settings.split_levels
         self.level_offsets = DreamWeaponOffsets()
         self.max_level = settings.max_level_checks
-        self.level_depths: dict[int, int] = {}
+        max_hops = 17  # hard coding max hops to unify depths between reverse and regular rando
 
+        # The depths only depend on the graph, so they're shared by everything using the same graph
         # Regular
         # -------------------------------
-        self.location_depths: dict[KH2Location, int] = {}
-        hops = locations.location_graph.get_hops(START_NODE)
-        location_type_maxes: dict[locationType, int] = {}
-        max_hops = 17  # hard coding max hops to unify depths between reverse and regular rando
-        # for hop in hops:
-        #     max_hops = max(max_hops,hop[1])
-        for node, distance in hops:
-            for loc in locations.locations_for_node(node):
-                primary_type = loc.LocationTypes[0]
-                if primary_type not in location_type_maxes:
-                    location_type_maxes[primary_type] = distance
-                else:
-                    location_type_maxes[primary_type] = max(distance, location_type_maxes[primary_type])
-
-        for node, distance in hops:
-            for loc in locations.locations_for_node(node):
-                primary_type = loc.LocationTypes[0]
-                if location_type_maxes[primary_type] != 0:
-                    scaled_depth = floor((distance * 1.0 / location_type_maxes[primary_type]) * max_hops)
-                else:
-                    scaled_depth = distance
-                self.location_depths[loc] = scaled_depth
-                if loc.LocationCategory is locationCategory.LEVEL:
-                    self.level_depths[loc.LocationId] = scaled_depth
-
-        # Reverse
+        self.location_depths: dict[KH2Location, int] = locations.derived(
+            ("location_depths", max_hops), lambda: _scaled_location_depths(locations, max_hops)
+        )
+        self.level_depths: dict[int, int] = {
+            loc.LocationId: depth for loc, depth in self.location_depths.items()
+            if loc.LocationCategory is locationCategory.LEVEL
+        }
+
+        # Reverse (only needed when reverse rando is in play)
         # -------------------------------
         self.reverse_location_depths: dict[KH2Location, int] = {}
-        hops = reverse_locations.location_graph.get_hops(START_NODE)
-        reverse_location_type_maxes: dict[locationType, int] = {}
-        # max_hops = 0
-        # for hop in hops:
-        #     max_hops = max(max_hops,hop[1])
-        for node, distance in hops:
-            for loc in reverse_locations.locations_for_node(node):
-                primary_type = loc.LocationTypes[0]
-                if primary_type not in reverse_location_type_maxes:
-                    reverse_location_type_maxes[primary_type] = distance
-                else:
-                    reverse_location_type_maxes[primary_type] = max(distance, reverse_location_type_maxes[primary_type])
-
-        for node, distance in hops:
-            for loc in reverse_locations.locations_for_node(node):
-                primary_type = loc.LocationTypes[0]
-                if reverse_location_type_maxes[primary_type] != 0:
-                    scaled_depth = floor((distance * 1.0 / reverse_location_type_maxes[primary_type]) * max_hops)
-                else:
-                    scaled_depth = distance
-                self.reverse_location_depths[loc] = scaled_depth
+        if reverse_locations is not None:
+            self.reverse_location_depths = reverse_locations.derived(
+                ("location_depths", max_hops), lambda: _scaled_location_depths(reverse_locations, max_hops)
+            )
 
         self.base_weights = SimplifiedWeightDistributions(max_hops).get_rarity_weightings()
         self.weights = {}
@@ -254,3 +255,62 @@ class LocationWeights:
             regular_weight = rarity_weights[depth_or_depths[0]]
             reverse_weight = rarity_weights[depth_or_depths[1]]
             return (regular_weight + reverse_weight) // 2
+
+
+class LocationSampler:
+    """
+    Picks random locations for items using the location weights. Each item type's weight at every location is computed
+    once, and picked locations are masked out instead of removed, so a pick is a cumulative sum and a binary search
+    instead of a get_weight call for each remaining location.
+
+    Picks draw from the given random generator exactly the way random.choices does, so they're identical to calling
+    rng.choices(remaining_locations, weights) with the weights of the remaining locations.
+    """
+
+    def __init__(self, weights: LocationWeights, locations: list[KH2Location]):
+        self.location_weights = weights
+        self.locations = list(locations)
+        self._available = np.ones(len(self.locations), dtype=bool)
+        self._num_available = len(self.locations)
+        self._index_by_location = {location: index for index, location in enumerate(self.locations)}
+        self._weights_by_type: dict[itemType, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self._num_available
+
+    def _weights_for(self, item_type: itemType) -> np.ndarray:
+        weights = self._weights_by_type.get(item_type)
+        if weights is None:
+            weights = np.array(
+                [self.location_weights.get_weight(item_type, location) for location in self.locations], dtype=np.int64
+            )
+            self._weights_by_type[item_type] = weights
+        return weights
+
+    def cumulative_weights(self, item_type: itemType) -> np.ndarray:
+        """
+        Returns the running total of the weights for the item type, with zero weight for locations that can't be picked
+        anymore. The last entry is the total weight.
+        """
+        return np.cumsum(np.where(self._available, self._weights_for(item_type), 0))
+
+    def pick(self, cumulative_weights: np.ndarray, rng: random.Random) -> KH2Location:
+        """ Picks one of the remaining locations using weights from cumulative_weights. The total must not be zero. """
+        total = float(cumulative_weights[-1])
+        index = int(np.searchsorted(cumulative_weights, rng.random() * total, side="right"))
+        if index >= len(cumulative_weights):
+            # random.choices never goes past the last remaining location, even when rounding lands on the total
+            index = int(np.flatnonzero(self._available)[-1])
+        return self.locations[index]
+
+    def remove(self, location: KH2Location):
+        """ Stops the given location from being picked. """
+        index = self._index_by_location[location]
+        if self._available[index]:
+            self._available[index] = False
+            self._num_available -= 1
+
+    def remaining_locations(self) -> list[KH2Location]:
+        """ Returns the locations that can still be picked, in their original order. """
+        return [location for location, available in zip(self.locations, self._available) if available]
+
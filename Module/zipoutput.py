@@ -0,0 +1,192 @@
+import io
+import queue
+import tempfile
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, Optional, Union
+
+from Module import appconfig
+
+# What a zip output hands back once the zip is written: the data itself if it was built in memory, the path if it was
+# written to a file, or nothing if it went straight to a caller's stream
+ZipData = Union[io.BytesIO, Path, None]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class ZipOutput(ABC):
+    """
+    Destination for a generated zip. Used as a context manager around writing the zip: entering returns the binary
+    stream to write the zip into, and leaving finishes the output off (or throws away a partial one if writing failed).
+    """
+
+    @abstractmethod
+    def __enter__(self) -> BinaryIO:
+        """Returns the binary stream to write the zip into."""
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    @abstractmethod
+    def result(self) -> ZipData:
+        """Returns the finished zip (or where it went) for handing back to callers."""
+
+
+class MemoryZipOutput(ZipOutput):
+    """Builds the zip in memory. This is the default when no other output is given."""
+
+    def __init__(self):
+        self._data = io.BytesIO()
+
+    def __enter__(self) -> BinaryIO:
+        self._data = io.BytesIO()
+        return self._data
+
+    def result(self) -> io.BytesIO:
+        self._data.seek(0)
+        return self._data
+
+
+class FileZipOutput(ZipOutput):
+    """
+    Writes the zip straight to a file. The zip is written under a temporary name next to the destination and only moved
+    into place once it is complete, so a failed generation never leaves a broken zip behind.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file: Optional[appconfig.AtomicFile] = None
+
+    def __enter__(self) -> BinaryIO:
+        self._file = appconfig.AtomicFile(self.path)
+        return self._file.__enter__()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._file.__exit__(exc_type, exc_val, exc_tb)
+
+    def result(self) -> Path:
+        return self.path
+
+    def discard(self):
+        """Removes the zip, along with the partial one if writing it was stopped partway."""
+        if self._file is not None:
+            self._file.discard()
+        self.path.unlink(missing_ok=True)
+
+
+def temporary_file_output() -> FileZipOutput:
+    """Returns an output to a new file in the system's temporary folder, for zips that get moved elsewhere later."""
+    return FileZipOutput(Path(tempfile.gettempdir()) / f"kh2rando-{uuid.uuid4().hex}.zip")
+
+
+class StreamZipOutput(ZipOutput):
+    """
+    Writes the zip into an already open binary stream, such as a socket file or an HTTP response. The stream is left
+    open. Streams that can't seek are fine, and anything written can't be taken back, so the output can only be used
+    once.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self._used = False
+
+    def __enter__(self) -> BinaryIO:
+        if self._used:
+            raise ValueError("A stream output can only have one zip written to it")
+        self._used = True
+        return self.stream
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.stream.flush()
+        return False
+
+    def result(self) -> None:
+        # The zip has already gone to whoever is reading the stream
+        return None
+
+
+class _ChunkCancelled(Exception):
+    pass
+
+
+class _ChunkWriter:
+    """Write-only stream that groups what is written into chunks and hands them over to the reading side."""
+
+    def __init__(self, chunks: queue.Queue, chunk_size: int, cancelled: threading.Event):
+        self._chunks = chunks
+        self._chunk_size = chunk_size
+        self._cancelled = cancelled
+        self._buffer = bytearray()
+
+    def write(self, data) -> int:
+        self._buffer += data
+        while len(self._buffer) >= self._chunk_size:
+            self.put(bytes(self._buffer[: self._chunk_size]))
+            del self._buffer[: self._chunk_size]
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def finish(self):
+        if len(self._buffer) > 0:
+            self.put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def put(self, item):
+        """Hands an item to the reading side, waiting while it is behind."""
+        while True:
+            if self._cancelled.is_set():
+                raise _ChunkCancelled()
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+def zip_chunks(
+    write_zip: Callable[[ZipOutput], object],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_pending_chunks: int = 8,
+) -> Iterator[bytes]:
+    """
+    Yields a zip in chunks while it is being written, for sending out as a chunked response. The write_zip function is
+    called on a background thread with the output to write into (for example, a seed zipper's create_zip). At most
+    max_pending_chunks are held in memory, so writing waits for the reader to catch up. Errors from writing are raised
+    from the iterator.
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=max_pending_chunks)
+    cancelled = threading.Event()
+    done = object()
+    writer = _ChunkWriter(chunks, chunk_size, cancelled)
+
+    def _write():
+        try:
+            write_zip(StreamZipOutput(writer))
+            writer.finish()
+            writer.put(done)
+        except _ChunkCancelled:
+            pass
+        except BaseException as e:
+            try:
+                writer.put(e)
+            except _ChunkCancelled:
+                pass
+
+    thread = threading.Thread(target=_write, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is done:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Lets the writing side stop the next time it writes if the reader gave up early
+        cancelled.set()
@@ -1,7 +1,8 @@
 import base64
-import io
 import json
 import random
+import struct
+import threading
 from itertools import accumulate
 from typing import Optional, Any
 from zipfile import ZipFile, ZIP_DEFLATED
@@ -24,28 +25,38 @@ from List.inventory import bonus
 from List.location import simulatedtwilighttown as stt
 from Module import hashimage
 from Module.RandomizerSettings import RandomizerSettings
+from Module.assetstore import AssetZipFile
 from Module.battleLevels import BtlvViewer
 from Module.cosmetics import CosmeticsMod
 from Module.hints import Hints, HintData
 from Module.knockbackTypes import KnockbackTypes
 from Module.multiworld import MultiWorldOutput
-from Module.newRandomize import Randomizer, SynthesisRecipe, ItemAssignment
+from Module.newRandomize import Randomizer, SynthesisRecipe, ItemAssignment, FormExp, LevelStats
 from Module.resources import resource_path
 from Module.seedmod import SeedModBuilder, ChestVisualAssignment, CosmeticsModAppender
 from Module.spoilerLog import (
+    SPOILER_LOG_DATA_FILE,
     item_spoiler_dictionary,
     levelStatsDictionary,
     synth_recipe_dictionary,
     weapon_stats_dictionary,
     objectives_dictionary,
+    spoiler_log_template,
 )
+from Module.staticbinary import parsed_static_binary, static_binary
 from Module.version import LOCAL_UI_VERSION
+from Module.zipoutput import MemoryZipOutput, ZipData, ZipOutput
 
 
 def noop(self, *args, **kw):
     pass
 
 
+def _spoiler_json(data) -> str:
+    """Compact JSON for the spoiler log page, which only its scripts read."""
+    return json.dumps(data, separators=(",", ":"), cls=ItemEncoder)
+
+
 def number_to_bytes(item) -> tuple[int, int]:
     # for byte1, find the most significant bits from the item Id
     item_byte1 = item >> 8
@@ -78,15 +89,39 @@ def _assignment_subset_from_type(
     ]
 
 
+# khbr draws from the global random module, so only one boss/enemy randomization can run at a time
+_khbr_lock = threading.Lock()
+
+
+class _TextRecordingZipWriter:
+    """
+    Stands in for a zip file when khbr writes its output, passing every file through to the real zip while holding on
+    to the text ones, so the seed mod can use their contents without reading them back out of the zip.
+    """
+
+    def __init__(self, out_zip: ZipFile):
+        self.out_zip = out_zip
+        self.text_files: dict[str, str] = {}
+
+    def writestr(self, name: str, data):
+        self.out_zip.writestr(name, data)
+        if isinstance(data, str):
+            self.text_files[name] = data
+
+
 def _run_khbr(
-    platform: str, enemy_options: dict, mod_yml: ModYml, out_zip: ZipFile
+    platform: str, enemy_options: dict, mod_yml: ModYml, out_zip: ZipFile, rng: Optional[random.Random] = None
 ) -> tuple[Optional[str], dict[str, list]]:
     if platform == "PC":
         enemy_options["memory_expansion"] = True
     else:
         enemy_options["memory_expansion"] = False
 
-    enemy_spoilers = _invoke_khbr_with_overrides(enemy_options, mod_yml.data, out_zip)
+    with _khbr_lock:
+        enemy_spoilers = _invoke_khbr_with_overrides(enemy_options, mod_yml.data, out_zip)
+        if rng is not None:
+            # pick the seed's own random stream back up from where khbr left off
+            rng.setstate(random.getstate())
 
     lines = enemy_spoilers.split("\n")
 
@@ -115,21 +150,21 @@ def _run_khbr(
     return enemy_spoilers, enemy_spoilers_json
 
 
-def _add_cosmetics(out_zip: ZipFile, mod_yml: ModYml, settings: SeedSettings):
+def _add_cosmetics(out_zip: ZipFile, mod_yml: ModYml, settings: SeedSettings, rng: random.Random):
     appender = CosmeticsModAppender(out_zip=out_zip, mod_yml=mod_yml)
 
-    mod_yml.add_assets(CosmeticsMod.randomize_field2d(settings))
-    mod_yml.add_assets(CosmeticsMod.randomize_itempics(settings))
-    mod_yml.add_assets(CosmeticsMod.randomize_end_screen(settings))
+    mod_yml.add_assets(CosmeticsMod.randomize_field2d(settings, rng))
+    mod_yml.add_assets(CosmeticsMod.randomize_itempics(settings, rng))
+    mod_yml.add_assets(CosmeticsMod.randomize_end_screen(settings, rng))
 
-    keyblade_assets, keyblade_replacements = CosmeticsMod.randomize_keyblades(settings)
+    keyblade_assets, keyblade_replacements = CosmeticsMod.randomize_keyblades(settings, rng)
     appender.write_keyblade_rando_assets(keyblade_assets, keyblade_replacements)
 
-    music_assets, music_replacements = CosmeticsMod.randomize_music(settings)
+    music_assets, music_replacements = CosmeticsMod.randomize_music(settings, rng)
     appender.write_music_rando_assets(music_assets, music_replacements)
 
     from Module.cosmeticsmods.texture import TextureRecolorizer
-    texture_assets = TextureRecolorizer(settings).recolor_textures()
+    texture_assets = TextureRecolorizer(settings, rng).recolor_textures()
     mod_yml.add_assets(texture_assets)
 
     if settings.get(settingkey.RANDO_THEMED_TEXTURES):
@@ -155,25 +190,41 @@ class SynthList:
             return ""
 
 
+# Layout of an entry in drops.bin: enemy ID, nine orb/munny counts, one unused byte, then three item/chance pairs
+_DROP_RATE_ENTRY = struct.Struct("<H9BxHHHHHH")
+_NUM_DROP_RATE_ENTRIES = 184
+
+
+def _parse_drop_rates(drops_binary: bytes) -> list[tuple[int, tuple[int, ...]]]:
+    """Returns the offset and unpacked values of each entry in drops.bin."""
+    entries = []
+    for i in range(_NUM_DROP_RATE_ENTRIES):
+        start_index = 8 + _DROP_RATE_ENTRY.size * i
+        entries.append((start_index, _DROP_RATE_ENTRY.unpack_from(drops_binary, start_index)))
+    return entries
+
+
 class DropRates:
-    def __init__(self, offset: int, binary: bytearray):
+    def __init__(self, offset: int, values: tuple[int, ...]):
         self.offset = offset
-        self.id = bytes_to_number(binary[0], binary[1])
-        self.small_hp = bytes_to_number(binary[2])
-        self.big_hp = bytes_to_number(binary[3])
-        self.big_munny = bytes_to_number(binary[4])
-        self.medium_munny = bytes_to_number(binary[5])
-        self.small_munny = bytes_to_number(binary[6])
-        self.small_mp = bytes_to_number(binary[7])
-        self.big_mp = bytes_to_number(binary[8])
-        self.small_drive = bytes_to_number(binary[9])
-        self.big_drive = bytes_to_number(binary[10])
-        self.item1 = bytes_to_number(binary[12], binary[13])
-        self.item1_chance = bytes_to_number(binary[14], binary[15])
-        self.item2 = bytes_to_number(binary[16], binary[17])
-        self.item2_chance = bytes_to_number(binary[18], binary[19])
-        self.item3 = bytes_to_number(binary[20], binary[21])
-        self.item3_chance = bytes_to_number(binary[22], binary[23])
+        (
+            self.id,
+            self.small_hp,
+            self.big_hp,
+            self.big_munny,
+            self.medium_munny,
+            self.small_munny,
+            self.small_mp,
+            self.big_mp,
+            self.small_drive,
+            self.big_drive,
+            self.item1,
+            self.item1_chance,
+            self.item2,
+            self.item2_chance,
+            self.item3,
+            self.item3_chance,
+        ) = values
 
     def __str__(self):
         if True:  # self.item1_chance and self.id not in id_to_enemy_name:
@@ -185,6 +236,46 @@ class DropRates:
         #     return ""
 
 
+def _modify_synth_requirements(requirements_binary: bytes) -> bytes:
+    modified_requirements_binary = bytearray(requirements_binary)
+
+    # uncomment to see some data about the synth lists
+    # index = 16
+    # while index + 12 < len(modified_requirements_binary):
+    #     print(SynthList(index, modified_requirements_binary[index:]))
+    #     index += 12
+
+    # 3/6 free dev 8,9 bytes from offset index
+    free_dev1 = number_to_bytes(3)
+    free_dev2 = number_to_bytes(6)
+    modified_requirements_binary[36] = free_dev1[0]
+    modified_requirements_binary[37] = free_dev1[1]
+    modified_requirements_binary[72] = free_dev2[0]
+    modified_requirements_binary[73] = free_dev2[1]
+
+    # 1,3 ori+ version,
+    # free_dev1 = number_to_bytes(1)
+    # free_dev2 = number_to_bytes(3)
+    # ori_plus_id = number_to_bytes(12) # not sure on this
+    # binaryContent[33] = ori_plus_id[0]
+    # binaryContent[35] = 0
+    # binaryContent[36] = free_dev1[0]
+    # binaryContent[37] = free_dev1[1]
+    # binaryContent[69] = ori_plus_id[0]
+    # binaryContent[71] = 0
+    # binaryContent[72] = free_dev2[0]
+    # binaryContent[73] = free_dev2[1]
+
+    # uncomment to make all existing synth buyable conditions need 7 of that material
+    # new_required_items = number_to_bytes(7)
+    # start_index=376
+    # for i in range(0,24):
+    #     binaryContent[start_index+i*12+8] = new_required_items[0]
+    #     binaryContent[start_index+i*12+9] = new_required_items[1]
+
+    return bytes(modified_requirements_binary)
+
+
 class SynthLocation:
     def __init__(self, loc: int, item: int, in_recipe: SynthesisRecipe):
         self.location = loc
@@ -224,7 +315,8 @@ class SynthLocation:
 
 
 # (output zip, spoiler log, enemy log)
-SeedZipResult = tuple[io.BytesIO, Optional[str], Optional[str]]
+# The zip (see ZipData), the spoiler log, and the enemy spoilers
+SeedZipResult = tuple[ZipData, Optional[str], Optional[str]]
 SeedNotZipResult = tuple[Optional[str], Optional[str]]
 
 
@@ -313,26 +405,22 @@ class SeedZip:
         self.multiworld = multiworld
 
     def make_spoiler_without_zip(self) -> str:
+        """
+        Returns the spoiler log without writing a zip. Nothing but the spoiler data is generated, so the boss/enemy and
+        journal hint sections are left empty.
+        """
         enemy_spoilers_json: dict[str, str] = {}
-
-        settings = self.settings
-        btlv_option_name = settings.battle_level_rando
-
-        btlv = BtlvViewer()
-        btlv.use_setting(
-            btlv_option_name,
-            battle_level_offset=settings.battle_level_offset,
-            battle_level_range=settings.battle_level_range,
-            battle_level_random_min_max=settings.battle_level_random_min_max,
-        )
-        battle_level_spoiler = btlv.get_spoiler()
+        battle_level_spoiler = self._randomize_battle_levels().get_spoiler()
         journal_hints_spoiler = {}
-        spoiler_log_output = self.generate_spoiler_html(
+        return self.generate_spoiler_html(
             enemy_spoilers_json, battle_level_spoiler, journal_hints_spoiler
         )
-        return spoiler_log_output
 
-    def create_zip(self) -> SeedZipResult:
+    def create_zip(self, output: Optional[ZipOutput] = None) -> SeedZipResult:
+        """
+        Writes the seed zip into the given output, building it in memory if there isn't one. The result holds whatever
+        the output hands back for the zip, along with the spoiler logs.
+        """
         settings = self.settings
         spoiler_log = settings.spoiler_log
         extra_data = self.extra_data
@@ -342,10 +430,11 @@ class SeedZip:
         if spoiler_log and not tourney_gen:
             title += " w/ Spoiler"
 
-        zip_data = io.BytesIO()
+        if output is None:
+            output = MemoryZipOutput()
         spoiler_log_output: Optional[str] = None
         enemy_log_output: Optional[str] = None
-        with ZipFile(zip_data, "w", ZIP_DEFLATED) as out_zip:
+        with output as zip_stream, AssetZipFile(zip_stream, "w", ZIP_DEFLATED) as out_zip:
             yaml.emitter.Emitter.process_tag = noop
             mod = SeedModBuilder(title, out_zip)
             mod.add_base_assets()
@@ -354,10 +443,11 @@ class SeedZip:
 
             if settings.dummy_forms:
                 # convert the valor and final ids to their dummy values
-                for a in self.randomizer.assignments:
+                assignments = self.randomizer.assignments
+                for a in assignments:
                     for dummy_form_item in Items.getDummyFormItems():
                         if a.item.Name == dummy_form_item.Name:
-                            a.item = dummy_form_item
+                            assignments.set_item(a, dummy_form_item)
                 # if valor/final in starting inventory, swap their ids
                 orig_to_dummy = Items.getFormToDummyMap()
                 for orig_id,dummy_id in orig_to_dummy.items():
@@ -427,9 +517,18 @@ class SeedZip:
 
             if spoiler_log or tourney_gen:
                 # For a tourney seed, generate the spoiler log to return to the caller but don't include it in the zip
-                spoiler_log_output = self.generate_spoiler_html(
-                    enemy_spoilers_json, battle_level_spoiler, journal_hints_spoiler
-                )
+                if not tourney_gen and extra_data.spoiler_data_file:
+                    text_values, data_values = self._spoiler_log_values(
+                        enemy_spoilers_json, battle_level_spoiler, journal_hints_spoiler
+                    )
+                    spoiler_log_output, spoiler_data = spoiler_log_template().render_with_data_file(
+                        text_values, data_values
+                    )
+                    out_zip.writestr(SPOILER_LOG_DATA_FILE, spoiler_data)
+                else:
+                    spoiler_log_output = self.generate_spoiler_html(
+                        enemy_spoilers_json, battle_level_spoiler, journal_hints_spoiler
+                    )
                 if not tourney_gen:
                     out_zip.writestr("spoilerlog.html", spoiler_log_output)
                     out_zip.write(resource_path("static/KHMenu.otf"), "misc/KHMenu.otf")
@@ -439,19 +538,16 @@ class SeedZip:
                 if enemy_spoilers and not tourney_gen:
                     out_zip.writestr("enemyspoilers.txt", enemy_spoilers)
 
-            _add_cosmetics(out_zip=out_zip, mod_yml=mod.mod_yml, settings=settings.ui_settings)
+            _add_cosmetics(out_zip=out_zip, mod_yml=mod.mod_yml, settings=settings.ui_settings, rng=settings.rng)
 
             out_zip.write(resource_path("Module/icon.png"), "icon.png")
 
             mod.write_mod_ymls(
                 include_main_mod_yml=False
             )  # We'll add the main mod.yml after the validation
-            out_zip.close()
-        zip_data.seek(0)
+            mod.validate_and_write_mod_yml()
 
-        new_data = mod.validate_and_write_mod_yml(zip_data, settings)
-
-        return new_data, spoiler_log_output, enemy_log_output
+        return output.result(), spoiler_log_output, enemy_log_output
 
     def run_khbr_if_needed(
         self, mod: SeedModBuilder, out_zip: ZipFile
@@ -486,9 +582,12 @@ class SeedZip:
             return False
 
         if _should_run_khbr():
-            return _run_khbr(
-                self.extra_data.platform, enemy_options, mod.mod_yml, out_zip
+            khbr_zip = _TextRecordingZipWriter(out_zip)
+            result = _run_khbr(
+                self.extra_data.platform, enemy_options, mod.mod_yml, khbr_zip, self.settings.rng
             )
+            mod.add_written_files(khbr_zip.text_files)
+            return result
         else:
             return None, {}
 
@@ -498,6 +597,18 @@ class SeedZip:
             battle_level_spoiler,
             journal_hints_spoiler: dict[str, str]
     ) -> str:
+        text_values, data_values = self._spoiler_log_values(
+            enemy_spoilers_json, battle_level_spoiler, journal_hints_spoiler
+        )
+        return spoiler_log_template().render(text_values, data_values)
+
+    def _spoiler_log_values(
+            self,
+            enemy_spoilers_json,
+            battle_level_spoiler,
+            journal_hints_spoiler: dict[str, str]
+    ) -> tuple[dict[str, str], dict[str, str]]:
+        """Returns the text and JSON data to fill in to the spoiler log template."""
         settings = self.settings
         randomizer = self.randomizer
         platform = self.extra_data.platform
@@ -552,27 +663,27 @@ class SeedZip:
         )
         objectives_json = objectives_dictionary(randomizer.objectives)
 
-        with open(resource_path("static/spoilerlog.html")) as spoiler_site:
-            return (
-                spoiler_site.read()
-                .replace("{SEED_NAME_STRING}", settings.random_seed)
-                .replace("{SEED_STRING}", settings.seed_string)
-                .replace("{PLATFORM_GENERATED}", platform)
-                .replace("{LEVEL_STATS_JSON}", json.dumps(levelStatsDictionary(randomizer.level_stats)))
-                .replace("{FORM_EXP_JSON}", json.dumps(exp_multipliers_json))
-                .replace("{DEPTH_VALUES_JSON}", json.dumps(randomizer.location_weights.weights))
-                .replace("{SORA_ITEM_JSON}", json.dumps(sora_items_json, indent=4, cls=ItemEncoder))
-                .replace("{DONALD_ITEM_JSON}", json.dumps(donald_items_json, indent=4, cls=ItemEncoder))
-                .replace("{GOOFY_ITEM_JSON}", json.dumps(goofy_items_json, indent=4, cls=ItemEncoder))
-                .replace("{BOSS_ENEMY_JSON}", json.dumps(enemy_spoilers_json))
-                .replace("{BATTLE_LEVEL_JSON}", json.dumps(battle_level_spoiler))
-                .replace("{SYNTHESIS_RECIPE_JSON}", json.dumps(synthesis_recipe_json))
-                .replace("{WEAPON_STATS_JSON}", json.dumps(weapon_stats_spoiler))
-                .replace("{JOURNAL_HINTS_JSON}", json.dumps(journal_hints_spoiler))
-                .replace("{OBJECTIVES_JSON}", json.dumps(objectives_json))
-                .replace("{SETTINGS_JSON}", json.dumps(settings_spoiler_json))
-                .replace("PromiseCharm", "Promise Charm")
-            )
+        text_values = {
+            "SEED_NAME_STRING": settings.random_seed,
+            "SEED_STRING": settings.seed_string,
+            "PLATFORM_GENERATED": platform,
+        }
+        data_values = {
+            "SORA_ITEM_JSON": _spoiler_json(sora_items_json),
+            "DONALD_ITEM_JSON": _spoiler_json(donald_items_json),
+            "GOOFY_ITEM_JSON": _spoiler_json(goofy_items_json),
+            "LEVEL_STATS_JSON": _spoiler_json(levelStatsDictionary(randomizer.level_stats)),
+            "FORM_EXP_JSON": _spoiler_json(exp_multipliers_json),
+            "DEPTH_VALUES_JSON": _spoiler_json(randomizer.location_weights.weights),
+            "BOSS_ENEMY_JSON": _spoiler_json(enemy_spoilers_json),
+            "BATTLE_LEVEL_JSON": _spoiler_json(battle_level_spoiler),
+            "SYNTHESIS_RECIPE_JSON": _spoiler_json(synthesis_recipe_json),
+            "WEAPON_STATS_JSON": _spoiler_json(weapon_stats_spoiler),
+            "JOURNAL_HINTS_JSON": _spoiler_json(journal_hints_spoiler),
+            "OBJECTIVES_JSON": _spoiler_json(objectives_json),
+            "SETTINGS_JSON": _spoiler_json(settings_spoiler_json),
+        }
+        return text_values, data_values
 
     def generate_seed_hash_image(self, out_zip: ZipFile):
         hash_icons = self.settings.seedHashIcons
@@ -586,13 +697,7 @@ class SeedZip:
         settings = self.settings
         btlv_option_name = settings.battle_level_rando
 
-        btlv = BtlvViewer()
-        btlv.use_setting(
-            btlv_option_name,
-            battle_level_offset=settings.battle_level_offset,
-            battle_level_range=settings.battle_level_range,
-            battle_level_random_min_max=settings.battle_level_random_min_max,
-        )
+        btlv = self._randomize_battle_levels()
         if (
             (btlv_option_name == BattleLevelOption.NORMAL.name)
             or (
@@ -611,6 +716,18 @@ class SeedZip:
 
         return btlv.get_spoiler()
 
+    def _randomize_battle_levels(self) -> BtlvViewer:
+        settings = self.settings
+        btlv = BtlvViewer()
+        btlv.use_setting(
+            settings.battle_level_rando,
+            battle_level_offset=settings.battle_level_offset,
+            battle_level_range=settings.battle_level_range,
+            battle_level_random_min_max=settings.battle_level_random_min_max,
+            rng=settings.rng,
+        )
+        return btlv
+
     def add_cmd_list_modifications(self, mod: SeedModBuilder):
         settings = self.settings
         if settings.roxas_abilities_enabled and not settings.disable_final_form:
@@ -628,17 +745,10 @@ class SeedZip:
             assigned_puzzles = _assignment_subset_from_type(
                 self.randomizer.assignments, [locationType.Puzzle]
             )
-            with open(resource_path("static/puzzle.bin"), "rb") as puzzleBar:
-                modified_puzzle_binary = bytearray(puzzleBar.read())
-                for puzz in assigned_puzzles:
-                    byte0 = 20 + puzz.location.LocationId * 16
-                    byte1 = 20 + puzz.location.LocationId * 16 + 1
-                    item = puzz.item.Id
-
-                    item_byte_0, item_byte_1 = number_to_bytes(item)
-                    modified_puzzle_binary[byte0] = item_byte_0
-                    modified_puzzle_binary[byte1] = item_byte_1
-                mod.write_puzzle_assets(modified_puzzle_binary)
+            modified_puzzle_binary = bytearray(static_binary("puzzle.bin"))
+            for puzz in assigned_puzzles:
+                struct.pack_into("<H", modified_puzzle_binary, 20 + puzz.location.LocationId * 16, puzz.item.Id)
+            mod.write_puzzle_assets(modified_puzzle_binary)
 
     def create_drop_rate_assets(self, mod: SeedModBuilder):
         settings = self.settings
@@ -656,18 +766,9 @@ class SeedZip:
             or near_unlimited_mp
         ):
             all_drops = {}
-            testing = []
-            with open(resource_path("static/drops.bin"), "rb") as drops_bar:
-                drops_binary = bytearray(drops_bar.read())
-                for i in range(0, 184):
-                    start_index = 8 + 24 * i
-                    rate = DropRates(
-                        start_index, drops_binary[start_index : start_index + 24]
-                    )
-                    all_drops[rate.id] = rate
-
-                    if rate.id not in id_to_enemy_name:
-                        testing.append(rate.id)
+            for start_index, values in parsed_static_binary("drops.bin", _parse_drop_rates):
+                rate = DropRates(start_index, values)
+                all_drops[rate.id] = rate
 
             spawnable_enemy_ids = [
                 1,
@@ -842,42 +943,10 @@ class SeedZip:
 
     def create_objective_rando_assets(self, mod: SeedModBuilder, num_objectives_needed: int, objective_list: list[KH2Objective]):
         mod.add_objective_randomization_mods(num_objectives_needed, objective_list)
-        mod.items.add_item(
-            item_id=363,
-            item_type="Recipe",
-            flag_0=0,
-            flag_1=0,
-            rank="C",
-            stat_entry=0,
-            name=47883,
-            description=47884,
-            shop_buy=num_objectives_needed,
-            shop_sell=0,
-            command=0,
-            slot=189,
-            picture=226,
-            icon_1=0,
-            icon_2=2,
-        )
+        mod.items.add_item_from_table(363, shop_buy=num_objectives_needed)
     def create_emblem_rando_assets(self, mod: SeedModBuilder, num_emblems_needed: int):
         mod.add_emblem_randomization_mods(num_emblems_needed)
-        mod.items.add_item(
-            item_id=363,
-            item_type="Recipe",
-            flag_0=0,
-            flag_1=0,
-            rank="C",
-            stat_entry=0,
-            name=47883,
-            description=47884,
-            shop_buy=num_emblems_needed,
-            shop_sell=0,
-            command=0,
-            slot=189,
-            picture=226,
-            icon_1=0,
-            icon_2=2,
-        )
+        mod.items.add_item_from_table(363, shop_buy=num_emblems_needed)
 
     def create_shop_rando_assets(self, mod: SeedModBuilder):
         shop_items = self.randomizer.shop_items
@@ -942,107 +1011,69 @@ class SeedZip:
                 # for i in remaining_items:
                 #     items_for_shop.append((i.Id,price_map[i.Rarity]))
 
-            with open(resource_path("static/full_items.json"), "r") as item_json:
-                all_item_jsons = json.loads(item_json.read())
-                for item_id, price in items_for_shop:
-                    item_json = None
-                    for y in all_item_jsons["Items"]:
-                        if y["Id"] == item_id:
-                            item_json = y
-                            break
-                    item_json["ShopBuy"] = price
-                    mod.items.add_item(
-                        item_id=item_json["Id"],
-                        item_type=item_json["Type"],
-                        flag_0=item_json["Flag0"],
-                        flag_1=item_json["Flag1"],
-                        rank=item_json["Rank"],
-                        stat_entry=item_json["StatEntry"],
-                        name=item_json["Name"],
-                        description=item_json["Description"],
-                        shop_buy=item_json["ShopBuy"],
-                        shop_sell=item_json["ShopSell"],
-                        command=item_json["Command"],
-                        slot=item_json["Slot"],
-                        picture=item_json["Picture"],
-                        icon_1=item_json["Icon1"],
-                        icon_2=item_json["Icon2"],
-                    )
-
-            with open(resource_path("static/shop.bin"), "rb") as shop_bar:
-                modified_shop_binary = bytearray(shop_bar.read())
-
-                byte0, byte1 = number_to_bytes(80 + len(items_for_shop))
-                modified_shop_binary[10] = byte0
-                modified_shop_binary[11] = byte1
-
-                byte0, byte1 = number_to_bytes(len(items_for_shop))
-
-                # inventory 752
-                modified_shop_binary[754] = byte0
-                modified_shop_binary[755] = byte1
-                byte0, byte1 = number_to_bytes(984)
-                modified_shop_binary[756] = byte0
-                modified_shop_binary[757] = byte1
-
-                valid_start = bytes_to_number(
-                    modified_shop_binary[12], modified_shop_binary[13]
-                )
-                for asset in range(len(items_for_shop)):
-                    product_index = 984 + 2 * asset
-                    valid_item_index = valid_start + (60 + asset) * 2
-                    byte0, byte1 = number_to_bytes(items_for_shop[asset][0])
-                    modified_shop_binary[product_index] = byte0
-                    modified_shop_binary[product_index + 1] = byte1
-                    modified_shop_binary[valid_item_index] = byte0
-                    modified_shop_binary[valid_item_index + 1] = byte1
-
-                mod.write_shop_assets(modified_shop_binary)
-
-                # ## code below prints out the shop information in relevant format
-
-                # print(f"file type: {bytes_to_number(binaryContent[4],binaryContent[5])}")
-                # shop_list_count = bytes_to_number(binaryContent[6],binaryContent[7])
-                # print(f"shop list count: {shop_list_count}")
-                # inventory_list_count = bytes_to_number(binaryContent[8],binaryContent[9])
-                # print(f"inventory entry count: {inventory_list_count}")
-                # product_list_count = bytes_to_number(binaryContent[10],binaryContent[11])
-                # print(f"product entry count: {product_list_count}")
-                # valid_start = bytes_to_number(binaryContent[12],binaryContent[13])
-                # print(f"valid items offset: {valid_start}")
-
-                # shop_start = 16
-                # print("Shop Entries")
-                # for x in range(shop_list_count):
-                #     shop_index = shop_start+x*24
-                #     print(f"---- Shop ID: {bytes_to_number(binaryContent[shop_index+18])}")
-                #     print(f"---- Inventory Amount: {bytes_to_number(binaryContent[shop_index+16],binaryContent[shop_index+17])}")
-                #     print(f"---- Inventory Offset: {bytes_to_number(binaryContent[shop_index+20],binaryContent[shop_index+21])}")
-                #     print("----------")
-
-                # inventory_start = shop_start+shop_list_count*24
-                # print("Inventory Entries")
-                # for x in range(inventory_list_count):
-                #     inventory_index = inventory_start+x*8
-                #     print(f"---- Inventory Address: {inventory_index}")
-                #     print(f"---- Unlock event: {bytes_to_number(binaryContent[inventory_index],binaryContent[inventory_index+1])}")
-                #     print(f"---- Product Amount: {bytes_to_number(binaryContent[inventory_index+2],binaryContent[inventory_index+3])}")
-                #     print(f"---- Product Offset: {bytes_to_number(binaryContent[inventory_index+4],binaryContent[inventory_index+5])}")
-                #     print("----------")
-
-                # product_start = inventory_start+inventory_list_count*8
-                # print("Product Entries")
-                # for x in range(product_list_count):
-                #     product_index = product_start+x*2
-                #     print(f"---- Address {product_index}")
-                #     print(f"---- Product (Item Id):  {bytes_to_number(binaryContent[product_index],binaryContent[product_index+1])}")
-
-                # print("Valid Items")
-                # for x in range(63):
-                #     valid_index = valid_start+x*2
-                #     item_id = bytes_to_number(binaryContent[valid_index],binaryContent[valid_index+1])
-                #     if item_id!=0:
-                #         print(f"---- Valid Item (Item Id):  {item_id}")
+            for item_id, price in items_for_shop:
+                mod.items.add_item_from_table(item_id, shop_buy=price)
+
+            modified_shop_binary = bytearray(static_binary("shop.bin"))
+
+            struct.pack_into("<H", modified_shop_binary, 10, 80 + len(items_for_shop))
+
+            # inventory 752
+            struct.pack_into("<HH", modified_shop_binary, 754, len(items_for_shop), 984)
+
+            # the shop items go into both the product list and the valid items list
+            (valid_start,) = struct.unpack_from("<H", modified_shop_binary, 12)
+            shop_item_ids = struct.pack(f"<{len(items_for_shop)}H", *(item_id for item_id, _ in items_for_shop))
+            modified_shop_binary[984 : 984 + len(shop_item_ids)] = shop_item_ids
+            valid_item_index = valid_start + 60 * 2
+            modified_shop_binary[valid_item_index : valid_item_index + len(shop_item_ids)] = shop_item_ids
+
+            mod.write_shop_assets(modified_shop_binary)
+
+            # ## code below prints out the shop information in relevant format
+
+            # print(f"file type: {bytes_to_number(binaryContent[4],binaryContent[5])}")
+            # shop_list_count = bytes_to_number(binaryContent[6],binaryContent[7])
+            # print(f"shop list count: {shop_list_count}")
+            # inventory_list_count = bytes_to_number(binaryContent[8],binaryContent[9])
+            # print(f"inventory entry count: {inventory_list_count}")
+            # product_list_count = bytes_to_number(binaryContent[10],binaryContent[11])
+            # print(f"product entry count: {product_list_count}")
+            # valid_start = bytes_to_number(binaryContent[12],binaryContent[13])
+            # print(f"valid items offset: {valid_start}")
+
+            # shop_start = 16
+            # print("Shop Entries")
+            # for x in range(shop_list_count):
+            #     shop_index = shop_start+x*24
+            #     print(f"---- Shop ID: {bytes_to_number(binaryContent[shop_index+18])}")
+            #     print(f"---- Inventory Amount: {bytes_to_number(binaryContent[shop_index+16],binaryContent[shop_index+17])}")
+            #     print(f"---- Inventory Offset: {bytes_to_number(binaryContent[shop_index+20],binaryContent[shop_index+21])}")
+            #     print("----------")
+
+            # inventory_start = shop_start+shop_list_count*24
+            # print("Inventory Entries")
+            # for x in range(inventory_list_count):
+            #     inventory_index = inventory_start+x*8
+            #     print(f"---- Inventory Address: {inventory_index}")
+            #     print(f"---- Unlock event: {bytes_to_number(binaryContent[inventory_index],binaryContent[inventory_index+1])}")
+            #     print(f"---- Product Amount: {bytes_to_number(binaryContent[inventory_index+2],binaryContent[inventory_index+3])}")
+            #     print(f"---- Product Offset: {bytes_to_number(binaryContent[inventory_index+4],binaryContent[inventory_index+5])}")
+            #     print("----------")
+
+            # product_start = inventory_start+inventory_list_count*8
+            # print("Product Entries")
+            # for x in range(product_list_count):
+            #     product_index = product_start+x*2
+            #     print(f"---- Address {product_index}")
+            #     print(f"---- Product (Item Id):  {bytes_to_number(binaryContent[product_index],binaryContent[product_index+1])}")
+
+            # print("Valid Items")
+            # for x in range(63):
+            #     valid_index = valid_start+x*2
+            #     item_id = bytes_to_number(binaryContent[valid_index],binaryContent[valid_index+1])
+            #     if item_id!=0:
+            #         print(f"---- Valid Item (Item Id):  {item_id}")
 
     def create_synth_assets(self, mod: SeedModBuilder):
         if locationType.SYNTH in self.settings.disabledLocations:
@@ -1053,65 +1084,28 @@ class SeedZip:
             randomizer.assignments, [locationType.SYNTH]
         )
 
+        recipes_by_location = {}
+        for recipe in randomizer.synthesis_recipes:
+            recipes_by_location.setdefault(recipe.location, recipe)
+
         synth_items = []
         for assignment in assigned_synth:
             synth_items.append(
                 SynthLocation(
                     assignment.location.LocationId,
                     assignment.item.Id,
-                    [
-                        r
-                        for r in randomizer.synthesis_recipes
-                        if r.location == assignment.location
-                    ][0],
+                    recipes_by_location[assignment.location],
                 )
             )
 
-        with open(resource_path("static/synthesis.bin"), "rb") as recipes_bar:
-            modified_recipes_binary = bytearray(recipes_bar.read())
-            for synth_loc in synth_items:
-                starting_byte = synth_loc.get_starting_location()
-                data = synth_loc.get_bytes()
-
-                for i, item in enumerate(data):
-                    modified_recipes_binary[starting_byte + i] = 0xFF & item
-
-        with open(resource_path("static/synthesis_reqs.bin"), "rb") as requirements_bar:
-            modified_requirements_binary = bytearray(requirements_bar.read())
-
-            # uncomment to see some data about the synth lists
-            # index = 16
-            # while index + 12 < len(modified_requirements_binary):
-            #     print(SynthList(index, modified_requirements_binary[index:]))
-            #     index += 12
-
-            # 3/6 free dev 8,9 bytes from offset index
-            free_dev1 = number_to_bytes(3)
-            free_dev2 = number_to_bytes(6)
-            modified_requirements_binary[36] = free_dev1[0]
-            modified_requirements_binary[37] = free_dev1[1]
-            modified_requirements_binary[72] = free_dev2[0]
-            modified_requirements_binary[73] = free_dev2[1]
-
-            # 1,3 ori+ version,
-            # free_dev1 = number_to_bytes(1)
-            # free_dev2 = number_to_bytes(3)
-            # ori_plus_id = number_to_bytes(12) # not sure on this
-            # binaryContent[33] = ori_plus_id[0]
-            # binaryContent[35] = 0
-            # binaryContent[36] = free_dev1[0]
-            # binaryContent[37] = free_dev1[1]
-            # binaryContent[69] = ori_plus_id[0]
-            # binaryContent[71] = 0
-            # binaryContent[72] = free_dev2[0]
-            # binaryContent[73] = free_dev2[1]
-
-            # uncomment to make all existing synth buyable conditions need 7 of that material
-            # new_required_items = number_to_bytes(7)
-            # start_index=376
-            # for i in range(0,24):
-            #     binaryContent[start_index+i*12+8] = new_required_items[0]
-            #     binaryContent[start_index+i*12+9] = new_required_items[1]
+        modified_recipes_binary = bytearray(static_binary("synthesis.bin"))
+        for synth_loc in synth_items:
+            starting_byte = synth_loc.get_starting_location()
+            data = bytes(0xFF & item for item in synth_loc.get_bytes())
+            modified_recipes_binary[starting_byte : starting_byte + len(data)] = data
+
+        # The requirement changes are the same for every seed
+        modified_requirements_binary = parsed_static_binary("synthesis_reqs.bin", _modify_synth_requirements)
 
         mod.write_synth_assets(modified_recipes_binary, modified_requirements_binary)
 
@@ -1334,12 +1328,12 @@ class SeedZip:
             )
         )
 
+        stats_by_location = {}
+        for stat in randomizer.weapon_stats:
+            stats_by_location.setdefault(stat.location, stat)
+
         for weapon in weapons:
-            weapon_stats = next(
-                stat
-                for stat in randomizer.weapon_stats
-                if stat.location == weapon.location
-            )
+            weapon_stats = stats_by_location[weapon.location]
             mod.items.add_stats(
                 location_id=weapon.location.LocationId,
                 attack=weapon_stats.strength,
@@ -1377,27 +1371,28 @@ class SeedZip:
             locationCategory.MASTERLEVEL,
             locationCategory.FINALLEVEL,
         ]
+        form_exp_by_location: dict[KH2Location, FormExp] = {}
+        for exp in self.randomizer.form_level_exp:
+            form_exp_by_location.setdefault(exp.location, exp)
         for index, levelType in enumerate(form_category_list):
             levels = _assignment_subset(self.randomizer.assignments, [levelType])
             form_name = form_dict[index]
-            for level_number in range(1, 8):
-                for lvl in levels:
-                    if lvl.location.LocationId == level_number:
-                        form_exp = next(
-                            exp
-                            for exp in self.randomizer.form_level_exp
-                            if exp == lvl.location
-                        )
-                        mod.form_levels.add_form_level(
-                            form_name=form_name,
-                            form_id=index,
-                            form_level=lvl.location.LocationId,
-                            ability=lvl.item.Id
-                            if index != 0
-                            else 0,  # making summon junk items zero
-                            experience=form_exp.experience,
-                            growth_ability_level=0,
-                        )
+            levels = sorted(
+                (lvl for lvl in levels if 1 <= lvl.location.LocationId <= 7),
+                key=lambda lvl: lvl.location.LocationId
+            )
+            for lvl in levels:
+                form_exp = form_exp_by_location[lvl.location]
+                mod.form_levels.add_form_level(
+                    form_name=form_name,
+                    form_id=index,
+                    form_level=lvl.location.LocationId,
+                    ability=lvl.item.Id
+                    if index != 0
+                    else 0,  # making summon junk items zero
+                    experience=form_exp.experience,
+                    growth_ability_level=0,
+                )
 
     def assign_bonuses(self, mod: SeedModBuilder):
         self._assign_sora_bonuses(mod, self.randomizer.assignments)
@@ -1510,12 +1505,12 @@ class SeedZip:
         level_checks = settings.max_level_checks
 
         # get the triple of items for each level
+        level_items: dict[int, int] = {}
+        for lvup in levels:
+            level_items[lvup.location.LocationId] = lvup.item.Id
         items_for_sword_level = {}
         offsets = DreamWeaponOffsets()
         for sword_level in range(1, 100):
-            sword_item = 0
-            shield_item = 0
-            staff_item = 0
             shield_level = (
                 offsets.get_item_lookup_for_shield(level_checks, sword_level)
                 if settings.split_levels
@@ -1526,19 +1521,16 @@ class SeedZip:
                 if settings.split_levels
                 else sword_level
             )
-            for lvup in levels:
-                if lvup.location.LocationId == sword_level:
-                    sword_item = lvup.item.Id
-                if lvup.location.LocationId == shield_level:
-                    shield_item = lvup.item.Id
-                if lvup.location.LocationId == staff_level:
-                    staff_item = lvup.item.Id
+            sword_item = level_items.get(sword_level, 0)
+            shield_item = level_items.get(shield_level, 0)
+            staff_item = level_items.get(staff_level, 0)
             items_for_sword_level[sword_level] = (sword_item, shield_item, staff_item)
 
+        stats_by_location: dict[KH2Location, LevelStats] = {}
+        for lv in self.randomizer.level_stats:
+            stats_by_location.setdefault(lv.location, lv)
         for lvup in levels:
-            level_stats = next(
-                lv for lv in self.randomizer.level_stats if lv.location == lvup.location
-            )
+            level_stats = stats_by_location[lvup.location]
             level = lvup.location.LocationId
             item_id = items_for_sword_level[level]
             mod.level_ups.add_sora_level(
@@ -1949,15 +1941,16 @@ class CosmeticsOnlyZip:
     def __init__(self, ui_settings: SeedSettings):
         self.settings = ui_settings
 
-    def create_zip(self) -> io.BytesIO:
-        data = io.BytesIO()
-        with ZipFile(data, "w", ZIP_DEFLATED) as out_zip:
+    def create_zip(self, output: Optional[ZipOutput] = None) -> ZipData:
+        if output is None:
+            output = MemoryZipOutput()
+        with output as zip_stream, AssetZipFile(zip_stream, "w", ZIP_DEFLATED) as out_zip:
             mod = ModYml(
                 "Randomized Cosmetics",
                 description="Generated by the KH2 Randomizer Seed Generator.",
             )
 
-            _add_cosmetics(out_zip=out_zip, mod_yml=mod, settings=self.settings)
+            _add_cosmetics(out_zip=out_zip, mod_yml=mod, settings=self.settings, rng=random.Random())
 
             mod.write_to_zip_file(out_zip)
 
@@ -1965,8 +1958,7 @@ class CosmeticsOnlyZip:
                 resource_path("static/icons/misc/Kingdom Hearts II.png"), "icon.png"
             )
 
-        data.seek(0)
-        return data
+        return output.result()
 
 
 class BossEnemyOnlyZip:
@@ -1975,7 +1967,7 @@ class BossEnemyOnlyZip:
         self.enemy_options = makeKHBRSettings(seed_name, self.settings)
         self.platform = platform
 
-    def create_zip(self) -> io.BytesIO:
+    def create_zip(self, output: Optional[ZipOutput] = None) -> ZipData:
         def _should_run_khbr():
             if not self.enemy_options.get("boss", False) in [False, "Disabled"]:
                 return True
@@ -1988,8 +1980,9 @@ class BossEnemyOnlyZip:
                 "Trying to generate boss/enemy only mod without enabling those settings."
             )
 
-        data = io.BytesIO()
-        with ZipFile(data, "w", ZIP_DEFLATED) as out_zip:
+        if output is None:
+            output = MemoryZipOutput()
+        with output as zip_stream, AssetZipFile(zip_stream, "w", ZIP_DEFLATED) as out_zip:
             mod = ModYml(
                 "Randomized Bosses/Enemies",
                 description="Generated by the KH2 Randomizer Seed Generator.",
@@ -2006,5 +1999,4 @@ class BossEnemyOnlyZip:
             )
             out_zip.writestr("enemyspoilers.txt", enemy_spoilers)
 
-            data.seek(0)
-            return data
+        return output.result()
@@ -1,4 +1,4 @@
-import io
+import shutil
 import subprocess
 from pathlib import Path
 from typing import Optional
@@ -12,6 +12,7 @@ from Module import appconfig
 from Module.RandomizerSettings import RandomizerSettings
 from Module.cosmeticsmods.keyblade import KeybladeRandomizer
 from Module.generate import generateSeed, generateMultiWorldSeed
+from Module.zipoutput import FileZipOutput, ZipData, temporary_file_output
 from Module.zipper import BossEnemyOnlyZip, CosmeticsOnlyZip, SeedZipResult
 
 
@@ -33,6 +34,50 @@ def _wrap_in_last_seed_folder_if_possible(
     return output_file_name
 
 
+def _save_zip(zip_data: ZipData, outfile_name: str):
+    if isinstance(zip_data, Path):
+        # Generated straight to a temporary file, so it only needs moving into place
+        shutil.move(zip_data, outfile_name)
+    else:
+        with open(outfile_name, "wb") as out_zip:
+            out_zip.write(zip_data.getbuffer())
+
+
+def _discard_zip(zip_data: ZipData):
+    if isinstance(zip_data, Path):
+        zip_data.unlink(missing_ok=True)
+
+
+class _TemporaryZipThread(QThread):
+    """
+    Thread that generates zips into temporary files. Until a result is handed over, the files are its own to throw away
+    if generating fails or is cancelled.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.temporary_outputs: list[FileZipOutput] = []
+
+    def _temporary_output(self) -> FileZipOutput:
+        output = temporary_file_output()
+        self.temporary_outputs.append(output)
+        return output
+
+    def _hand_over_outputs(self):
+        """Called before emitting a result, after which whoever handles the result is responsible for the files."""
+        self.temporary_outputs = []
+
+    def discard_outputs(self):
+        for output in self.temporary_outputs:
+            output.discard()
+        self.temporary_outputs = []
+
+    def cancel(self):
+        self.terminate()
+        self.wait()
+        self.discard_outputs()
+
+
 def _download_seed(parent: QWidget, seed_zip_result: SeedZipResult):
     zip_file, _, _ = seed_zip_result
 
@@ -50,10 +95,11 @@ def _download_seed(parent: QWidget, seed_zip_result: SeedZipResult):
     if outfile_name != "":
         if not outfile_name.endswith(".zip"):
             outfile_name += ".zip"
-        with open(outfile_name, "wb") as out_zip:
-            out_zip.write(zip_file.getbuffer())
+        _save_zip(zip_file, outfile_name)
 
         last_seed_folder_txt.write_text(str(Path(outfile_name).parent))
+    else:
+        _discard_zip(zip_file)
 
 def _emu_warnings(rando_settings: RandomizerSettings,extra_data: ExtraConfigurationData):
     if not extra_data.disable_emu_warning and rando_settings.keyblades_unlock_chests and extra_data.platform=="PCSX2":
@@ -68,7 +114,7 @@ A tutorial to do so can be found here: <a href="LINK_HERE" style="color: {theme.
         message.setWindowTitle("KH2 Seed Generator")
         message.exec()
 
-class GenerateSeedThread(QThread):
+class GenerateSeedThread(_TemporaryZipThread):
     finished = Signal(object)
     failed = Signal(Exception)
 
@@ -82,12 +128,14 @@ class GenerateSeedThread(QThread):
     def run(self):
         try:
             extra_data = self.extra_data
-            seed_zip_result = generateSeed(self.rando_settings, extra_data)
+            seed_zip_result = generateSeed(self.rando_settings, extra_data, output=self._temporary_output())
 
             _run_custom_cosmetics_executables(extra_data)
 
+            self._hand_over_outputs()
             self.finished.emit(seed_zip_result)
         except Exception as e:
+            self.discard_outputs()
             self.failed.emit(e)
 
 
@@ -118,7 +166,7 @@ class GenerateSeedWorker:
         self.thread = GenerateSeedThread(rando_settings, self.extra_data)
         self.thread.finished.connect(self._handle_result)
         self.thread.failed.connect(self._handle_failure)
-        self.progress.canceled.connect(lambda: self.thread.terminate())
+        self.progress.canceled.connect(lambda: self.thread.cancel())
         self.thread.start()
 
     def _handle_result(self, seed_zip_result: SeedZipResult):
@@ -147,7 +195,7 @@ class GenerateSeedWorker:
             raise failure
 
 
-class GenerateMultiWorldSeedThread(QThread):
+class GenerateMultiWorldSeedThread(_TemporaryZipThread):
     finished = Signal(object)
     failed = Signal(Exception)
 
@@ -163,12 +211,17 @@ class GenerateMultiWorldSeedThread(QThread):
     def run(self):
         try:
             extra_data = self.extra_data
-            all_output = generateMultiWorldSeed(self.rando_settings, extra_data)
+            all_output = generateMultiWorldSeed(
+                self.rando_settings, extra_data, make_output=self._temporary_output
+            )
 
             _run_custom_cosmetics_executables(extra_data)
 
+            self._hand_over_outputs()
             self.finished.emit(all_output)
         except Exception as e:
+            # Includes the zips of any players written before the one that failed
+            self.discard_outputs()
             self.failed.emit(e)
 
 
@@ -199,7 +252,7 @@ class GenerateMultiWorldSeedWorker:
         self.thread = GenerateMultiWorldSeedThread(rando_settings, self.extra_data)
         self.thread.finished.connect(self._handle_result)
         self.thread.failed.connect(self._handle_failure)
-        self.progress.canceled.connect(lambda: self.thread.terminate())
+        self.progress.canceled.connect(lambda: self.thread.cancel())
         self.thread.start()
 
     def _handle_result(self, seed_zip_result: SeedZipResult):
@@ -229,7 +282,7 @@ class GenerateMultiWorldSeedWorker:
             raise failure
 
 
-class GenerateCosmeticsZipThread(QThread):
+class GenerateCosmeticsZipThread(_TemporaryZipThread):
     finished = Signal(object)
     failed = Signal(Exception)
 
@@ -242,12 +295,14 @@ class GenerateCosmeticsZipThread(QThread):
         try:
             extra_data = self.extra_data
             zipper = CosmeticsOnlyZip(self.ui_settings)
-            zip_file = zipper.create_zip()
+            zip_file = zipper.create_zip(self._temporary_output())
 
             _run_custom_cosmetics_executables(extra_data)
 
+            self._hand_over_outputs()
             self.finished.emit(zip_file)
         except Exception as e:
+            self.discard_outputs()
             self.failed.emit(e)
 
 
@@ -275,10 +330,10 @@ class CosmeticsZipWorker:
         self.thread = GenerateCosmeticsZipThread(self.ui_settings, self.extra_data)
         self.thread.finished.connect(self._handle_result)
         self.thread.failed.connect(self._handle_failure)
-        self.progress.canceled.connect(lambda: self.thread.terminate())
+        self.progress.canceled.connect(lambda: self.thread.cancel())
         self.thread.start()
 
-    def _handle_result(self, zip_file: io.BytesIO):
+    def _handle_result(self, zip_file: ZipData):
         self.progress.close()
         self.progress = None
         self._download_zip(zip_file)
@@ -296,7 +351,7 @@ class CosmeticsZipWorker:
 
         self.thread = None
 
-    def _download_zip(self, zip_file: io.BytesIO):
+    def _download_zip(self, zip_file: ZipData):
         last_seed_folder_txt = appconfig.auto_save_folder() / "last_seed_folder.txt"
         output_file_name = _wrap_in_last_seed_folder_if_possible(
             last_seed_folder_txt, "randomized-cosmetics.zip"
@@ -311,11 +366,12 @@ class CosmeticsZipWorker:
         if outfile_name != "":
             if not outfile_name.endswith(".zip"):
                 outfile_name += ".zip"
-            with open(outfile_name, "wb") as out_zip:
-                out_zip.write(zip_file.getbuffer())
+            _save_zip(zip_file, outfile_name)
+        else:
+            _discard_zip(zip_file)
 
 
-class GenerateBossEnemyZipThread(QThread):
+class GenerateBossEnemyZipThread(_TemporaryZipThread):
     finished = Signal(object)
     failed = Signal(Exception)
 
@@ -329,9 +385,11 @@ class GenerateBossEnemyZipThread(QThread):
         try:
             platform = self.platform
             zipper = BossEnemyOnlyZip(self.seed_name, self.ui_settings, platform)
-            zip_file = zipper.create_zip()
+            zip_file = zipper.create_zip(self._temporary_output())
+            self._hand_over_outputs()
             self.finished.emit(zip_file)
         except Exception as e:
+            self.discard_outputs()
             self.failed.emit(e)
 
 
@@ -359,10 +417,10 @@ class BossEnemyZipWorker:
         )
         self.thread.finished.connect(self._handle_result)
         self.thread.failed.connect(self._handle_failure)
-        self.progress.canceled.connect(lambda: self.thread.terminate())
+        self.progress.canceled.connect(lambda: self.thread.cancel())
         self.thread.start()
 
-    def _handle_result(self, zip_file: io.BytesIO):
+    def _handle_result(self, zip_file: ZipData):
         self.progress.close()
         self.progress = None
         self._download_zip(zip_file)
@@ -380,7 +438,7 @@ class BossEnemyZipWorker:
 
         self.thread = None
 
-    def _download_zip(self, zip_file: io.BytesIO):
+    def _download_zip(self, zip_file: ZipData):
         last_seed_folder_txt = appconfig.auto_save_folder() / "last_seed_folder.txt"
         output_file_name = _wrap_in_last_seed_folder_if_possible(
             last_seed_folder_txt, "randomized-bosses-enemies.zip"
@@ -395,8 +453,9 @@ class BossEnemyZipWorker:
         if outfile_name != "":
             if not outfile_name.endswith(".zip"):
                 outfile_name += ".zip"
-            with open(outfile_name, "wb") as out_zip:
-                out_zip.write(zip_file.getbuffer())
+            _save_zip(zip_file, outfile_name)
+        else:
+            _discard_zip(zip_file)
 
 
 class ExtractVanillaKeybladesThread(QThread):
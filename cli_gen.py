@@ -1,13 +1,18 @@
+import argparse
 import json
 import os
 import random
 import string
+import sys
+import threading
 from collections import namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, TextIO
 
 from Class.seedSettings import ExtraConfigurationData, SeedSettings
 from Module import appconfig
 from Module.RandomizerSettings import RandomizerSettings
-from Module.generate import generateSeedCLI
+from Module.generate import generateSeedSpoiler
 from Module.seedshare import SharedSeed
 from Module.version import LOCAL_UI_VERSION
 
@@ -15,7 +20,11 @@ SeedInfo = namedtuple("SeedInfo",["seed_name","requested_preset","generator_stri
 
 requested_preset = "League Spring 2024"
 
-def make_random_seed_from_preset_name(requested_type:str):
+# Parsed preset settings, kept for the lifetime of the process when running as a server
+_preset_settings: dict[str, SeedSettings] = {}
+
+
+def load_presets() -> dict[str, dict[str, Any]]:
     preset_json = {}
     for preset_file_name in os.listdir(appconfig.PRESET_FOLDER):
         preset_name, extension = os.path.splitext(preset_file_name)
@@ -25,40 +34,134 @@ def make_random_seed_from_preset_name(requested_type:str):
                     settings_json = json.load(presetData)
                     preset_json[preset_name] = settings_json
                 except Exception:
-                    print('Unable to load preset [{}], skipping'.format(preset_file_name))
+                    print('Unable to load preset [{}], skipping'.format(preset_file_name), file=sys.stderr)
+    return preset_json
 
-    # get seed name at random
+
+def _random_seed_name() -> str:
     characters = string.ascii_letters + string.digits
-    seedString = (''.join(random.choice(characters) for i in range(30)))
+    return ''.join(random.choice(characters) for i in range(30))
+
+
+def make_seed(
+        settings: SeedSettings,
+        requested_type: str,
+        seed_name: str,
+        parallel_attempts: int = 1
+) -> SeedInfo:
     makeSpoilerLog = False
-    settings = SeedSettings()
-    settings.apply_settings_json(preset_json[requested_type])
 
     shared_seed = SharedSeed(
         generator_version=LOCAL_UI_VERSION,
-        seed_name=seedString,
+        seed_name=seed_name,
         spoiler_log=makeSpoilerLog,
         settings_string=settings.settings_string(),
         tourney_gen=True
     )
     shared_string_text = shared_seed.to_share_string()
 
-    rando_settings = RandomizerSettings(seedString,makeSpoilerLog,LOCAL_UI_VERSION,settings,shared_string_text)
+    rando_settings = RandomizerSettings(seed_name,makeSpoilerLog,LOCAL_UI_VERSION,settings,shared_string_text)
 
     extra_data = ExtraConfigurationData(platform="PC", tourney=True, custom_cosmetics_executables=[])
 
-    spoiler_log = generateSeedCLI(rando_settings, extra_data)
+    seed_spoiler = generateSeedSpoiler(rando_settings, extra_data, parallel_attempts)
+    if parallel_attempts > 1:
+        # A later attempt may have won, in which case the share string has been rebuilt with its seed name
+        seed_name = seed_spoiler.seed_name
 
     return SeedInfo(
-        seed_name=seedString,
+        seed_name=seed_name,
         requested_preset=requested_type,
-        generator_string=shared_string_text,
-        hash_icons=rando_settings.seedHashIcons,
-        spoiler_html=spoiler_log
+        generator_string=seed_spoiler.share_string,
+        hash_icons=seed_spoiler.hash_icons,
+        spoiler_html=seed_spoiler.spoiler_html
     )
 
 
+def make_random_seed_from_preset_name(requested_type:str, parallel_attempts: int = 1):
+    preset_json = load_presets()
+
+    # get seed name at random
+    seedString = _random_seed_name()
+    settings = SeedSettings()
+    settings.apply_settings_json(preset_json[requested_type])
+
+    return make_seed(settings, requested_type, seedString, parallel_attempts)
+
+
+def _init_server_worker():
+    """Loads and parses every preset once when a server worker process starts."""
+    # Generation logs progress with print, which would otherwise end up mixed into the results stream
+    sys.stdout = sys.stderr
+    # Forked workers start with identical random state, which would hand out the same random seed names
+    random.seed()
+    for preset_name, settings_json in load_presets().items():
+        settings = SeedSettings()
+        settings.apply_settings_json(settings_json)
+        _preset_settings[preset_name] = settings
+
+
+def _run_server_job(job: dict[str, Any], parallel_attempts: int) -> dict[str, Any]:
+    preset_name = job["preset"]
+    settings = _preset_settings.get(preset_name)
+    if settings is None:
+        raise ValueError(f"Unknown preset [{preset_name}]")
+    seed_name = job.get("seed_name") or _random_seed_name()
+    return make_seed(settings, preset_name, seed_name, parallel_attempts)._asdict()
+
+
+def serve(input_stream: TextIO, output_stream: TextIO, workers: int = 1, parallel_attempts: int = 1):
+    """
+    Reads one JSON job per line from the input, e.g. {"preset": "League Spring 2024", "seed_name": "abc"}, and writes
+    one JSON result per line to the output as each seed finishes. The seed name is optional. Any "id" in the job is
+    echoed back so results can be matched to jobs, since they may complete out of order. Failed jobs produce a line
+    with an "error" instead of the seed info. With parallel_attempts, a result's seed name can differ from the job's
+    when a later attempt won; its generator string and hash icons are always those of the seed name in the result.
+    """
+    output_lock = threading.Lock()
+
+    def write_result(result: dict[str, Any]):
+        with output_lock:
+            output_stream.write(json.dumps(result) + "\n")
+            output_stream.flush()
+
+    def on_done(job_id: Any, future: Future):
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+        if job_id is not None:
+            result["id"] = job_id
+        write_result(result)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_server_worker) as executor:
+        for line in input_stream:
+            line = line.strip()
+            if line == "":
+                continue
+            try:
+                job = json.loads(line)
+                if not isinstance(job, dict) or "preset" not in job:
+                    raise ValueError("Job must be an object with a preset")
+            except ValueError as e:
+                write_result({"error": f"Invalid job: {e}"})
+                continue
+            future = executor.submit(_run_server_job, job, parallel_attempts)
+            future.add_done_callback(lambda f, job_id=job.get("id"): on_done(job_id, f))
+
+
 if __name__ == '__main__':
-    seed_info = make_random_seed_from_preset_name(requested_preset)
-    print(seed_info.generator_string)
-    print(seed_info.hash_icons)
+    parser = argparse.ArgumentParser(description="Generates seeds from presets without the UI.")
+    parser.add_argument(
+        "--serve", action="store_true", help="Read JSON-lines jobs from stdin and stream results to stdout"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes used by --serve")
+    parser.add_argument("--parallel-attempts", type=int, default=1, help="Seed attempts to race per generated seed")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(sys.stdin, sys.stdout, workers=args.workers, parallel_attempts=args.parallel_attempts)
+    else:
+        seed_info = make_random_seed_from_preset_name(requested_preset, args.parallel_attempts)
+        print(seed_info.generator_string)
+        print(seed_info.hash_icons)
@@ -1,5 +1,6 @@
 import datetime
 import json
+import multiprocessing
 import os
 import random
 import re
@@ -286,6 +287,7 @@ class KH2RandomizerApp(QMainWindow):
         
         app_config = appconfig.read_app_config()
         self.disable_emu_warnings = "disable_emu_warnings" in app_config
+        self.spoiler_data_file = "spoiler_data_file" in app_config
 
         self.settings = SeedSettings()
         self.custom_cosmetics = CustomCosmetics()
@@ -436,6 +438,9 @@ class KH2RandomizerApp(QMainWindow):
         self.emu_warning_toggle = self.config_menu.addAction('Disable Emulator Warnings')
         self.emu_warning_toggle.setCheckable(True)
         self.emu_warning_toggle.setChecked(self.disable_emu_warnings)
+        self.spoiler_data_file_toggle = self.config_menu.addAction('Separate Spoiler Log Data File')
+        self.spoiler_data_file_toggle.setCheckable(True)
+        self.spoiler_data_file_toggle.setChecked(self.spoiler_data_file)
         self.config_menu.addSeparator()
         self.config_menu.addAction('LuaBackend Hook Setup (PC Only)', self.show_luabackend_configuration)
 
@@ -569,6 +574,10 @@ class KH2RandomizerApp(QMainWindow):
             appconfig.update_app_config('disable_emu_warnings', True)
         else:
             appconfig.remove_app_config('disable_emu_warnings')
+        if self.spoiler_data_file_toggle.isChecked():
+            appconfig.update_app_config('spoiler_data_file', True)
+        else:
+            appconfig.remove_app_config('spoiler_data_file')
 
         e.accept()
 
@@ -732,7 +741,7 @@ class KH2RandomizerApp(QMainWindow):
         if self.recalculate:
             try:
                 rando_settings = self.make_rando_settings()
-                dummy_rando = Randomizer(rando_settings, progress_bar_vis=True)
+                counts = Randomizer.placement_counts(rando_settings)
                 split_pc_emu = False
                 split_pc_emu = split_pc_emu or self.settings.get(settingkey.CUPS_GIVE_XP)
                 split_pc_emu = split_pc_emu or self.settings.get(settingkey.REMOVE_DAMAGE_CAP)
@@ -764,15 +773,15 @@ class KH2RandomizerApp(QMainWindow):
             except CantAssignItemException as e:
                 pass
             
-            self.num_items_to_place = dummy_rando.num_available_items
-            self.num_locations_to_fill = dummy_rando.num_valid_locations
-            text = f"Items: {dummy_rando.num_available_items} / Locations: {dummy_rando.num_valid_locations}"
-            self.progress_bar.setRange(0, dummy_rando.num_valid_locations)
-            if dummy_rando.num_valid_locations < dummy_rando.num_available_items:
-                self.progress_bar.setValue(dummy_rando.num_valid_locations)
+            self.num_items_to_place = counts.num_available_items
+            self.num_locations_to_fill = counts.num_valid_locations
+            text = f"Items: {counts.num_available_items} / Locations: {counts.num_valid_locations}"
+            self.progress_bar.setRange(0, counts.num_valid_locations)
+            if counts.num_valid_locations < counts.num_available_items:
+                self.progress_bar.setValue(counts.num_valid_locations)
                 text = "Too many "+text
             else:
-                self.progress_bar.setValue(dummy_rando.num_available_items)
+                self.progress_bar.setValue(counts.num_available_items)
             self.progress_label.setText(text)
 
     def makeSeed(self,platform):
@@ -790,6 +799,7 @@ class KH2RandomizerApp(QMainWindow):
                 tourney=False,
                 custom_cosmetics_executables=self.custom_cosmetics.collect_custom_executable_files(),
                 disable_emu_warning=self.disable_emu_warnings,
+                spoiler_data_file=self.spoiler_data_file_toggle.isChecked(),
             )
 
             rando_settings = self.make_rando_settings()
@@ -1067,6 +1077,8 @@ class KH2RandomizerApp(QMainWindow):
 
 
 if __name__ == "__main__":
+    # Texture recoloring runs in worker processes, which need this to start up from the packaged executable
+    multiprocessing.freeze_support()
     app = QApplication([])
 
     QtGui.QFontDatabase.addApplicationFont(resource_path('static/KHMenu.otf'))
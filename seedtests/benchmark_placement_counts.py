@@ -0,0 +1,36 @@
+import timeit
+
+from Class import settingkey
+from Class.seedSettings import SeedSettings
+from List.configDict import SoraLevelOption
+from Module.RandomizerSettings import RandomizerSettings
+from Module.newRandomize import Randomizer
+
+ITERATIONS = 50
+
+
+def main():
+    """
+    Times counting items and locations for the settings UI, cycling through a few settings the way dragging a slider
+    or toggling an option would.
+    """
+    all_settings = []
+    for level_option in [SoraLevelOption.LEVEL_50, SoraLevelOption.LEVEL_99]:
+        for statsanity in [True, False]:
+            seed_settings = SeedSettings()
+            seed_settings.set(settingkey.SORA_LEVELS, level_option)
+            seed_settings.set(settingkey.STATSANITY, statsanity)
+            all_settings.append(RandomizerSettings("benchmark", True, "version", seed_settings, ""))
+
+    def count_all():
+        for settings in all_settings:
+            Randomizer.placement_counts(settings)
+
+    count_all()  # build and cache the location graphs first, as they are once the UI is open
+    elapsed = timeit.timeit(count_all, number=ITERATIONS)
+    per_count_ms = elapsed / (ITERATIONS * len(all_settings)) * 1000
+    print(f"Randomizer.placement_counts: {per_count_ms:.2f} ms per call")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+import random
+import timeit
+
+import numpy as np
+
+from Module.cosmeticsmods.texture import RecolorDefinition, TextureConditionsLoader, TextureRecolorizer, \
+    recolor_image
+
+ITERATIONS = 3
+DEFAULT_IMAGE_SIZE = 512
+
+
+def main():
+    """
+    Times recolor_image for each recolor in the recolor templates. The game textures aren't part of the project, so
+    each recolor is run against random pixels, sized to fit the masks of its colorable areas where it has any.
+    """
+    rng = random.Random(21)
+    conditions_loader = TextureConditionsLoader()
+    total_ms = 0.0
+    total_pixels = 0
+    for model in TextureRecolorizer.load_recolorable_models():
+        model_id = model["id"]
+        for recolor in model["recolors"]:
+            recolor_definitions: list[RecolorDefinition] = []
+            image_shape = (DEFAULT_IMAGE_SIZE, DEFAULT_IMAGE_SIZE)
+            for colorable_area in recolor["colorable_areas"]:
+                conditions = conditions_loader.conditions_from_colorable_area(
+                    model_id=model_id, area_id=colorable_area["id"], colorable_area=colorable_area
+                )
+                for mask in conditions.masks:
+                    if mask is not None:
+                        image_shape = (min(image_shape[0], mask.shape[0]), min(image_shape[1], mask.shape[1]))
+                recolor_definitions.append(RecolorDefinition(
+                    conditions=conditions,
+                    new_hue=rng.randint(0, 359),
+                    new_saturation=colorable_area.get("new_saturation"),
+                    value_offset=colorable_area.get("value_offset"),
+                ))
+            if len(recolor_definitions) == 0:
+                continue
+
+            np_rng = np.random.default_rng(rng.randint(0, 2 ** 32))
+            image = np_rng.integers(0, 256, size=(image_shape[0], image_shape[1], 4), dtype="uint8")
+            recolor_ms = timeit.timeit(lambda: recolor_image(image, recolor_definitions, 0), number=ITERATIONS)
+            recolor_ms = recolor_ms / ITERATIONS * 1000
+            total_ms += recolor_ms
+            total_pixels += image_shape[0] * image_shape[1]
+            name = f"{model_id} ({len(recolor_definitions)} areas, {image_shape[1]}x{image_shape[0]})"
+            print(f"{name:60} {recolor_ms:8.2f} ms")
+
+    print(f"{'total':60} {total_ms:8.2f} ms ({total_pixels / 1000 / max(total_ms, 1e-9):.2f} Mpx/s)")
+
+
+if __name__ == '__main__':
+    main()
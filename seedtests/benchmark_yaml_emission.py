@@ -0,0 +1,50 @@
+import timeit
+import zipfile
+
+import yaml
+
+from Class import settingkey
+from Class.openkhmod import dump_yaml
+from Class.seedSettings import SeedSettings, ExtraConfigurationData
+from Module.RandomizerSettings import RandomizerSettings
+from Module.generate import generateSeed
+
+ITERATIONS = 10
+
+
+def main():
+    """
+    Times writing each of the YAML files in a seed zip (the listpatch lists, messages and mod.yml) with the pure Python
+    emitter and with dump_yaml, and checks that both give the same output.
+    """
+    seed_settings = SeedSettings()
+    seed_settings.set(settingkey.CHESTS_MATCH_ITEM, True)
+    settings = RandomizerSettings("benchmark", True, "version", seed_settings, "")
+    zip_data, _, _ = generateSeed(settings, ExtraConfigurationData("PC", False, []))
+
+    with zipfile.ZipFile(zip_data) as seed_zip:
+        yaml_files = {
+            name: yaml.safe_load(seed_zip.read(name))
+            for name in seed_zip.namelist()
+            if name.endswith(".yml") and "/chest/" not in name
+        }
+
+    total_pure_ms = 0.0
+    total_dump_ms = 0.0
+    for name, data in yaml_files.items():
+        pure = yaml.dump(data, line_break="\r\n", sort_keys=False)
+        if pure != dump_yaml(data, sort_keys=False):
+            raise AssertionError(f"dump_yaml output differs for {name}")
+
+        pure_ms = timeit.timeit(lambda: yaml.dump(data, line_break="\r\n", sort_keys=False), number=ITERATIONS)
+        pure_ms = pure_ms / ITERATIONS * 1000
+        dump_ms = timeit.timeit(lambda: dump_yaml(data, sort_keys=False), number=ITERATIONS) / ITERATIONS * 1000
+        total_pure_ms += pure_ms
+        total_dump_ms += dump_ms
+        print(f"{name:50} {pure_ms:8.2f} ms -> {dump_ms:8.2f} ms")
+
+    print(f"{'per seed':50} {total_pure_ms:8.2f} ms -> {total_dump_ms:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from Class import settingkey
@@ -6,7 +7,7 @@ from List.NewLocationList import Locations
 from List.configDict import itemBias, itemDifficulty, itemRarity, itemType
 from List.location import hundredacrewood as haw, soralevel
 from Module.RandomizerSettings import RandomizerSettings
-from Module.weighting import LocationWeights
+from Module.weighting import LocationSampler, LocationWeights
 
 
 class Tests(unittest.TestCase):
@@ -244,6 +245,29 @@ class Tests(unittest.TestCase):
         self.assertEqual(max_weight, reverse_weights.get_weight(itemType.FORM, level_50))
         self.assertEqual(max_weight, both_weights.get_weight(itemType.FORM, level_50))
 
+    def test_sampler_matches_random_choices(self):
+        seed_settings = SeedSettings()
+        seed_settings.set(settingkey.WEIGHTED_FORMS, itemBias.VERY_LATE)
+        seed_settings.set(settingkey.SOFTLOCK_CHECKING, 'both')
+        seed_settings.set(settingkey.AS_DATA_SPLIT, True)
+        settings = RandomizerSettings("test_name", True, "version", seed_settings, "")
+        locations = Locations(settings, secondary_graph=False)
+        weights = LocationWeights(settings, locations, Locations(settings, secondary_graph=True))
+
+        remaining = locations.all_locations()
+        sampler = LocationSampler(weights, remaining)
+        sampler_rng = random.Random("sampler")
+        choices_rng = random.Random("sampler")
+        item_types = [itemType.FORM, itemType.FIRE, itemType.REPORT]
+        for index in range(len(remaining) - 1):
+            item_type = item_types[index % len(item_types)]
+            expected = choices_rng.choices(remaining, [weights.get_weight(item_type, loc) for loc in remaining])[0]
+            picked = sampler.pick(sampler.cumulative_weights(item_type), sampler_rng)
+            self.assertIs(expected, picked)
+            remaining.remove(picked)
+            sampler.remove(picked)
+            self.assertEqual(remaining, sampler.remaining_locations())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,17 @@
+import copy
+import hashlib
+import pickle
+import random
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
+from Class import settingkey
 from Class.seedSettings import SeedSettings
-from Module.newRandomize import RandomizerSettings, Randomizer
+from List.ItemList import Items
+from List.NewLocationList import Locations
+from List.configDict import SoraLevelOption
+from List.inventory import form
+from Module.newRandomize import RandomizerSettings, Randomizer, ItemAssignments
 
 
 class Tests(unittest.TestCase):
@@ -30,6 +40,126 @@ class Tests(unittest.TestCase):
         self.assertEqual(173, num_str_increase + num_mag_increase + num_def_increase + num_ap_increase)
         self.assertEqual(42, len(randomizer.form_level_exp))
 
+    def test_golden_seed(self):
+        """ Same seed name and settings must keep producing exactly the same seed. """
+        settings = RandomizerSettings("golden_seed", True, "version", SeedSettings(), "")
+        randomizer = Randomizer(settings)
+
+        rows = [(a.location.name(), a.item.Id, a.item2.Id if a.item2 else None) for a in randomizer.assignments]
+        self.assertEqual(
+            "ed8917ceef09d7802ca3f7671401d5a4422d28bd3873483b4e702bac7112eff5",
+            hashlib.sha256(repr(rows).encode()).hexdigest()
+        )
+        self.assertEqual(
+            ["ai-mode-moderate", "rank-a", "ai-settings", "item-key", "gumi-brush", "exclamation-mark", "weapon-shield"],
+            settings.seedHashIcons
+        )
+
+    def test_randomizer_uses_own_random_stream(self):
+        def assignments(seed_name: str) -> list[tuple[str, str]]:
+            settings = RandomizerSettings(seed_name, True, "version", SeedSettings(), "")
+            randomizer = Randomizer(settings)
+            return [(a.location.name(), str(a.item)) for a in randomizer.assignments]
+
+        expected = [assignments("seed_a"), assignments("seed_b")]
+
+        global_state = random.getstate()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            actual = list(executor.map(assignments, ["seed_a", "seed_b"]))
+        self.assertEqual(expected, actual)
+        self.assertEqual(global_state, random.getstate())
+
+    def test_location_graphs_are_shared(self):
+        settings = RandomizerSettings("seed_a", True, "version", SeedSettings(), "")
+        other_settings = RandomizerSettings("seed_b", True, "version", SeedSettings(), "")
+        regular = Locations.cached(settings, secondary_graph=False)
+        self.assertIs(regular, Locations.cached(other_settings, secondary_graph=False))
+        self.assertIsNot(regular, Locations.cached(settings, secondary_graph=True))
+
+        level_settings = SeedSettings()
+        level_settings.set(settingkey.SORA_LEVELS, SoraLevelOption.LEVEL_99)
+        level_settings = RandomizerSettings("seed_a", True, "version", level_settings, "")
+        self.assertIsNot(regular, Locations.cached(level_settings, secondary_graph=False))
+
+        # Randomizing must not leave anything behind in the shared graph
+        invalid_checks = {location: list(location.InvalidChecks) for location in regular.all_locations()}
+        first = Randomizer(settings)
+        self.assertIs(regular, first.regular_locations)
+        self.assertEqual(invalid_checks, {location: location.InvalidChecks for location in regular.all_locations()})
+
+        again = Randomizer(RandomizerSettings("seed_a", True, "version", SeedSettings(), ""))
+        self.assertEqual(
+            [(a.location.name(), str(a.item)) for a in first.assignments],
+            [(a.location.name(), str(a.item)) for a in again.assignments]
+        )
+
+    def test_placement_counts_match_randomizer(self):
+        vanilla_settings = SeedSettings()
+        worlds, _ = vanilla_settings.get(settingkey.WORLDS_WITH_REWARDS)
+        vanilla_settings.set(settingkey.WORLDS_WITH_REWARDS, [worlds[4:], worlds[:4]])
+        no_statsanity_settings = SeedSettings()
+        no_statsanity_settings.set(settingkey.STATSANITY, False)
+
+        for seed_settings in [SeedSettings(), vanilla_settings, no_statsanity_settings]:
+            counts = Randomizer.placement_counts(RandomizerSettings("seed_a", True, "version", seed_settings, ""))
+            randomizer = Randomizer(RandomizerSettings("seed_a", True, "version", seed_settings, ""))
+            self.assertEqual(randomizer.num_available_items, counts.num_available_items)
+            self.assertEqual(randomizer.num_valid_locations, counts.num_valid_locations)
+
+    def test_assignment_indexes(self):
+        randomizer = Randomizer(RandomizerSettings("seed_a", True, "version", SeedSettings(), ""))
+        assignments = randomizer.assignments
+        for assignment in assignments:
+            self.assertIs(assignment, assignments.for_location(assignment.location))
+            self.assertIs(assignment, randomizer.assignment_for_location(assignment.location.name()))
+            first_with_item = next(a for a in assignments if a.item.Id == assignment.item.Id)
+            self.assertIs(first_with_item, randomizer.assignment_for_item_id(assignment.item.Id))
+            self.assertIs(first_with_item, randomizer.assignment_for_item(assignment.item.item))
+
+        valor_assignment = randomizer.assignment_for_item(form.ValorForm)
+        dummy_valor = next(item for item in Items.getDummyFormItems() if item.Name == form.ValorForm.name)
+        assignments.set_item(valor_assignment, dummy_valor)
+        self.assertIsNone(randomizer.assignment_for_item(form.ValorForm))
+        self.assertIs(valor_assignment, randomizer.assignment_for_item_id(dummy_valor.Id))
+
+    def test_assignment_indexes_follow_changes(self):
+        randomizer = Randomizer(RandomizerSettings("seed_a", True, "version", SeedSettings(), ""))
+
+        def assert_indexed(assignments: ItemAssignments):
+            for index, assignment in enumerate(assignments):
+                first = next(a for a in assignments if a.location == assignment.location)
+                self.assertIs(first, assignments.for_location(assignment.location))
+                self.assertIs(first, assignments.for_location_name(assignment.location.name()))
+                first_with_item = next(a for a in assignments if a.item.Id == assignment.item.Id)
+                self.assertIs(first_with_item, assignments.for_item_id(assignment.item.Id))
+            self.assertEqual(len({a.location for a in assignments}), len(assignments._by_location))
+
+        original = randomizer.assignments
+        copies = [original.copy(), copy.copy(original), original[:], copy.deepcopy(original)]
+        copies.append(pickle.loads(pickle.dumps(original)))
+        for assignments in copies:
+            self.assertIsInstance(assignments, ItemAssignments)
+            self.assertEqual([a.location for a in original], [a.location for a in assignments])
+            assert_indexed(assignments)
+
+        # Changing a copy leaves the original (and its indexes) alone
+        changed = original.copy()
+        removed = changed.pop(0)
+        self.assertIsNone(changed.for_location(removed.location))
+        self.assertIs(removed, original.for_location(removed.location))
+
+        changed.insert(3, removed)
+        changed.reverse()
+        changed.sort(key=lambda a: a.location.name())
+        del changed[5:10]
+        changed[0] = original[-1]
+        changed += original[20:25]
+        changed.remove(original[21])
+        assert_indexed(changed)
+        changed.clear()
+        self.assertEqual(0, len(changed))
+        self.assertIsNone(changed.for_location(removed.location))
+
 
 if __name__ == '__main__':
     unittest.main()
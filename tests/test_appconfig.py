@@ -0,0 +1,28 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from Module import appconfig
+
+
+class Tests(unittest.TestCase):
+
+    def test_atomic_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "folder" / "file.txt"
+            with appconfig.AtomicFile(path, "w", encoding="utf-8") as file:
+                file.write("written")
+                # Nothing is in place until writing has finished
+                self.assertFalse(path.exists())
+            self.assertEqual("written", path.read_text(encoding="utf-8"))
+
+            with self.assertRaises(RuntimeError):
+                with appconfig.AtomicFile(path, "w", encoding="utf-8") as file:
+                    file.write("partial")
+                    raise RuntimeError("writing failed")
+            self.assertEqual("written", path.read_text(encoding="utf-8"))
+            self.assertEqual([path], list(path.parent.iterdir()))
+
+
+if __name__ == '__main__':
+    unittest.main()
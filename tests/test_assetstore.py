@@ -0,0 +1,70 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from zipfile import ZipFile, ZIP_DEFLATED
+
+from Module import appconfig
+from Module import assetstore
+from Module.assetstore import AssetZipFile
+from Module.resources import resource_path
+
+
+def _zip_with(zip_class, file_paths: list[str]) -> bytes:
+    data = io.BytesIO()
+    with zip_class(data, "w", ZIP_DEFLATED) as out_zip:
+        out_zip.writestr("before.txt", "written before")
+        for index, file_path in enumerate(file_paths):
+            out_zip.write(file_path, f"files/{index}")
+        out_zip.writestr("after.txt", "written after")
+    return data.getvalue()
+
+
+class Tests(unittest.TestCase):
+
+    def test_matches_regular_zip(self):
+        file_paths = [
+            resource_path("static/KHMenu.otf"),
+            resource_path("static/disable_cor_skip.script"),
+            resource_path("static/KHMenu.otf"),
+        ]
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.object(appconfig, "CACHE_FOLDER", cache_dir):
+            expected = _zip_with(ZipFile, file_paths)
+            # Once while compressing, once from the store
+            self.assertEqual(expected, _zip_with(AssetZipFile, file_paths))
+            self.assertEqual(expected, _zip_with(AssetZipFile, file_paths))
+
+        with ZipFile(io.BytesIO(expected)) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+
+    def test_damaged_cache_compressed_again(self):
+        file_paths = [resource_path("static/KHMenu.otf")]
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.object(appconfig, "CACHE_FOLDER", cache_dir):
+            expected = _zip_with(ZipFile, file_paths)
+            with mock.patch.object(assetstore, "_store", assetstore.DeflatedAssetStore()):
+                self.assertEqual(expected, _zip_with(AssetZipFile, file_paths))
+
+            deflated_folder = os.path.join(cache_dir, "deflated")
+            cache_path = os.path.join(deflated_folder, os.listdir(deflated_folder)[0])
+            with open(cache_path, "rb") as cache_file:
+                cached = cache_file.read()
+            for damaged in [b"", cached[:len(cached) // 2], cached + b"extra", b"not deflated at all"]:
+                with open(cache_path, "wb") as cache_file:
+                    cache_file.write(damaged)
+                with mock.patch.object(assetstore, "_store", assetstore.DeflatedAssetStore()):
+                    self.assertEqual(expected, _zip_with(AssetZipFile, file_paths))
+                with open(cache_path, "rb") as cache_file:
+                    self.assertEqual(cached, cache_file.read())
+
+    def test_falls_back_without_zip_file_internals(self):
+        file_paths = [resource_path("static/KHMenu.otf")]
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.object(appconfig, "CACHE_FOLDER", cache_dir):
+            expected = _zip_with(ZipFile, file_paths)
+            with mock.patch.object(assetstore, "_ZIP_FILE_INTERNALS", ["_missing_internal"]):
+                self.assertEqual(expected, _zip_with(AssetZipFile, file_paths))
+            self.assertFalse(os.path.isdir(os.path.join(cache_dir, "deflated")))
+
+
+if __name__ == '__main__':
+    unittest.main()
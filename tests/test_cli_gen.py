@@ -0,0 +1,81 @@
+import io
+import json
+import unittest
+
+from Class.seedSettings import SeedSettings
+from Module.seedshare import SharedSeed
+from Module.version import LOCAL_UI_VERSION
+from cli_gen import load_presets, make_seed, serve
+
+# Seed name whose first generation attempt fails with the StarterSettings preset
+_FIRST_ATTEMPT_FAILS = "probe3"
+
+
+def _preset_settings(preset_name: str) -> SeedSettings:
+    settings = SeedSettings()
+    settings.apply_settings_json(load_presets()[preset_name])
+    return settings
+
+
+class Tests(unittest.TestCase):
+
+    def test_serve_streams_results(self):
+        jobs = [
+            {"id": 1, "preset": "StarterSettings", "seed_name": "server_seed"},
+            {"id": 2, "preset": "Not A Preset"},
+        ]
+        input_stream = io.StringIO("\n".join(json.dumps(job) for job in jobs) + "\nnot json\n")
+        output_stream = io.StringIO()
+        serve(input_stream, output_stream, workers=2)
+
+        results = [json.loads(line) for line in output_stream.getvalue().splitlines()]
+        self.assertEqual(3, len(results))
+        results_by_id = {result.get("id"): result for result in results}
+
+        self.assertEqual("server_seed", results_by_id[1]["seed_name"])
+        self.assertEqual("StarterSettings", results_by_id[1]["requested_preset"])
+        self.assertEqual(7, len(results_by_id[1]["hash_icons"]))
+        self.assertIn("error", results_by_id[2])
+        self.assertIn("error", results_by_id[None])
+
+    def test_parallel_spoiler_matches_sequential(self):
+        seed_infos = []
+        for parallel_attempts in [1, 2]:
+            settings = _preset_settings("StarterSettings")
+            seed_infos.append(make_seed(settings, "StarterSettings", "parallel_seed", parallel_attempts))
+
+        sequential, parallel = seed_infos
+        self.assertEqual(sequential, parallel)
+        self.assertIn("<html", sequential.spoiler_html)
+
+    def test_parallel_seed_reproducible_when_first_attempt_fails(self):
+        sequential = make_seed(_preset_settings("StarterSettings"), "StarterSettings", _FIRST_ATTEMPT_FAILS)
+        self.assertEqual(_FIRST_ATTEMPT_FAILS, sequential.seed_name)
+
+        parallel = make_seed(_preset_settings("StarterSettings"), "StarterSettings", _FIRST_ATTEMPT_FAILS, 2)
+        self.assertNotEqual(_FIRST_ATTEMPT_FAILS, parallel.seed_name)
+        self.assertNotEqual(sequential.hash_icons, parallel.hash_icons)
+
+        # Making the seed from what its share string holds gives exactly the same seed
+        shared_seed = SharedSeed.from_share_string(LOCAL_UI_VERSION, parallel.generator_string)
+        self.assertEqual(parallel.seed_name, shared_seed.seed_name)
+        settings = _preset_settings("StarterSettings")
+        self.assertEqual(settings.settings_string(), shared_seed.settings_string)
+        self.assertEqual(parallel, make_seed(settings, "StarterSettings", shared_seed.seed_name))
+
+    def test_serve_parallel_seed_reproducible(self):
+        job = {"id": 1, "preset": "StarterSettings", "seed_name": _FIRST_ATTEMPT_FAILS}
+        output_stream = io.StringIO()
+        serve(io.StringIO(json.dumps(job) + "\n"), output_stream, parallel_attempts=2)
+        result = json.loads(output_stream.getvalue())
+
+        shared_seed = SharedSeed.from_share_string(LOCAL_UI_VERSION, result["generator_string"])
+        self.assertEqual(result["seed_name"], shared_seed.seed_name)
+        again = make_seed(_preset_settings("StarterSettings"), "StarterSettings", shared_seed.seed_name)
+        self.assertEqual(again.generator_string, result["generator_string"])
+        self.assertEqual(again.hash_icons, result["hash_icons"])
+        self.assertEqual(again.spoiler_html, result["spoiler_html"])
+
+
+if __name__ == '__main__':
+    unittest.main()
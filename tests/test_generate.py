@@ -0,0 +1,81 @@
+import tempfile
+import time
+import unittest
+from functools import partial
+from pathlib import Path
+
+from Class.exceptions import GeneratorException
+from Class.seedSettings import SeedSettings, ExtraConfigurationData
+from Module.RandomizerSettings import RandomizerSettings
+from Module.generate import generateSeedSpoiler, _candidate_seed_name, _select_seed_attempt_in_parallel
+from Module.seedshare import SharedSeed
+
+# Seed name whose first generation attempt fails with the default settings
+_FIRST_ATTEMPT_FAILS = "bravo"
+
+
+def _fake_attempt(settings: RandomizerSettings, attempt: int, marker_folder: str, winning_attempt: int):
+    (Path(marker_folder) / str(attempt)).touch()
+    if attempt == winning_attempt:
+        return attempt
+    elif attempt < winning_attempt:
+        return GeneratorException(f"attempt {attempt} failed")
+    else:
+        # Later attempts would take a long time, so they have to be stopped rather than waited for
+        time.sleep(60)
+        return attempt
+
+
+def _share_string(seed_name: str) -> str:
+    return SharedSeed("version", seed_name, True, SeedSettings().settings_string()).to_share_string()
+
+
+def _settings_from_share_string(share_string: str) -> RandomizerSettings:
+    """Makes the settings for a seed from its share string, the way the generator does when one is loaded."""
+    shared_seed = SharedSeed.from_share_string("version", share_string)
+    ui_settings = SeedSettings()
+    ui_settings.apply_settings_string(shared_seed.settings_string)
+    return RandomizerSettings(shared_seed.seed_name, shared_seed.spoiler_log, "version", ui_settings, share_string)
+
+
+class Tests(unittest.TestCase):
+
+    def test_parallel_attempts_bounded_and_stopped(self):
+        settings = RandomizerSettings("base_seed", True, "version", SeedSettings(), "")
+        with tempfile.TemporaryDirectory() as marker_folder:
+            start = time.perf_counter()
+            result = _select_seed_attempt_in_parallel(
+                settings, 2, partial(_fake_attempt, marker_folder=marker_folder, winning_attempt=3)
+            )
+            self.assertLess(time.perf_counter() - start, 30)
+            self.assertEqual(3, result)
+            self.assertEqual(_candidate_seed_name("base_seed", 3), settings.random_seed)
+            # At most the winner and one attempt after it ever get started
+            started = sorted(int(path.name) for path in Path(marker_folder).iterdir())
+            self.assertEqual([0, 1, 2, 3], started[:4])
+            self.assertLessEqual(len(started), 5)
+
+    def test_parallel_seed_when_first_attempt_fails(self):
+        extra_data = ExtraConfigurationData("PC", True, [])
+
+        sequential = generateSeedSpoiler(_settings_from_share_string(_share_string(_FIRST_ATTEMPT_FAILS)), extra_data)
+        self.assertNotEqual(_FIRST_ATTEMPT_FAILS, sequential.seed_name)
+
+        parallel = generateSeedSpoiler(
+            _settings_from_share_string(_share_string(_FIRST_ATTEMPT_FAILS)), extra_data, parallel_attempts=2
+        )
+        # Parallel attempts use their own candidate names, so the seed differs from the sequential one...
+        candidate_names = [_candidate_seed_name(_FIRST_ATTEMPT_FAILS, attempt) for attempt in range(1, 10)]
+        self.assertIn(parallel.seed_name, candidate_names)
+        self.assertNotEqual(sequential.seed_name, parallel.seed_name)
+        self.assertNotEqual(sequential.hash_icons, parallel.hash_icons)
+        self.assertEqual(_share_string(parallel.seed_name), parallel.share_string)
+
+        # ...but loading its share string makes exactly the same seed, with or without parallel attempts
+        for parallel_attempts in [1, 2]:
+            again = generateSeedSpoiler(_settings_from_share_string(parallel.share_string), extra_data, parallel_attempts)
+            self.assertEqual(parallel, again)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from Class.inventory import Inventory
+from List.inventory import magic, misc, storyunlock
+from Module.itemPlacementRestriction import ItemPlacementHelpers
+
+
+class Tests(unittest.TestCase):
+
+    def test_membership_and_count(self):
+        inventory = Inventory([magic.Fire.id, magic.Magnet.id, magic.Magnet.id])
+        self.assertIn(magic.Fire.id, inventory)
+        self.assertNotIn(magic.Blizzard.id, inventory)
+        self.assertEqual(2, inventory.count(magic.Magnet.id))
+        self.assertEqual(0, inventory.count(magic.Thunder.id))
+        self.assertEqual(3, len(inventory))
+
+    def test_large_item_id(self):
+        inventory = Inventory()
+        self.assertNotIn(5000, inventory)
+        self.assertEqual(0, inventory.count(5000))
+        inventory.append(5000)
+        self.assertIn(5000, inventory)
+        self.assertEqual(1, inventory.count(5000))
+
+    def test_add_does_not_modify_original(self):
+        inventory = Inventory([misc.TornPages.id])
+        combined = inventory + [misc.TornPages.id, misc.TornPages.id]
+        self.assertEqual(1, inventory.count(misc.TornPages.id))
+        self.assertEqual(3, combined.count(misc.TornPages.id))
+
+        merged = Inventory([magic.Fire.id])
+        merged.extend(combined)
+        self.assertEqual(4, len(merged))
+        self.assertEqual(sorted([magic.Fire.id] + [misc.TornPages.id] * 3), sorted(merged))
+
+    def test_matches_list_for_requirements(self):
+        item_ids = [storyunlock.IceCream.id, storyunlock.IceCream.id, magic.Magnet.id, misc.TornPages.id]
+        inventory = Inventory(item_ids)
+        checks = [
+            ItemPlacementHelpers.tt2_check,
+            ItemPlacementHelpers.tt3_check,
+            ItemPlacementHelpers.need_1_magnet,
+            ItemPlacementHelpers.need_2_magnet,
+            ItemPlacementHelpers.need_torn_pages(1),
+            ItemPlacementHelpers.make_level_group_check(1),
+        ]
+        for check in checks:
+            self.assertEqual(check(item_ids), check(inventory))
+
+
+if __name__ == '__main__':
+    unittest.main()
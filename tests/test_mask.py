@@ -0,0 +1,96 @@
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from Module import appconfig
+from Module.cosmeticsmods import mask
+from Module.cosmeticsmods.image import rgb_to_mask
+from Module.cosmeticsmods.mask import decode_mask, load_mask
+from Module.resources import resource_path
+
+
+def _decode_mask_per_character(mask_text: bytes) -> np.ndarray:
+    """The original character-by-character decode, kept as the reference for the vectorized one."""
+    lines = mask_text.decode().splitlines(keepends=True)
+    y_dimension_str, x_dimension_str = lines[0].split(",")
+    y_dimension = int(y_dimension_str)
+    x_dimension = int(x_dimension_str)
+    result = np.zeros((y_dimension, x_dimension), dtype="bool")
+    for y in range(y_dimension):
+        line = lines[y + 1]
+        for x in range(x_dimension):
+            if line[x] != ' ':
+                result[y, x] = True
+    return result
+
+
+def _mask_files() -> list[Path]:
+    return sorted(Path(resource_path("static/recolors/masks")).rglob("*.mask"))
+
+
+class Tests(unittest.TestCase):
+
+    def test_decode_matches_per_character_decode(self):
+        for mask_file_path in _mask_files()[:4]:
+            with gzip.open(mask_file_path) as mask_file:
+                mask_text = mask_file.read()
+            np.testing.assert_array_equal(_decode_mask_per_character(mask_text), decode_mask(mask_text))
+
+    def test_decode_windows_line_endings(self):
+        mask_text = b"3,4\n1  1\n    \n 11 \n"
+        expected = _decode_mask_per_character(mask_text)
+        np.testing.assert_array_equal(expected, decode_mask(mask_text))
+        np.testing.assert_array_equal(expected, decode_mask(mask_text.replace(b"\n", b"\r\n")))
+        with self.assertRaises(ValueError):
+            decode_mask(b"3,4\n1  1\n  \n 11 \n")
+
+    def test_load_mask_uses_packed_cache(self):
+        mask_file_path = _mask_files()[0]
+        with gzip.open(mask_file_path) as mask_file:
+            expected = decode_mask(mask_file.read())
+
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.object(appconfig, "CACHE_FOLDER", cache_dir), \
+                mock.patch.object(mask, "_masks", mask.OrderedDict()):
+            loaded = load_mask(mask_file_path)
+            np.testing.assert_array_equal(expected, loaded)
+            self.assertFalse(loaded.flags.writeable)
+            self.assertIs(loaded, load_mask(mask_file_path))
+            self.assertEqual(1, len(list((Path(cache_dir) / "texture-masks").glob("*.npz"))))
+
+            # Loading again once it's gone from memory reads the packed copy instead of decoding the text again
+            mask._masks.clear()
+            with mock.patch.object(mask, "decode_mask", side_effect=AssertionError("decoded again")):
+                np.testing.assert_array_equal(expected, load_mask(mask_file_path))
+
+    def test_load_mask_replaces_damaged_cache(self):
+        mask_file_path = _mask_files()[0]
+        with gzip.open(mask_file_path) as mask_file:
+            expected = decode_mask(mask_file.read())
+
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.object(appconfig, "CACHE_FOLDER", cache_dir), \
+                mock.patch.object(mask, "_masks", mask.OrderedDict()):
+            load_mask(mask_file_path)
+            cache_path = next((Path(cache_dir) / "texture-masks").glob("*.npz"))
+            packed = cache_path.read_bytes()
+            for damaged in [b"", packed[:len(packed) // 2], b"PK\x03\x04 not really a zip"]:
+                cache_path.write_bytes(damaged)
+                mask._masks.clear()
+                np.testing.assert_array_equal(expected, load_mask(mask_file_path))
+                # Written again in place of the damaged file
+                np.testing.assert_array_equal(expected, mask._read_packed_mask(cache_path))
+
+    def test_rgb_to_mask(self):
+        rgb = np.random.default_rng(23).integers(0, 3, size=(16, 12, 4), dtype="uint8")
+        expected = np.zeros((16, 12), dtype="bool")
+        for y in range(16):
+            for x in range(12):
+                expected[y, x] = rgb[y, x, 0] > 0 and rgb[y, x, 1] == 0 and rgb[y, x, 2] == 0
+        np.testing.assert_array_equal(expected, rgb_to_mask(rgb))
+
+
+if __name__ == '__main__':
+    unittest.main()
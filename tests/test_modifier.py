@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from List.ItemList import Items
@@ -32,15 +33,16 @@ class Tests(unittest.TestCase):
     def test_default_ability_pool(self):
         all_action = Items.getActionAbilityList()
         all_support = Items.getSupportAbilityList() + Items.getKeybladeAbilityList() + Items.getLevelAbilityList()
-        pool = SeedModifier.default_ability_pool(action=all_action, support=all_support)
+        pool = SeedModifier.default_ability_pool(action=all_action, support=all_support, rng=random.Random())
         self.assertCountEqual(all_action + all_support, pool)
 
     def test_random_ability_pool(self):
         all_action = Items.getActionAbilityList()
         all_support = Items.getSupportAbilityList() + Items.getKeybladeAbilityList() + Items.getLevelAbilityList()
+        rng = random.Random()
         for _ in range(1000):
             pool = SeedModifier.random_ability_pool(
-                action=all_action, support=all_support
+                action=all_action, support=all_support, rng=rng
             )
             self.assertEqual(len(pool), len(all_action) + len(all_support))
             second_chance = next(
@@ -53,9 +55,10 @@ class Tests(unittest.TestCase):
     def test_random_support_ability_pool(self):
         all_action = Items.getActionAbilityList()
         all_support = Items.getSupportAbilityList() + Items.getKeybladeAbilityList() + Items.getLevelAbilityList()
+        rng = random.Random()
         for _ in range(1000):
             pool = SeedModifier.random_support_ability_pool(
-                action=all_action, support=all_support
+                action=all_action, support=all_support, rng=rng
             )
             self.assertEqual(len(pool), len(all_action) + len(all_support))
             second_chance = next(
@@ -70,9 +73,10 @@ class Tests(unittest.TestCase):
     def test_random_stackable_ability_pool(self):
         all_action = Items.getActionAbilityList()
         all_support = Items.getSupportAbilityList() + Items.getKeybladeAbilityList() + Items.getLevelAbilityList()
+        rng = random.Random()
         for _ in range(1000):
             pool = SeedModifier.random_stackable_ability_pool(
-                action=all_action, support=all_support
+                action=all_action, support=all_support, rng=rng
             )
             self.assertEqual(len(pool), len(all_action) + len(all_support))
             second_chance = next(
@@ -159,7 +163,7 @@ class Tests(unittest.TestCase):
         self.assertCountEqual(expected_weights, weights)
 
     def test_movement_disabled(self):
-        growths = SeedModifier.starting_growth(StartingMovementOption.DISABLED)
+        growths = SeedModifier.starting_growth(StartingMovementOption.DISABLED, random.Random())
         self.assertEqual(0, len(growths))
 
     def test_movement_level_1(self):
@@ -170,7 +174,7 @@ class Tests(unittest.TestCase):
             Glide1,
             DodgeRoll1,
         ]
-        growths = SeedModifier.starting_growth(StartingMovementOption.LEVEL_1)
+        growths = SeedModifier.starting_growth(StartingMovementOption.LEVEL_1, random.Random())
         self.assertCountEqual(expected, growths)
 
     def test_movement_level_2(self):
@@ -186,7 +190,7 @@ class Tests(unittest.TestCase):
             DodgeRoll1,
             DodgeRoll2,
         ]
-        growths = SeedModifier.starting_growth(StartingMovementOption.LEVEL_2)
+        growths = SeedModifier.starting_growth(StartingMovementOption.LEVEL_2, random.Random())
         self.assertCountEqual(expected, growths)
 
     def test_movement_level_3(self):
@@ -207,7 +211,7 @@ class Tests(unittest.TestCase):
             DodgeRoll2,
             DodgeRoll3,
         ]
-        growths = SeedModifier.starting_growth(StartingMovementOption.LEVEL_3)
+        growths = SeedModifier.starting_growth(StartingMovementOption.LEVEL_3, random.Random())
         self.assertCountEqual(expected, growths)
 
     def test_movement_level_4(self):
@@ -233,17 +237,17 @@ class Tests(unittest.TestCase):
             DodgeRoll3,
             DodgeRollMax,
         ]
-        growths = SeedModifier.starting_growth(StartingMovementOption.LEVEL_4)
+        growths = SeedModifier.starting_growth(StartingMovementOption.LEVEL_4, random.Random())
         self.assertCountEqual(expected, growths)
 
     def test_random_3(self):
         for _ in range(1000):
-            growths = SeedModifier.starting_growth(StartingMovementOption.RANDOM_3)
+            growths = SeedModifier.starting_growth(StartingMovementOption.RANDOM_3, random.Random())
             self.assertEqual(3, len(growths))
 
     def test_random_5(self):
         for _ in range(1000):
-            growths = SeedModifier.starting_growth(StartingMovementOption.RANDOM_5)
+            growths = SeedModifier.starting_growth(StartingMovementOption.RANDOM_5, random.Random())
             self.assertEqual(5, len(growths))
 
 
@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from Module.cosmeticsmods.recolorcache import TextureRecolorCache, INDEX_FILE_NAME, ORPHAN_FILE_AGE_SECONDS, \
+    INDEX_LOCK_FILE_NAME, INDEX_LOCK_STALE_SECONDS, LEASES_FOLDER_NAME
+
+
+def _generate(folder: Path, sources: dict[str, Path], max_bytes: int) -> dict[str, tuple[Path, bool]]:
+    """Runs one generation's worth of cache lookups, writing any recolors that weren't cached yet."""
+    cache = TextureRecolorCache(folder)
+    results = {}
+    for recolor_name, source_path in sources.items():
+        entry_path, cached = cache.entry_path("model", recolor_name, source_path)
+        if not cached:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            entry_path.write_bytes(source_path.read_bytes() * 10)
+        results[recolor_name] = (entry_path, cached)
+    cache.finish(max_bytes)
+    return results
+
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.folder = Path(self.temp_dir.name) / "texture-recolors"
+        self.source = Path(self.temp_dir.name) / "texture.png"
+        self.source.write_bytes(b"source" * 100)
+
+    def _index(self) -> dict:
+        with open(self.folder / INDEX_FILE_NAME, encoding="utf-8") as index_file:
+            return json.load(index_file)
+
+    def test_hits_and_misses(self):
+        first = _generate(self.folder, {"model-a-0": self.source}, max_bytes=10_000)
+        entry_path, cached = first["model-a-0"]
+        self.assertFalse(cached)
+        second = _generate(self.folder, {"model-a-0": self.source}, max_bytes=10_000)
+        self.assertEqual((entry_path, True), second["model-a-0"])
+
+        index = self._index()
+        self.assertEqual(1, index["hits"])
+        self.assertEqual(1, index["misses"])
+        entry = index["entries"][entry_path.relative_to(self.folder).as_posix()]
+        self.assertEqual(1, entry["hits"])
+        self.assertEqual(entry_path.stat().st_size, entry["size"])
+
+    def test_changed_source_replaces_entry(self):
+        old_path, _ = _generate(self.folder, {"model-a-0": self.source}, max_bytes=10_000)["model-a-0"]
+        self.source.write_bytes(b"re-extracted" * 100)
+        new_path, cached = _generate(self.folder, {"model-a-0": self.source}, max_bytes=10_000)["model-a-0"]
+        self.assertFalse(cached)
+        self.assertNotEqual(old_path, new_path)
+        self.assertFalse(old_path.exists())
+        self.assertEqual([new_path.relative_to(self.folder).as_posix()], list(self._index()["entries"]))
+
+    def test_least_recently_used_evicted(self):
+        # Each recolor is 6000 bytes, so a budget of 13000 holds two of them
+        paths = {}
+        for name in ["model-a-0", "model-b-0", "model-a-0", "model-c-0"]:
+            paths[name] = _generate(self.folder, {name: self.source}, max_bytes=13_000)[name][0]
+            time.sleep(0.01)
+        self.assertEqual(
+            {"model-a-0": True, "model-b-0": False, "model-c-0": True},
+            {name: path.exists() for name, path in paths.items()}
+        )
+        self.assertEqual(2, len(self._index()["entries"]))
+
+    def test_current_seed_kept_over_budget(self):
+        earlier = _generate(self.folder, {"model-a-0": self.source}, max_bytes=0)
+        current = _generate(self.folder, {"model-b-0": self.source, "model-b-1": self.source}, max_bytes=0)
+        self.assertFalse(earlier["model-a-0"][0].exists())
+        self.assertTrue(all(path.exists() for path, _ in current.values()))
+
+    def test_old_orphan_files_removed(self):
+        _generate(self.folder, {"model-a-0": self.source}, max_bytes=10_000)
+        old_orphan = self.folder / "model" / "model-a-0-v-v.png"
+        new_orphan = self.folder / "model" / ".123-456-model-b-0.png"
+        old_orphan.write_bytes(b"old")
+        new_orphan.write_bytes(b"in progress")
+        old_time = time.time() - ORPHAN_FILE_AGE_SECONDS - 60
+        os.utime(old_orphan, (old_time, old_time))
+
+        _generate(self.folder, {"model-a-0": self.source}, max_bytes=10_000)
+        self.assertFalse(old_orphan.exists())
+        self.assertTrue(new_orphan.exists())
+
+    def test_running_generation_entries_kept(self):
+        earlier = _generate(self.folder, {"model-a-0": self.source, "model-a-1": self.source}, max_bytes=10_000)
+
+        # A generation that has looked up its recolors but not finished yet, while another one finishes
+        running = TextureRecolorCache(self.folder)
+        running_path, cached = running.entry_path("model", "model-a-0", self.source)
+        self.assertTrue(cached)
+        _generate(self.folder, {"model-b-0": self.source}, max_bytes=0)
+        self.assertTrue(running_path.exists())
+        self.assertFalse(earlier["model-a-1"][0].exists())
+
+        running.finish(max_bytes=0)
+        self.assertTrue(running_path.exists())
+        self.assertEqual([running_path.relative_to(self.folder).as_posix()], list(self._index()["entries"]))
+        self.assertEqual([], list((self.folder / LEASES_FOLDER_NAME).iterdir()))
+        self.assertFalse((self.folder / INDEX_LOCK_FILE_NAME).exists())
+
+    def test_stale_lease_and_lock_ignored(self):
+        first = _generate(self.folder, {"model-a-0": self.source}, max_bytes=10_000)
+
+        abandoned = TextureRecolorCache(self.folder)
+        abandoned.entry_path("model", "model-a-0", self.source)
+        lease_paths = list((self.folder / LEASES_FOLDER_NAME).iterdir())
+        self.assertEqual(1, len(lease_paths))
+        old_time = time.time() - ORPHAN_FILE_AGE_SECONDS - 60
+        os.utime(lease_paths[0], (old_time, old_time))
+
+        lock_path = self.folder / INDEX_LOCK_FILE_NAME
+        lock_path.touch()
+        old_time = time.time() - INDEX_LOCK_STALE_SECONDS - 60
+        os.utime(lock_path, (old_time, old_time))
+
+        _generate(self.folder, {"model-b-0": self.source}, max_bytes=0)
+        self.assertFalse(first["model-a-0"][0].exists())
+        self.assertFalse(lease_paths[0].exists())
+        self.assertFalse(lock_path.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
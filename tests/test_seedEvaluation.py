@@ -8,7 +8,7 @@ from List.inventory import storyunlock, misc, proof, form, magic
 from List.inventory.item import InventoryItem
 from List.location import landofdragons as lod, twilighttown as tt, hundredacrewood as haw, worldthatneverwas, \
     hollowbastion, agrabah as ag, disneycastle
-from Module.newRandomize import RandomizerSettings
+from Module.newRandomize import RandomizerSettings, Randomizer
 from Module.seedEvaluation import LocationInformedSeedValidator
 
 
@@ -225,6 +225,18 @@ class Tests(unittest.TestCase):
             haw.NodeId.StarryHill
         ])
 
+    def test_sphere_stats(self):
+        """ Verifies the per-sphere stats account for every location the validator collected. """
+        settings = RandomizerSettings("alpha", True, "version", SeedSettings(), "")
+        randomizer = Randomizer(settings)
+        validator = LocationInformedSeedValidator()
+        location_spheres = validator.validate_seed(settings, randomizer, verbose=False)
+
+        self.assertEqual(len(location_spheres), sum(stats.locations_collected for stats in validator.sphere_stats))
+        self.assertEqual(max(location_spheres.values()), validator.sphere_stats[-1].sphere)
+        for stats in validator.sphere_stats:
+            self.assertLessEqual(stats.requirement_lists_checked, len(validator.location_requirements))
+
     def _collect(self, item: InventoryItem):
         self.inventory.append(item.id)
 
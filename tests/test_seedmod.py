@@ -0,0 +1,108 @@
+import io
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from zipfile import ZipFile, ZIP_DEFLATED
+
+import yaml
+
+from Module import appconfig
+from Module.resources import resource_path
+from Module.seedmod import SeedModBuilder, _spawn_template
+
+_KHBR_CMD_LIST = [{"Id": 604, "Flags": 4294967295}]
+
+
+class Tests(unittest.TestCase):
+
+    def test_cmd_listpatches_merged_without_reopening(self):
+        data = io.BytesIO()
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.object(appconfig, "CACHE_FOLDER", cache_dir):
+            with ZipFile(data, "w", ZIP_DEFLATED) as out_zip:
+                mod = SeedModBuilder("Test Seed", out_zip)
+                mod.add_base_assets()
+                mod.write_cmd_list_modifications(modified_cmd_list_yml="disable_final_form.yml")
+
+                # Mimics what khbr does when it has command list changes of its own
+                khbr_files = {"files/root/cmd.list": yaml.dump(_KHBR_CMD_LIST)}
+                for name, text in khbr_files.items():
+                    out_zip.writestr(name, text)
+                mod.mod_yml.add_asset({
+                    "name": "03system.bin",
+                    "method": "binarc",
+                    "source": [{
+                        "name": "cmd",
+                        "type": "list",
+                        "method": "listpatch",
+                        "source": [{"name": "files/root/cmd.list", "type": "cmd"}],
+                    }],
+                })
+                mod.add_written_files(khbr_files)
+
+                mod.validate_and_write_mod_yml()
+
+        with ZipFile(data) as zip_file:
+            names = zip_file.namelist()
+            self.assertEqual(len(names), len(set(names)))
+            mod_yml = yaml.safe_load(zip_file.read("mod.yml"))
+            merged = yaml.safe_load(zip_file.read("randoseed-mod-files/cmd_list_merged.yml"))
+            with zip_file.open("randoseed-mod-files/disable_final_form.yml") as static_file:
+                static_cmd_list = yaml.safe_load(static_file)
+
+        self.assertEqual(static_cmd_list + _KHBR_CMD_LIST, merged)
+        system_assets = [asset for asset in mod_yml["assets"] if asset["name"] == "03system.bin"]
+        self.assertEqual(1, len(system_assets))
+        cmd_sources = [source for source in system_assets[0]["source"] if source["name"] == "cmd"]
+        self.assertEqual(1, len(cmd_sources))
+        self.assertEqual("randoseed-mod-files/cmd_list_merged.yml", cmd_sources[0]["source"][0]["name"])
+
+    def test_battle_assets_merged(self):
+        def _battle_asset(source_name: str) -> dict:
+            return {"name": "00battle.bin", "method": "binarc", "source": [{"name": source_name}]}
+
+        # With the first 00battle.bin asset as the very first asset in the mod, and further along
+        for with_base_assets in [False, True]:
+            data = io.BytesIO()
+            with tempfile.TemporaryDirectory() as cache_dir, mock.patch.object(appconfig, "CACHE_FOLDER", cache_dir):
+                with ZipFile(data, "w", ZIP_DEFLATED) as out_zip:
+                    mod = SeedModBuilder("Test Seed", out_zip)
+                    if with_base_assets:
+                        mod.add_base_assets()
+                    mod.mod_yml.add_assets([_battle_asset("fmlv"), _battle_asset("lvup"), _battle_asset("bons")])
+                    expected_sources = [
+                        source["name"]
+                        for asset in mod.mod_yml.data["assets"] if asset["name"] == "00battle.bin"
+                        for source in asset["source"]
+                    ]
+                    mod.validate_and_write_mod_yml()
+
+            with ZipFile(data) as zip_file:
+                mod_yml = yaml.safe_load(zip_file.read("mod.yml"))
+            battle_assets = [asset for asset in mod_yml["assets"] if asset["name"] == "00battle.bin"]
+            self.assertEqual(1, len(battle_assets), with_base_assets)
+            self.assertEqual(
+                expected_sources, [source["name"] for source in battle_assets[0]["source"]], with_base_assets
+            )
+
+    def test_spawn_templates_match_yaml_dump(self):
+        rng = random.Random(5)
+        spawn_folder = Path(resource_path("static/chests/ard"))
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.object(appconfig, "CACHE_FOLDER", cache_dir):
+            for spawn_path in sorted(spawn_folder.glob("*/*.spawn")):
+                spawn_file_path = spawn_path.relative_to(spawn_folder).with_suffix("").as_posix()
+                with open(spawn_path) as spawn_file:
+                    spawn_data = yaml.safe_load(spawn_file)
+
+                entities = spawn_data[0]["Entities"]
+                object_ids = {index: rng.randint(0, 2000) for index in range(len(entities)) if rng.random() < 0.5}
+                for index, object_id in object_ids.items():
+                    entities[index]["ObjectId"] = object_id
+
+                expected = yaml.dump(spawn_data, line_break="\r\n", sort_keys=False)
+                self.assertEqual(expected, _spawn_template(spawn_file_path).render(object_ids), spawn_file_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import json
+import unittest
+
+from Module.spoilerLog import (
+    SPOILER_LOG_DATA_FIELDS,
+    SPOILER_LOG_DATA_FILE,
+    SPOILER_LOG_TEXT_FIELDS,
+    spoiler_log_template,
+)
+
+
+def _values() -> tuple[dict[str, str], dict[str, str]]:
+    # Seed names can contain anything, including something that looks like a placeholder
+    text_values = {name: f"{{SEED_STRING}} {name}" for name in SPOILER_LOG_TEXT_FIELDS}
+    data_values = {name: json.dumps({"name": name, "item": "PromiseCharm"}) for name in SPOILER_LOG_DATA_FIELDS}
+    return text_values, data_values
+
+
+class Tests(unittest.TestCase):
+
+    def test_render(self):
+        text_values, data_values = _values()
+        html = spoiler_log_template().render(text_values, data_values)
+
+        for name in SPOILER_LOG_TEXT_FIELDS:
+            self.assertIn(f"{{SEED_STRING}} {name}", html)
+        for name in SPOILER_LOG_DATA_FIELDS:
+            self.assertIn(json.dumps({"name": name, "item": "Promise Charm"}), html)
+        self.assertNotIn("PromiseCharm", html)
+        self.assertNotIn("{SPOILER_DATA_SCRIPT}", html)
+        self.assertNotIn(SPOILER_LOG_DATA_FILE, html)
+
+    def test_render_with_data_file(self):
+        text_values, data_values = _values()
+        inline_html = spoiler_log_template().render(text_values, data_values)
+        html, data_script = spoiler_log_template().render_with_data_file(text_values, data_values)
+
+        self.assertIn(f'<script src="{SPOILER_LOG_DATA_FILE}"></script>', html)
+        self.assertTrue(data_script.startswith("spoiler_data = "))
+        spoiler_data = json.loads(data_script[len("spoiler_data = "):])
+        for name in SPOILER_LOG_DATA_FIELDS:
+            self.assertEqual({"name": name, "item": "Promise Charm"}, spoiler_data[name])
+            self.assertIn(f"spoiler_data.{name}", html)
+        # Everything after the data is the same page either way
+        self.assertEqual(inline_html.split("</script>", 1)[1], html.split("</script>", 2)[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import json
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+from Class import openkhmod
+from Module import appconfig
+from Module.resources import resource_path
+
+
+class Tests(unittest.TestCase):
+
+    def test_cached_list_matches_yaml(self):
+        with open(resource_path("static/LvupList.yml"), "r") as file:
+            expected = yaml.safe_load(file)
+
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.object(appconfig, "CACHE_FOLDER", cache_dir):
+            # First load parses the YAML and writes the cache, second load reads the cache
+            self.assertEqual(expected, openkhmod._load_static_list_from_cache("LvupList.yml"))
+            cache_path = Path(cache_dir) / "LvupList.yml.pickle"
+            self.assertTrue(cache_path.is_file())
+            self.assertEqual(expected, openkhmod._load_static_list_from_cache("LvupList.yml"))
+
+    def test_stale_cache_is_ignored(self):
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.object(appconfig, "CACHE_FOLDER", cache_dir):
+            cache_path = Path(cache_dir) / "LvupList.yml.pickle"
+            with open(cache_path, "wb") as cache_file:
+                pickle.dump(("not the content hash", {"Sora": {}}), cache_file)
+
+            data = openkhmod._load_static_list_from_cache("LvupList.yml")
+            self.assertIn("Donald", data)
+            with open(cache_path, "rb") as cache_file:
+                self.assertNotEqual("not the content hash", pickle.load(cache_file)[0])
+
+    def test_item_from_table(self):
+        with open(resource_path("static/full_items.json"), "r") as item_json:
+            expected = next(item for item in json.load(item_json)["Items"] if item["Id"] == 363)
+
+        items = openkhmod.Items("ItemList.yml")
+        items.add_item_from_table(363)
+        items.add_item_from_table(363, shop_buy=7)
+        self.assertEqual(expected, items.data["Items"][0])
+        self.assertEqual(dict(expected, ShopBuy=7), items.data["Items"][1])
+        # The shared table is left alone
+        self.assertEqual(expected, openkhmod.item_table()[363])
+
+    def test_dump_yaml_matches_pure_python(self):
+        with open(resource_path("static/LvupList.yml"), "r") as file:
+            level_ups = yaml.safe_load(file)
+        shared_entry = {"Id": 1, "Name": "Shared"}
+        for data in [
+            level_ups,
+            {"Items": [{"Id": 363, "ShopBuy": 7, "Ratio": 0.5, "Name": "{:icon key} It's \"quoted\" #1"}]},
+            [{"id": 17201, "en": "Beginner (WARNING)", "jp": "\u30d3\u30ae\u30ca\u30fc\u30e2\u30fc\u30c9 (\u6ce8\u610f!)"}],
+            [{"en": "tab\tand a long line that has to be wrapped " * 4}],
+            [shared_entry, shared_entry],
+        ]:
+            for sort_keys in [True, False]:
+                expected = yaml.dump(data, line_break="\r\n", sort_keys=sort_keys)
+                self.assertEqual(expected, openkhmod.dump_yaml(data, sort_keys=sort_keys))
+
+
+if __name__ == '__main__':
+    unittest.main()
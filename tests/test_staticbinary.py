@@ -0,0 +1,35 @@
+import unittest
+
+from Module.battleLevels import BtlvViewer
+from Module.resources import resource_path
+from Module.staticbinary import parsed_static_binary, static_binary
+from Module.zipper import _parse_drop_rates
+
+
+class Tests(unittest.TestCase):
+
+    def test_binary_read_once(self):
+        self.assertIs(static_binary("drops.bin"), static_binary("drops.bin"))
+        with open(resource_path("static/drops.bin"), "rb") as drops_bar:
+            self.assertEqual(drops_bar.read(), static_binary("drops.bin"))
+
+    def test_drop_rates_parse(self):
+        drops_binary = static_binary("drops.bin")
+        entries = parsed_static_binary("drops.bin", _parse_drop_rates)
+        self.assertIs(entries, parsed_static_binary("drops.bin", _parse_drop_rates))
+        for start_index, values in entries:
+            binary = drops_binary[start_index:start_index + 24]
+            self.assertEqual(binary[0] + (binary[1] << 8), values[0])
+            self.assertEqual(tuple(binary[2:11]), values[1:10])
+            expected_items = tuple(binary[i] + (binary[i + 1] << 8) for i in range(12, 24, 2))
+            self.assertEqual(expected_items, values[10:])
+
+    def test_battle_levels_not_shared(self):
+        btlv = BtlvViewer()
+        btlv.flags[2][2] = 99
+        self.assertNotEqual(99, BtlvViewer().flags[2][2])
+        self.assertEqual(static_binary(btlv.btlv_file), bytes(BtlvViewer().write_modifications()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+import os
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import yaml
+from PIL import Image
+from numpy import ndarray
+
+from Module.cosmeticsmods.image import rgb_to_hsv, hsv_to_rgb
+from Module.cosmeticsmods.texture import RecolorDefinition, TextureRecolorizer, TextureConditionsLoader, \
+    make_matching_conditions, recolor_image, PendingRecolor, TextureRecolorJob, run_texture_recolor_jobs, \
+    recolor_templates, RecolorTemplates, colorable_area_key
+from Module.resources import resource_path
+
+
+def _recolor_image_per_pixel(
+        rgb_array: ndarray,
+        recolor_definitions: list[RecolorDefinition],
+        group_index: int
+) -> ndarray:
+    """The original pixel-by-pixel recolor, kept as the reference for the vectorized one."""
+    hsv_array = rgb_to_hsv(rgb_array)
+    x_dimension, y_dimension, _ = hsv_array.shape
+    for x in range(x_dimension):
+        for y in range(y_dimension):
+            hue, saturation, value, alpha = hsv_array[x, y]
+            for recolor_definition in recolor_definitions:
+                if recolor_definition.conditions.matches(x, y, group_index, hue, saturation, value, alpha):
+                    hsv_array[x, y, 0] = recolor_definition.new_hue
+                    if recolor_definition.new_saturation is not None:
+                        hsv_array[x, y, 1] = recolor_definition.new_saturation
+                    hsv_array[x, y, 2] = hsv_array[x, y, 2] + recolor_definition.value_offset
+                    break
+    return hsv_to_rgb(hsv_array)
+
+
+def _random_image(rng: np.random.Generator, shape: tuple[int, int]) -> ndarray:
+    image = rng.integers(0, 256, size=(shape[0], shape[1], 4), dtype="uint8")
+    # Some grays, so that pixels without any saturation are covered too
+    image[::7, :, 1] = image[::7, :, 0]
+    image[::7, :, 2] = image[::7, :, 0]
+    return image
+
+
+class Tests(unittest.TestCase):
+
+    def test_matches_per_pixel_recolor(self):
+        rng = np.random.default_rng(21)
+        shape = (37, 29)
+        mask: Optional[ndarray] = rng.random(shape) < 0.3
+        recolor_definitions = [
+            RecolorDefinition(
+                make_matching_conditions([None, mask], hue_range=(330, 30), saturation_range=None, value_range=None),
+                new_hue=120,
+                value_offset=-10,
+            ),
+            RecolorDefinition(
+                make_matching_conditions([], hue_range=None, saturation_range=(20, 60), value_range=(10, 80)),
+                new_hue=240,
+                new_saturation=50,
+            ),
+            RecolorDefinition(
+                make_matching_conditions([mask], hue_range=(60, 200), saturation_range=None, value_range=None),
+                new_hue=300,
+                new_saturation=100,
+                value_offset=25,
+            ),
+            RecolorDefinition(make_matching_conditions([], None, None, None), new_hue=60),
+        ]
+
+        for group_index in range(3):
+            image = _random_image(rng, shape)
+            expected = _recolor_image_per_pixel(image, recolor_definitions, group_index)
+            np.testing.assert_array_equal(expected, recolor_image(image, recolor_definitions, group_index))
+
+    def test_matches_per_pixel_recolor_for_templates(self):
+        rng = np.random.default_rng(22)
+        conditions_loader = TextureConditionsLoader()
+        for model in TextureRecolorizer.load_recolorable_models()[:10]:
+            for recolor in model["recolors"]:
+                recolor_definitions = []
+                for colorable_area in recolor["colorable_areas"]:
+                    if "mask_files" in colorable_area:
+                        continue
+                    conditions = conditions_loader.conditions_from_colorable_area(
+                        model_id=model["id"], area_id=colorable_area["id"], colorable_area=colorable_area
+                    )
+                    recolor_definitions.append(RecolorDefinition(
+                        conditions=conditions,
+                        new_hue=int(rng.integers(0, 360)),
+                        new_saturation=colorable_area.get("new_saturation"),
+                        value_offset=colorable_area.get("value_offset"),
+                    ))
+                if len(recolor_definitions) == 0:
+                    continue
+                image = _random_image(rng, (24, 24))
+                expected = _recolor_image_per_pixel(image, recolor_definitions, 0)
+                np.testing.assert_array_equal(expected, recolor_image(image, recolor_definitions, 0), model["id"])
+
+    def test_recolor_jobs_match_in_worker_processes(self):
+        rng = np.random.default_rng(23)
+        colorable_areas = [
+            {"id": "Red", "hue_start": 330, "hue_end": 30},
+            {"id": "Gray", "saturation_start": 0, "saturation_end": 20, "new_saturation": 40, "value_offset": 10},
+        ]
+        pending_recolors = [
+            PendingRecolor("test", area["id"], area, new_hue=int(rng.integers(0, 360)),
+                           new_saturation=area.get("new_saturation"), value_offset=area.get("value_offset"))
+            for area in colorable_areas
+        ]
+        conditions_loader = TextureConditionsLoader()
+        recolor_definitions = [
+            RecolorDefinition(
+                conditions_loader.conditions_from_colorable_area("test", pending.area_id, pending.colorable_area),
+                pending.new_hue,
+                pending.new_saturation,
+                pending.value_offset
+            )
+            for pending in pending_recolors
+        ]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            images = {}
+            for index in range(4):
+                images[f"image{index}.png"] = _random_image(rng, (20 + index, 30))
+                Image.fromarray(images[f"image{index}.png"], "RGBA").save(temp_path / f"image{index}.png")
+
+            for max_workers in [1, 2]:
+                output_path = temp_path / f"workers-{max_workers}"
+                jobs = [
+                    TextureRecolorJob(temp_path / name, output_path / name, 0, pending_recolors) for name in images
+                ]
+                run_texture_recolor_jobs(jobs, max_workers)
+                for name, image in images.items():
+                    with Image.open(output_path / name) as recolored_image:
+                        np.testing.assert_array_equal(
+                            recolor_image(image, recolor_definitions, 0),
+                            np.array(recolored_image)
+                        )
+
+    def test_recolor_templates_loaded_once(self):
+        recolors_path = resource_path("static/recolors")
+        expected_models = []
+        for file in os.listdir(recolors_path):
+            if file.endswith(".yml"):
+                with open(os.path.join(recolors_path, file)) as template_file:
+                    expected_models.extend(yaml.safe_load(template_file) or [])
+
+        templates = recolor_templates()
+        self.assertIs(templates, recolor_templates())
+        self.assertIs(templates.models, TextureRecolorizer.load_recolorable_models())
+        self.assertEqual(expected_models, templates.models)
+
+        model = templates.models[0]
+        colorable_area = model["recolors"][0]["colorable_areas"][0]
+        compiled_area = templates.compiled_area(colorable_area)
+        self.assertIs(templates.compiled_areas[colorable_area_key(colorable_area)], compiled_area)
+        self.assertEqual(tuple(colorable_area.get("mask_files", [])), compiled_area.mask_files)
+
+        new_area = {"id": "New", "hue_start": 10, "hue_end": 20}
+        compiled_new_area = templates.compiled_area(new_area)
+        self.assertEqual((10, 20), compiled_new_area.hue_range)
+        self.assertIsNone(compiled_new_area.saturation_range)
+
+    def test_colorable_area_ids_unique(self):
+        for model in recolor_templates().models:
+            for recolor in model["recolors"]:
+                area_ids = [colorable_area["id"] for colorable_area in recolor["colorable_areas"]]
+                self.assertEqual(len(area_ids), len(set(area_ids)), model["id"])
+
+    def test_compiled_areas_with_same_id(self):
+        main_area = {"id": "outfit_main", "name": "Outfit (Main)", "hue_start": 20, "hue_end": 90}
+        trim_area = {"id": "outfit_main", "name": "Outfit (Trim)", "hue_start": 300, "hue_end": 19}
+        templates = RecolorTemplates([
+            {"id": "model", "recolors": [{"colorable_areas": [main_area, trim_area], "image_groups": []}]}
+        ])
+        self.assertEqual((20, 90), templates.compiled_area(main_area).hue_range)
+        self.assertEqual((300, 19), templates.compiled_area(trim_area).hue_range)
+        # The same area after a round trip to a worker process
+        worker_main_area = pickle.loads(pickle.dumps(main_area))
+        self.assertIs(templates.compiled_area(main_area), templates.compiled_area(worker_main_area))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from zipfile import ZipFile, ZIP_DEFLATED
+
+from Module.zipoutput import FileZipOutput, MemoryZipOutput, ZipOutput, zip_chunks
+
+_ENTRIES = {f"files/{index}.txt": f"entry {index} " * 2000 for index in range(20)}
+
+
+def _write_test_zip(output: ZipOutput):
+    with output as zip_stream, ZipFile(zip_stream, "w", ZIP_DEFLATED) as out_zip:
+        for name, text in _ENTRIES.items():
+            out_zip.writestr(name, text)
+    return output.result()
+
+
+def _read_entries(zip_source) -> dict[str, str]:
+    with ZipFile(zip_source) as zip_file:
+        return {name: zip_file.read(name).decode() for name in zip_file.namelist()}
+
+
+class Tests(unittest.TestCase):
+
+    def test_file_output_matches_memory_output(self):
+        memory_data = _write_test_zip(MemoryZipOutput())
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "out.zip"
+            result = _write_test_zip(FileZipOutput(path))
+            self.assertEqual(path, result)
+            self.assertEqual(memory_data.getvalue(), path.read_bytes())
+            self.assertEqual([path], list(Path(temp_dir).iterdir()))
+
+    def test_file_output_removed_on_failure(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = FileZipOutput(Path(temp_dir) / "out.zip")
+            with self.assertRaises(RuntimeError):
+                with output as zip_stream, ZipFile(zip_stream, "w", ZIP_DEFLATED) as out_zip:
+                    out_zip.writestr("partial.txt", "partial")
+                    raise RuntimeError("generation failed")
+            self.assertEqual([], list(Path(temp_dir).iterdir()))
+
+    def test_file_output_discard(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            finished = FileZipOutput(Path(temp_dir) / "finished.zip")
+            _write_test_zip(finished)
+            # Stopped partway, as when a generation thread is cancelled
+            partial = FileZipOutput(Path(temp_dir) / "partial.zip")
+            partial.__enter__().write(b"partial")
+            self.assertEqual(2, len(list(Path(temp_dir).iterdir())))
+
+            finished.discard()
+            partial.discard()
+            self.assertEqual([], list(Path(temp_dir).iterdir()))
+
+    def test_output_must_implement_hooks(self):
+        class _NoResultOutput(ZipOutput):
+            def __enter__(self):
+                return io.BytesIO()
+
+        with self.assertRaises(TypeError):
+            ZipOutput()
+        with self.assertRaises(TypeError):
+            _NoResultOutput()
+
+    def test_chunks(self):
+        chunks = list(zip_chunks(_write_test_zip, chunk_size=1024, max_pending_chunks=2))
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) == 1024 for chunk in chunks[:-1]))
+        self.assertEqual(_ENTRIES, _read_entries(io.BytesIO(b"".join(chunks))))
+
+    def test_chunks_raise_write_errors(self):
+        def _fail(output: ZipOutput):
+            with output as zip_stream:
+                zip_stream.write(b"partial")
+                raise RuntimeError("generation failed")
+
+        with self.assertRaises(RuntimeError):
+            list(zip_chunks(_fail))
+
+
+if __name__ == '__main__':
+    unittest.main()